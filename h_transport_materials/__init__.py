@@ -22,10 +22,11 @@ k_B = 8.617e-5 * ureg.eV * ureg.particle**-1 * ureg.K**-1
 Rg = 8.314 * ureg.Pa * ureg.m**3 * ureg.mol**-1 * ureg.K**-1
 avogadro_nb = 6.022e23 * ureg.particle * ureg.mol**-1
 
-from pybtex.database import parse_file
 from pathlib import Path
+from .bibliography import Bibliography
 
-bib_database = parse_file(str(Path(__file__).parent) + "/references.bib")
+# references are only parsed when needed
+bib_database = Bibliography(Path(__file__).parent / "references.bib")
 
 from .property import (
     Property,
@@ -36,32 +37,37 @@ from .property import (
     RecombinationCoeff,
     DissociationCoeff,
 )
-from .properties_group import PropertiesGroup
+from .properties_group import PropertiesGroup, LazyPropertiesGroup
+from .mapped import MappedPropertiesGroup
+from .streaming import iter_json, write_json
+from .query import Field, covers, overlaps, within
+from .value_cache import value_cache
 from . import conversion
 from . import plotting
 from .helpers import *
 from .material import *
 
-database = PropertiesGroup()
-
 from . import property_database
 
-diffusivities = PropertiesGroup(
-    prop for prop in database if isinstance(prop, Diffusivity)
+# properties are only loaded from property_database when needed
+database = LazyPropertiesGroup(property_database.load)
+
+diffusivities = LazyPropertiesGroup(
+    property_database.load, parent=database, prop_type=Diffusivity
 )
 
-solubilities = PropertiesGroup(
-    prop for prop in database if isinstance(prop, Solubility)
+solubilities = LazyPropertiesGroup(
+    property_database.load, parent=database, prop_type=Solubility
 )
 
-permeabilities = PropertiesGroup(
-    prop for prop in database if isinstance(prop, Permeability)
+permeabilities = LazyPropertiesGroup(
+    property_database.load, parent=database, prop_type=Permeability
 )
 
-recombination_coeffs = PropertiesGroup(
-    prop for prop in database if isinstance(prop, RecombinationCoeff)
+recombination_coeffs = LazyPropertiesGroup(
+    property_database.load, parent=database, prop_type=RecombinationCoeff
 )
 
-dissociation_coeffs = PropertiesGroup(
-    prop for prop in database if isinstance(prop, DissociationCoeff)
+dissociation_coeffs = LazyPropertiesGroup(
+    property_database.load, parent=database, prop_type=DissociationCoeff
 )
@@ -0,0 +1,304 @@
+from itertools import islice
+
+import numpy as np
+import pint
+
+from h_transport_materials import ureg
+from h_transport_materials.columns import PropertiesColumns
+from h_transport_materials.property import ArrheniusProperty
+
+# number of properties held in memory at once by stream_mean
+STREAM_CHUNK_SIZE = 10_000
+
+
+class MeanAccumulator:
+    """Accumulates the sums needed to compute (weighted) mean Arrhenius
+    properties, so that properties can be added in several chunks.
+    The pre-exponential factors are averaged geometrically (in log space)
+    and the activation energies arithmetically.
+    Usage::
+
+        accumulator = MeanAccumulator(weights="year", by="material")
+        for chunk in chunks:
+            accumulator.add(chunk)
+        means = accumulator.result()  # {material: ArrheniusProperty}
+
+    Args:
+        weights (str or callable, optional): the weight of each property,
+            either the name of a numeric attribute (eg. "year",
+            "nb_citations") or a function of the property.
+            If None, all the properties have the same weight.
+            Defaults to None.
+        by (str or list, optional): the name(s) of the attribute(s) by which
+            the properties are grouped. If None, the properties aren't
+            grouped. Defaults to None.
+    """
+
+    def __init__(self, weights=None, by=None):
+        self.weights = weights
+        self.by = by
+        self.units = None
+        # for each group key: sum of weights, of weighted log(pre_exp)
+        # and of weighted act_energy (in eV/particle)
+        self._sums = {}
+
+    def add(self, properties, weights=None):
+        """Adds properties to the mean
+
+        Args:
+            properties (PropertiesGroup or iterable): the properties
+            weights (array-like, optional): the weight of each property,
+                overrides the weights of the accumulator. Defaults to None.
+
+        Raises:
+            ValueError: if the properties have different units
+            ValueError: if the weights are negative or not finite
+        """
+        if hasattr(properties, "columns"):
+            columns = properties.columns
+        else:
+            columns = PropertiesColumns(properties)
+        if len(columns) == 0:
+            return
+
+        all_units = columns["units"].unique()
+        if self.units is None and len(all_units) == 1:
+            self.units = all_units[0]
+        if all_units != [self.units]:
+            raise ValueError("Can't compute mean on mixed units groups")
+
+        if weights is None:
+            weights = _resolve_weights(columns, self.weights)
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (len(columns),):
+            raise ValueError("weights must have one value per property")
+        if not np.all(np.isfinite(weights)) or np.any(weights < 0):
+            raise ValueError("weights must be finite and non-negative")
+
+        if self.by is None:
+            codes, keys = np.zeros(len(columns), dtype=np.intp), [None]
+        else:
+            codes, keys = columns.group_codes(self.by)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_pre_exps = np.log(columns["pre_exp"])
+        sums = [
+            np.bincount(codes, weights=values, minlength=len(keys))
+            for values in (
+                weights,
+                weights * log_pre_exps,
+                weights * columns["act_energy"],
+            )
+        ]
+        for key, key_sums in zip(keys, np.stack(sums, axis=1)):
+            if key in self._sums:
+                self._sums[key] = self._sums[key] + key_sums
+            else:
+                self._sums[key] = key_sums
+
+    def result(self):
+        """Returns the mean properties
+
+        Raises:
+            ValueError: if no property was added or if the weights of
+                a group sum to zero
+
+        Returns:
+            ArrheniusProperty or dict: the mean property, or the mean
+            property of each group if the properties are grouped
+        """
+        if not self._sums:
+            raise ValueError("Can't compute the mean of no property")
+        means = {}
+        for key, sums in self._sums.items():
+            sum_weights, sum_log_pre_exps, sum_act_energies = sums
+            if sum_weights == 0:
+                raise ValueError("The weights of the properties sum to zero")
+            means[key] = ArrheniusProperty(
+                np.exp(sum_log_pre_exps / sum_weights) * self.units,
+                sum_act_energies / sum_weights * ureg.eV * ureg.particle**-1,
+            )
+        if self.by is None:
+            return means[None]
+        return means
+
+
+def stream_mean(properties, weights=None, by=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Computes the (weighted) mean property of properties that don't
+    need to be held in memory at once (eg. a generator)
+
+    Args:
+        properties (iterable): the properties
+        weights (str or callable, optional): the weight of each property,
+            see MeanAccumulator. Defaults to None.
+        by (str or list, optional): the name(s) of the attribute(s) by which
+            the properties are grouped. Defaults to None.
+        chunk_size (int, optional): the number of properties held in memory
+            at once. Defaults to STREAM_CHUNK_SIZE.
+
+    Returns:
+        ArrheniusProperty or dict: the mean property, or the mean
+        property of each group if by is given
+    """
+    accumulator = MeanAccumulator(weights=weights, by=by)
+    iterator = iter(properties)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        accumulator.add(chunk)
+    return accumulator.result()
+
+
+def _resolve_weights(columns: PropertiesColumns, weights) -> np.ndarray:
+    """Returns the weight of each property
+
+    Args:
+        columns (PropertiesColumns): the columns of the properties
+        weights (str, callable or None): the name of an attribute,
+            a function of the property or None for equal weights
+
+    Returns:
+        np.ndarray: the weights, nan where an attribute is None
+    """
+    if weights is None:
+        return np.ones(len(columns))
+    if callable(weights):
+        return np.array([weights(prop) for prop in columns.properties], dtype=float)
+    return _numeric_attribute(columns, weights)
+
+
+def _numeric_attribute(columns: PropertiesColumns, name: str) -> np.ndarray:
+    """Returns a numeric attribute of the properties as floats
+
+    Args:
+        columns (PropertiesColumns): the columns of the properties
+        name (str): the name of the attribute
+
+    Returns:
+        np.ndarray: the values, nan where the attribute is None
+    """
+    column = columns.attribute(name)
+    categories = np.array(column.categories, dtype=float)
+    return categories[column.codes]
+
+
+# statistics of the values of the properties computed by GroupBy.aggregate
+VALUE_STATISTICS = ["min", "max", "median", "geometric_mean"]
+
+
+class GroupBy:
+    """Properties of a group partitioned by the values of one or several
+    attributes. Created by PropertiesGroup.groupby.
+    Usage::
+
+        grouped = htm.diffusivities.groupby(["material", "isotope"])
+
+        for (material, isotope), group in grouped:
+            pass
+
+        table = grouped.aggregate(T=600 * htm.ureg.K)
+        table["material"], table["count"], table["median"]
+
+    Args:
+        group (PropertiesGroup): the properties
+        keys (str or list): the name(s) of the attribute(s)
+    """
+
+    def __init__(self, group, keys):
+        self.group = group
+        self.keys = keys
+        self.codes, self.group_keys = group.columns.group_codes(keys)
+        # rows of each group, contiguous in self._order
+        self._order = np.argsort(self.codes, kind="stable")
+        self._counts = np.bincount(self.codes, minlength=len(self.group_keys))
+        self._starts = np.cumsum(self._counts) - self._counts
+
+    def __len__(self) -> int:
+        return len(self.group_keys)
+
+    def __iter__(self):
+        for key, start, count in zip(self.group_keys, self._starts, self._counts):
+            yield key, self.group._take(self._order[start : start + count])
+
+    def __getitem__(self, key):
+        i = self.group_keys.index(key)
+        start = self._starts[i]
+        return self.group._take(self._order[start : start + self._counts[i]])
+
+    def aggregate(self, T=None, stats=VALUE_STATISTICS) -> np.ndarray:
+        """Computes statistics of each group at once. The table contains
+        the key(s) of the groups, the number of properties ("count") and the
+        range of years ("year_min", "year_max", nan if unknown).
+        If T is given, statistics of the values of the properties at T are
+        added, in the units of the group.
+
+        Args:
+            T (pint.Quantity or float, optional): the temperature. If not a
+                Quantity, T is assumed in K. Defaults to None.
+            stats (list, optional): the statistics of the values
+                ("min", "max", "median", "geometric_mean").
+                Defaults to VALUE_STATISTICS.
+
+        Raises:
+            ValueError: if T is given for a mixed units group
+            ValueError: if a statistic is unknown
+
+        Returns:
+            np.ndarray: structured array with one row per group
+        """
+        names = [self.keys] if isinstance(self.keys, str) else list(self.keys)
+        unknown = set(stats) - set(VALUE_STATISTICS)
+        if unknown:
+            raise ValueError(f"Unknown statistics {sorted(unknown)}")
+
+        fields = [(name, object) for name in names]
+        fields += [("count", np.intp), ("year_min", float), ("year_max", float)]
+        if T is not None:
+            fields += [(stat, float) for stat in stats]
+        table = np.empty(len(self), dtype=fields)
+
+        for i, name in enumerate(names):
+            table[name] = [
+                key if isinstance(self.keys, str) else key[i] for key in self.group_keys
+            ]
+        table["count"] = self._counts
+        if len(self) == 0:
+            return table
+
+        years = _numeric_attribute(self.group.columns, "year")[self._order]
+        table["year_min"] = np.fmin.reduceat(years, self._starts)
+        table["year_max"] = np.fmax.reduceat(years, self._starts)
+
+        if T is not None:
+            if isinstance(T, pint.Quantity):
+                T = T.to(ureg.K).magnitude
+            values = self.group.values_magnitude(float(T))
+            for stat in stats:
+                table[stat] = self._statistic(values, stat)
+        return table
+
+    def _statistic(self, values: np.ndarray, stat: str) -> np.ndarray:
+        """Computes a statistic of the values of each group
+
+        Args:
+            values (np.ndarray): the value of each property
+            stat (str): the statistic
+
+        Returns:
+            np.ndarray: the statistic of each group
+        """
+        if stat == "geometric_mean":
+            sums = np.bincount(self.codes, weights=np.log(values))
+            return np.exp(sums / self._counts)
+        # sort the values of each group
+        order = np.lexsort((values, self.codes))
+        sorted_values = values[order]
+        if stat == "min":
+            return sorted_values[self._starts]
+        if stat == "max":
+            return sorted_values[self._starts + self._counts - 1]
+        # median
+        lower = self._starts + (self._counts - 1) // 2
+        upper = self._starts + self._counts // 2
+        return (sorted_values[lower] + sorted_values[upper]) / 2
@@ -0,0 +1,163 @@
+from collections.abc import Mapping
+import hashlib
+import json
+from pathlib import Path
+import re
+import threading
+
+from h_transport_materials.cache import read_from_cache, write_to_cache
+
+# start of a bibtex entry: @type{key,
+ENTRY_START = re.compile(rb"^[ \t]*@(\w+)[ \t]*\{[ \t]*([^,\s]+)[ \t]*,", re.MULTILINE)
+
+
+class Bibliography:
+    """Bibliography of a bibtex file which entries are only parsed
+    when needed.
+
+    An index of the file (position, author and year of each entry)
+    is built once and cached on disk. Entries are parsed with pybtex
+    when accessed through ``entries``.
+
+    Args:
+        filename (str): the path of the bibtex file
+    """
+
+    def __init__(self, filename: str):
+        self.filename = Path(filename)
+        self._index = None
+        # the index and the entries are built once even with several threads
+        self._lock = threading.RLock()
+        self.entries = BibliographyEntries(self)
+
+    @property
+    def index(self):
+        """dict: for each lowercase key, the key, the position of the entry in
+        the file and the author and year of the reference"""
+        if self._index is not None:
+            return self._index
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+        return self._index
+
+    def _build_index(self):
+        """Reads the index from the cache or builds it
+
+        Returns:
+            dict: the index
+        """
+        content = self.filename.read_bytes()
+        digest = hashlib.sha1(content).hexdigest()
+        cache_filename = f"bib_index_{self.filename.stem}.json"
+
+        cached_index = read_from_cache(cache_filename)
+        if cached_index is not None:
+            cached_index = json.loads(cached_index)
+            if cached_index["digest"] == digest:
+                return cached_index["entries"]
+
+        index = build_bib_index(content)
+        cached_index = {"digest": digest, "entries": index}
+        write_to_cache(cache_filename, json.dumps(cached_index).encode())
+        return index
+
+    def author_and_year(self, key: str):
+        """Returns the author and year of a reference without parsing it
+
+        Args:
+            key (str): the key of the reference
+
+        Returns:
+            str, int: the lowercase last name of the first author and the year
+        """
+        indexed_entry = self.index[key.lower()]
+        return indexed_entry["author"], indexed_entry["year"]
+
+    def parse_entry(self, key: str):
+        """Parses a single entry of the bibtex file
+
+        Args:
+            key (str): the key of the reference
+
+        Returns:
+            pybtex.database.Entry: the entry
+        """
+        from pybtex.database import parse_string
+
+        indexed_entry = self.index[key.lower()]
+        with open(self.filename, "rb") as bib_file:
+            bib_file.seek(indexed_entry["start"])
+            content = bib_file.read(indexed_entry["end"] - indexed_entry["start"])
+
+        bib_data = parse_string(content.decode("utf-8"), bib_format="bibtex")
+        return bib_data.entries[indexed_entry["key"]]
+
+
+class BibliographyEntries(Mapping):
+    """Read-only mapping of the entries of a Bibliography.
+    Like pybtex entries, keys are case insensitive.
+    Entries are parsed on first access.
+
+    Args:
+        bibliography (Bibliography): the bibliography
+    """
+
+    def __init__(self, bibliography: Bibliography):
+        self._bibliography = bibliography
+        self._parsed_entries = {}
+
+    def __getitem__(self, key: str):
+        if key.lower() not in self._parsed_entries:
+            with self._bibliography._lock:
+                if key.lower() not in self._parsed_entries:
+                    entry = self._bibliography.parse_entry(key)
+                    self._parsed_entries[key.lower()] = entry
+        return self._parsed_entries[key.lower()]
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and key.lower() in self._bibliography.index
+
+    def __iter__(self):
+        return (
+            indexed_entry["key"] for indexed_entry in self._bibliography.index.values()
+        )
+
+    def __len__(self) -> int:
+        return len(self._bibliography.index)
+
+
+def build_bib_index(content: bytes):
+    """Builds the index of a bibtex file
+
+    Args:
+        content (bytes): the content of the bibtex file
+
+    Returns:
+        dict: for each lowercase key, the key, the position of the entry in
+            the file and the author and year of the reference
+    """
+    from pybtex.database import parse_string
+
+    starts = list(ENTRY_START.finditer(content))
+    ends = [match.start() for match in starts[1:]] + [len(content)]
+
+    index = {}
+    for match, end in zip(starts, ends):
+        key = match.group(2).decode("utf-8")
+        entry_content = content[match.start() : end].decode("utf-8")
+        entry = parse_string(entry_content, bib_format="bibtex").entries[key]
+
+        author = None
+        if "author" in entry.persons:
+            author = entry.persons["author"][0].last_names[0].lower()
+        year = int(entry.fields["year"]) if "year" in entry.fields else None
+
+        index[key.lower()] = {
+            "key": key,
+            "start": match.start(),
+            "end": end,
+            "author": author,
+            "year": year,
+        }
+    return index
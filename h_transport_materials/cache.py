@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+import tempfile
+
+
+def cache_dir():
+    """Returns the directory where HTM caches data on disk.
+    It can be set with the HTM_CACHE_DIR environment variable and defaults
+    to h_transport_materials in the user cache directory.
+
+    Returns:
+        pathlib.Path: the cache directory
+    """
+    if "HTM_CACHE_DIR" in os.environ:
+        return Path(os.environ["HTM_CACHE_DIR"])
+    user_cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(user_cache_dir) / "h_transport_materials"
+
+
+def write_to_cache(filename: str, data: bytes):
+    """Writes a file in the cache directory. The file is written in a
+    temporary file first and then moved so that concurrent readers never
+    see a partially written file.
+    Failing to write (eg. read-only file system) is not an error since
+    the cache is only an optimisation.
+
+    Args:
+        filename (str): the path of the file relative to the cache directory
+        data (bytes): the content of the file
+
+    Returns:
+        bool: True if the file was written
+    """
+    path = cache_dir() / filename
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_file.name, path)
+    except OSError:
+        return False
+    return True
+
+
+def read_from_cache(filename: str):
+    """Reads a file from the cache directory
+
+    Args:
+        filename (str): the path of the file relative to the cache directory
+
+    Returns:
+        bytes: the content of the file, None if it isn't cached
+    """
+    try:
+        return (cache_dir() / filename).read_bytes()
+    except OSError:
+        return None
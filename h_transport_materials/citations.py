@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+import time
+import warnings
+
+import requests
+
+from h_transport_materials.cache import read_from_cache, write_to_cache
+
+CACHE_FILENAME = "citations.json"
+
+# time after which cached citation counts are fetched again (in s)
+CITATIONS_TTL = 30 * 24 * 3600
+
+# crossref asks clients to stay below 50 requests per second
+MAX_REQUESTS_PER_SECOND = 10
+MAX_WORKERS = 8
+
+
+def offline() -> bool:
+    """Returns True if HTM is in offline mode (HTM_OFFLINE environment
+    variable set to 1). In offline mode, citation counts are only read
+    from the cache.
+
+    Returns:
+        bool: True if HTM is in offline mode
+    """
+    return os.environ.get("HTM_OFFLINE", "0") == "1"
+
+
+def read_cache():
+    """Reads the cached citation counts
+
+    Returns:
+        dict: for each DOI, the number of citations and the time
+            it was fetched
+    """
+    cached = read_from_cache(CACHE_FILENAME)
+    if cached is None:
+        return {}
+    try:
+        return json.loads(cached)
+    except ValueError:
+        return {}
+
+
+def write_cache(entries: dict):
+    """Adds citation counts to the cache
+
+    Args:
+        entries (dict): for each DOI, the number of citations and the
+            time it was fetched
+    """
+    # re-read the cache to keep the entries written by other processes
+    cache = read_cache()
+    cache.update(entries)
+    write_to_cache(CACHE_FILENAME, json.dumps(cache).encode())
+
+
+class RateLimiter:
+    """Limits the rate at which threads perform an action
+
+    Args:
+        rate (float): the maximum number of actions per second
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_time = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Blocks until the action can be performed"""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def fetch_nb_citations(
+    dois,
+    fetch=None,
+    max_workers: int = MAX_WORKERS,
+    rate: float = MAX_REQUESTS_PER_SECOND,
+    ttl: float = CITATIONS_TTL,
+):
+    """Returns the number of citations of several DOIs. Counts cached for
+    less than ttl are reused, the others are fetched concurrently and cached.
+    In offline mode (see offline()), only the cache is used, whatever the
+    age of the entries.
+
+    Args:
+        dois (iterable): the DOIs
+        fetch (callable, optional): function returning the number of
+            citations of a DOI. Defaults to None (crossref is queried
+            with h_transport_materials.property.get_nb_citations).
+        max_workers (int, optional): the maximum number of concurrent
+            requests. Defaults to MAX_WORKERS.
+        rate (float, optional): the maximum number of requests per second.
+            Defaults to MAX_REQUESTS_PER_SECOND.
+        ttl (float, optional): the time (in s) after which cached counts
+            are fetched again. Defaults to CITATIONS_TTL.
+
+    Raises:
+        Exception: errors of fetch other than network errors
+
+    Returns:
+        dict: the number of citations of each DOI, DOIs which counts
+            couldn't be obtained (network errors) are missing
+    """
+    if fetch is None:
+        from h_transport_materials.property import get_nb_citations as fetch
+
+    dois = set(dois)
+    cache = read_cache()
+    now = time.time()
+    nb_citations = {}
+    for doi in dois:
+        if doi in cache and (offline() or now - cache[doi]["time"] < ttl):
+            nb_citations[doi] = cache[doi]["nb_citations"]
+
+    missing_dois = sorted(dois - set(nb_citations))
+    if not missing_dois:
+        return nb_citations
+    if offline():
+        warnings.warn(
+            f"The number of citations of {len(missing_dois)} DOIs isn't cached "
+            "(offline mode)"
+        )
+        return nb_citations
+
+    rate_limiter = RateLimiter(rate)
+
+    def fetch_one(doi):
+        rate_limiter.wait()
+        try:
+            return fetch(doi)
+        except (requests.RequestException, OSError):
+            # network errors, other errors are bugs and are raised
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(fetch_one, missing_dois))
+
+    new_entries = {}
+    for doi, result in zip(missing_dois, results):
+        if result is not None:
+            nb_citations[doi] = result
+            new_entries[doi] = {"nb_citations": result, "time": now}
+    if new_entries:
+        write_cache(new_entries)
+
+    nb_failed = len(missing_dois) - len(new_entries)
+    if nb_failed:
+        warnings.warn(f"Couldn't get the number of citations of {nb_failed} DOIs")
+    return nb_citations
@@ -0,0 +1,165 @@
+import json
+
+import numpy as np
+
+from h_transport_materials import __version__
+from h_transport_materials.property import ArrheniusProperty
+
+# bump when the columns or their units change
+COLUMNAR_FORMAT_VERSION = 1
+
+# units of the numeric columns, pre_exp and data_y are in the units of
+# each property (SI units, given by the "units" column)
+COLUMN_UNITS = {
+    "pre_exp": "units column",
+    "act_energy": "eV / particle",
+    "T_min": "K",
+    "T_max": "K",
+    "data_T": "K",
+    "data_y": "units column",
+}
+
+STRING_COLUMNS = [
+    "type",
+    "material",
+    "isotope",
+    "author",
+    "source",
+    "doi",
+    "note",
+    "law",
+    "units",
+]
+
+
+def group_to_arrays(group):
+    """Returns the columnar representation of a group, one row per property.
+    Missing strings are empty, missing numbers are nan.
+    The experimental points of all the properties are concatenated in
+    ``data_T`` and ``data_y``: the points of property i are
+    ``data_T[data_offsets[i]:data_offsets[i + 1]]``.
+
+    Args:
+        group (PropertiesGroup): the properties
+
+    Returns:
+        dict, dict: the arrays and the schema (format version, HTM version
+        and units of the columns)
+    """
+    columns = group.columns
+    arrays = {
+        name: np.array([_to_str(_attribute(prop, name)) for prop in group], dtype=str)
+        for name in STRING_COLUMNS
+    }
+    arrays["year"] = np.array(
+        [np.nan if prop.year is None else prop.year for prop in group], dtype=float
+    )
+    for name in ["pre_exp", "act_energy", "T_min", "T_max"]:
+        arrays[name] = np.asarray(columns[name], dtype=float)
+
+    data_T, data_y, lengths = [], [], []
+    for prop in group:
+        has_data = isinstance(prop, ArrheniusProperty) and prop.data_T is not None
+        if has_data and prop.data_y is not None:
+            data_T.append(np.asarray(prop.data_T.magnitude, dtype=float))
+            data_y.append(np.asarray(prop.data_y.to(prop.units).magnitude, dtype=float))
+            lengths.append(len(data_T[-1]))
+        else:
+            lengths.append(0)
+    arrays["data_offsets"] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    arrays["data_T"] = np.concatenate(data_T) if data_T else np.zeros(0)
+    arrays["data_y"] = np.concatenate(data_y) if data_y else np.zeros(0)
+
+    schema = {
+        "format_version": COLUMNAR_FORMAT_VERSION,
+        "htm_version": __version__,
+        "units": COLUMN_UNITS,
+    }
+    return arrays, schema
+
+
+def export_to_npz(group, filename: str, compressed: bool = False):
+    """Exports a group to a numpy .npz file (see group_to_arrays).
+    The schema is stored as a JSON string in the ``schema`` array.
+    The file can be read without HTM::
+
+        data = np.load(filename)
+        data["pre_exp"], data["units"]
+
+    Args:
+        group (PropertiesGroup): the properties
+        filename (str): the path of the file
+        compressed (bool, optional): if True, the arrays are compressed.
+            Defaults to False.
+    """
+    arrays, schema = group_to_arrays(group)
+    arrays["schema"] = np.array(json.dumps(schema))
+    save = np.savez_compressed if compressed else np.savez
+    save(filename, **arrays)
+
+
+def export_to_parquet(group, filename: str):
+    """Exports a group to a Parquet file with pyarrow (optional dependency).
+    The experimental points are list columns, the schema is stored in the
+    metadata of the file under the ``htm`` key.
+
+    Args:
+        group (PropertiesGroup): the properties
+        filename (str): the path of the file
+
+    Raises:
+        ImportError: if pyarrow is not installed
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required to export to parquet, use export_to_npz instead"
+        )
+
+    pq.write_table(group_to_arrow(group), filename)
+
+
+def group_to_arrow(group):
+    """Returns the columnar representation of a group as a pyarrow Table
+
+    Args:
+        group (PropertiesGroup): the properties
+
+    Returns:
+        pyarrow.Table: the table
+    """
+    import pyarrow as pa
+
+    arrays, schema = group_to_arrays(group)
+    offsets = pa.array(arrays.pop("data_offsets"), type=pa.int32())
+    data_T = pa.ListArray.from_arrays(offsets, pa.array(arrays.pop("data_T")))
+    data_y = pa.ListArray.from_arrays(offsets, pa.array(arrays.pop("data_y")))
+
+    columns = {name: pa.array(values) for name, values in arrays.items()}
+    # arrow has nulls
+    for name in STRING_COLUMNS:
+        columns[name] = pa.array([value or None for value in arrays[name].tolist()])
+    columns["year"] = pa.array(
+        [None if np.isnan(year) else int(year) for year in arrays["year"]],
+        type=pa.int64(),
+    )
+    columns["data_T"] = data_T
+    columns["data_y"] = data_y
+    return pa.table(columns, metadata={"htm": json.dumps(schema)})
+
+
+def _attribute(prop, name: str):
+    if name == "type":
+        return type(prop).__name__
+    if name == "material":
+        return getattr(prop.material, "name", prop.material)
+    if name == "doi":
+        return prop.doi
+    return getattr(prop, name, None)
+
+
+def _to_str(value) -> str:
+    if value is None:
+        return ""
+    return f"{value}"
@@ -0,0 +1,412 @@
+import inspect
+import numpy as np
+import pint
+
+from h_transport_materials import ureg
+from h_transport_materials.fitting import K_B
+from h_transport_materials.material import Material, PureMetal
+from h_transport_materials.property import Property, ArrheniusProperty
+
+# columns of floats, nan when the value is not available
+NUMERIC_COLUMNS = ["pre_exp", "act_energy", "T_min", "T_max"]
+
+# values compared with == in the indexes, other values are compared one by one
+INDEXABLE_TYPES = (int, float, type(None))
+
+
+class Categorical:
+    """Column of values stored as integer codes referring to
+    a list of unique values (categories)
+
+    Args:
+        codes (np.ndarray): the code of each row
+        categories (list): the unique values
+    """
+
+    def __init__(self, codes: np.ndarray, categories: list, index=None):
+        self.codes = codes
+        self.categories = categories
+        self._index = index
+
+    @classmethod
+    def from_values(cls, values):
+        """Creates a Categorical column from a list of values
+
+        Args:
+            values (iterable): the values
+
+        Returns:
+            Categorical: the column
+        """
+        values = list(values)
+        codes_by_value = {}
+        try:
+            # the type is part of the key so that eg. a Material and its
+            # name (which have the same hash) are different categories
+            codes = [
+                codes_by_value.setdefault((type(value), value), len(codes_by_value))
+                for value in values
+            ]
+        except TypeError:
+            # unhashable values: one category per row
+            return cls(np.arange(len(values)), values)
+        categories = [value for _, value in codes_by_value]
+        return cls(np.array(codes, dtype=np.intp), categories)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def unique(self) -> list:
+        """Returns the categories present in the column. Columns of
+        subsets share the categories of the whole set, some of which
+        may not be present in the subset.
+
+        Returns:
+            list: the categories
+        """
+        return [self.categories[code] for code in np.unique(self.codes)]
+
+    def take(self, indices: np.ndarray):
+        """Returns the column restricted to some rows
+
+        Args:
+            indices (np.ndarray): the indices of the rows
+
+        Returns:
+            Categorical: the restricted column, with the same categories
+        """
+        # the index refers to categories, it is still valid for the subset
+        return Categorical(self.codes[indices], self.categories, self._index)
+
+    def where(self, predicate):
+        """Evaluates a predicate on each row. The predicate is only
+        evaluated once per category.
+
+        Args:
+            predicate (callable): function of a value returning a bool
+
+        Returns:
+            np.ndarray: boolean mask of the matching rows
+        """
+        matching_categories = np.array(
+            [bool(predicate(category)) for category in self.categories], dtype=bool
+        )
+        return matching_categories[self.codes]
+
+    @property
+    def index(self):
+        """tuple: hash index of the categories. The first element maps
+        each lookup key (see index_keys) to the codes of the matching
+        categories, the second is the list of the codes of the categories
+        that can't be indexed."""
+        if self._index is None:
+            codes_by_key = {}
+            unindexed_codes = []
+            for code, category in enumerate(self.categories):
+                keys = index_keys(category)
+                if keys is None:
+                    unindexed_codes.append(code)
+                    continue
+                for key in keys:
+                    codes_by_key.setdefault(key, []).append(code)
+            self._index = codes_by_key, unindexed_codes
+        return self._index
+
+    def matches(self, value):
+        """Finds the rows matching a value with the semantics of
+        PropertiesGroup.filter: strings are compared in lowercase, materials
+        match their name, symbol, families and classes and lists match any
+        of their elements. The index is used when possible.
+
+        Args:
+            value (object or list): the value (or list of values)
+
+        Returns:
+            np.ndarray: boolean mask of the matching rows
+        """
+        values = value if isinstance(value, list) else [value]
+        keys = [lookup_keys(val) for val in values]
+        if any(val_keys is None for val_keys in keys):
+            return self.where(lambda category: attribute_matches(category, value))
+
+        codes_by_key, unindexed_codes = self.index
+        matching_categories = np.zeros(len(self.categories), dtype=bool)
+        for val_keys in keys:
+            for key in val_keys:
+                matching_categories[codes_by_key.get(key, [])] = True
+        for code in unindexed_codes:
+            matching_categories[code] = attribute_matches(self.categories[code], value)
+        return matching_categories[self.codes]
+
+
+def attribute_matches(prop_attr, value) -> bool:
+    """Checks if an attribute of a property matches a filter value
+
+    Args:
+        prop_attr (object): the attribute of the property
+        value (object or list): the value (or list of values) of the filter
+
+    Returns:
+        bool: True if the attribute matches
+    """
+    if isinstance(prop_attr, str):
+        # make sure prop_attr are lower
+        prop_attr = prop_attr.lower()
+
+    if isinstance(value, list):
+        return prop_attr in value
+    return not prop_attr != value
+
+
+def index_keys(category):
+    """Returns the keys under which a category is stored in an index.
+    A category is found with a value if they share a key (see lookup_keys).
+
+    Args:
+        category (object): the category
+
+    Returns:
+        list: the keys, None if the category can't be indexed
+    """
+    if isinstance(category, str):
+        return [("str", category.lower())]
+    elif isinstance(category, Material):
+        if type(category).__eq__ not in [Material.__eq__, PureMetal.__eq__]:
+            return None
+        # materials are equal to their name, symbol, families and classes
+        keys = [("id", id(category))]
+        keys += [("name", name) for name in _material_names(category)]
+        keys += [("class", cls) for cls in type(category).__mro__]
+        return keys
+    elif inspect.isclass(category):
+        return [("id", id(category))]
+    elif isinstance(category, INDEXABLE_TYPES):
+        return [("value", category)]
+    return None
+
+
+def lookup_keys(value):
+    """Returns the keys to look up in an index to find the categories
+    matching a value (see index_keys).
+
+    Args:
+        value (object): the value
+
+    Returns:
+        list: the keys, None if the value can't be looked up
+    """
+    if isinstance(value, str):
+        return [("str", value), ("name", value)]
+    elif isinstance(value, Material):
+        if type(value).__eq__ not in [Material.__eq__, PureMetal.__eq__]:
+            return None
+        # a material is only equal to itself or to its names
+        return [("id", id(value))] + [("str", name) for name in _material_names(value)]
+    elif inspect.isclass(value):
+        return [("class", value), ("id", id(value))]
+    elif isinstance(value, INDEXABLE_TYPES):
+        return [("value", value)]
+    return None
+
+
+def _material_names(material: Material):
+    """Returns the strings a material is equal to
+
+    Args:
+        material (Material): the material
+
+    Returns:
+        list: the name, families and symbol of the material
+    """
+    names = [material.name] + [parent.family for parent in material.parents]
+    if isinstance(material, PureMetal) and material.symbol is not None:
+        names.append(material.symbol)
+    return names
+
+
+class PropertiesColumns:
+    """Columnar (struct of arrays) representation of a list of properties.
+
+    Columns are built on first access and cached. Numeric columns
+    (see NUMERIC_COLUMNS) are float arrays with nan for missing values:
+
+    * ``pre_exp``: the pre-exponential factor in the property units
+    * ``act_energy``: the activation energy in eV/particle
+    * ``T_min``, ``T_max``: the temperature range in K
+
+    Any other column is the Categorical column of a property attribute
+    (eg. ``material``, ``isotope``, ``author``, ``year``, ``law``, ``units``).
+    The ``type`` column holds the class of the properties.
+    Categorical columns are indexed on first lookup (see Categorical.matches).
+
+    Usage::
+
+        columns = htm.diffusivities.columns
+        columns["act_energy"]  # np.ndarray
+        columns["isotope"].categories  # ["H", "D", "T"]
+
+    Args:
+        properties (iterable): the properties
+    """
+
+    def __init__(self, properties):
+        self.properties = list(properties)
+        self._columns = {}
+        for prop in self.properties:
+            if not prop._in_columns:
+                prop._in_columns = True
+        self._nb_modifications = Property._nb_modifications
+        # columns of a subset are taken from the columns of the whole set
+        self._parent = None
+        self._parent_indices = None
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    def __getitem__(self, name: str):
+        if name not in self._columns:
+            if self._parent is None:
+                self._columns[name] = self._build_column(name)
+            else:
+                self._columns[name] = _take(self._parent[name], self._parent_indices)
+        return self._columns[name]
+
+    @property
+    def outdated(self) -> bool:
+        """bool: True if a property was modified since the columns were created"""
+        return self._nb_modifications != Property._nb_modifications
+
+    def attribute(self, name: str):
+        """Returns the Categorical column of an attribute of the properties,
+        including the numeric ones
+
+        Args:
+            name (str): the name of the attribute
+
+        Returns:
+            Categorical: the column
+        """
+        if name in NUMERIC_COLUMNS:
+            return self[("attribute", name)]
+        return self[name]
+
+    def group_codes(self, keys):
+        """Partitions the properties by the values of one or several
+        attributes in one pass over the columns
+
+        Args:
+            keys (str or list): the name(s) of the attribute(s)
+
+        Returns:
+            np.ndarray, list: the group of each property and the key of each
+            group (a tuple of values if keys is a list) in order of first
+            appearance
+        """
+        names = [keys] if isinstance(keys, str) else list(keys)
+        columns = [self.attribute(name) for name in names]
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.intp), []
+        stacked = np.stack([column.codes for column in columns], axis=1)
+        unique_codes, first_rows, codes = np.unique(
+            stacked, axis=0, return_index=True, return_inverse=True
+        )
+        # renumber the groups in order of first appearance
+        order = np.argsort(first_rows)
+        renumbering = np.empty_like(order)
+        renumbering[order] = np.arange(len(order))
+        codes = renumbering[codes.reshape(-1)]
+
+        group_keys = []
+        for row in unique_codes[order]:
+            values = tuple(
+                column.categories[code] for column, code in zip(columns, row)
+            )
+            group_keys.append(values[0] if isinstance(keys, str) else values)
+        return codes, group_keys
+
+    def take(self, indices: np.ndarray):
+        """Returns the columns of a subset of the properties.
+        The columns of the subset (and their indexes) are taken from
+        these columns so that they are only built once.
+
+        Args:
+            indices (np.ndarray): the indices of the properties
+
+        Returns:
+            PropertiesColumns: the columns of the subset
+        """
+        columns = PropertiesColumns(self.properties[i] for i in indices)
+        columns._nb_modifications = self._nb_modifications
+        columns._parent = self
+        columns._parent_indices = indices
+        return columns
+
+    def _build_column(self, name):
+        if name in ["pre_exp", "act_energy"]:
+            parameters = np.array(
+                [_arrhenius_parameters(prop) for prop in self.properties], dtype=float
+            ).reshape(-1, 2)
+            self._columns["pre_exp"], self._columns["act_energy"] = parameters.T
+        elif name in ["T_min", "T_max"]:
+            bounds = np.array(
+                [_range_in_kelvin(prop) for prop in self.properties], dtype=float
+            ).reshape(-1, 2)
+            self._columns["T_min"], self._columns["T_max"] = bounds.T
+        elif name == "type":
+            return Categorical.from_values(type(prop) for prop in self.properties)
+        else:
+            if isinstance(name, tuple):
+                # Categorical column of a numeric attribute
+                _, name = name
+            return Categorical.from_values(
+                getattr(prop, name) for prop in self.properties
+            )
+        return self._columns[name]
+
+
+def _take(column, indices: np.ndarray):
+    """Returns some rows of a column
+
+    Args:
+        column (np.ndarray or Categorical): the column
+        indices (np.ndarray): the indices of the rows
+
+    Returns:
+        np.ndarray or Categorical: the rows
+    """
+    if isinstance(column, Categorical):
+        return column.take(indices)
+    return column[indices]
+
+
+def _arrhenius_parameters(prop: Property):
+    """Returns the pre-exponential factor (in the property units) and the
+    activation energy (in eV/particle) of a property as floats
+
+    Args:
+        prop (Property): the property
+
+    Returns:
+        float, float: the parameters, nan if not available
+    """
+    if not isinstance(prop, ArrheniusProperty) or prop.pre_exp is None:
+        return np.nan, np.nan
+    pre_exp, act_energy_over_k_B = prop._magnitudes()
+    return pre_exp, act_energy_over_k_B * K_B
+
+
+def _range_in_kelvin(prop: Property):
+    """Returns the temperature range of a property in K as floats
+
+    Args:
+        prop (Property): the property
+
+    Returns:
+        float, float: the range, nan if the property has no range
+    """
+    if prop.range is None:
+        return np.nan, np.nan
+    return tuple(
+        bound.to(ureg.K).magnitude if isinstance(bound, pint.Quantity) else bound
+        for bound in prop.range
+    )
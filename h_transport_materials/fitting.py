@@ -0,0 +1,459 @@
+import hashlib
+import json
+
+import numpy as np
+
+from h_transport_materials import ureg, k_B
+from h_transport_materials.cache import read_from_cache, write_to_cache
+
+# bump when the fitting procedure changes to discard the cached fits
+FIT_CACHE_VERSION = 2
+
+K_B = k_B.to(ureg.eV * ureg.particle**-1 * ureg.K**-1).magnitude
+
+FIT_METHODS = ["ols", "huber", "theil-sen"]
+
+# tuning constant of the Huber loss (95% efficiency for normal errors)
+HUBER_THRESHOLD = 1.345
+HUBER_MAX_ITERATIONS = 50
+HUBER_TOLERANCE = 1e-10
+
+BOOTSTRAP_RESAMPLES_PER_JOB = 250
+# maximum number of values of the resampled curves in memory
+BAND_CHUNK_ELEMENTS = 10_000_000
+
+
+def fit_key(data_T, data_y, weights=None, method: str = "ols") -> str:
+    """Returns a key identifying a fit: the digest of the values
+    and units of data_T and data_y, of the weights and of the method
+
+    Args:
+        data_T (pint.Quantity): the temperatures
+        data_y (pint.Quantity): the values of the property
+        weights (np.ndarray, optional): the weights of the points.
+            Defaults to None.
+        method (str, optional): the fitting method. Defaults to "ols".
+
+    Returns:
+        str: the hexadecimal digest
+    """
+    digest = hashlib.sha1(f"v{FIT_CACHE_VERSION}-{method}".encode())
+    for data in [data_T, data_y]:
+        digest.update(str(data.units).encode())
+        digest.update(np.ascontiguousarray(data.magnitude, dtype=float).tobytes())
+    if weights is not None:
+        digest.update(np.ascontiguousarray(weights, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def arrhenius_regression(data_T, data_y, weights=None, method: str = "ols"):
+    """Fits ln(y) = intercept + slope / T. Results are cached on disk,
+    keyed by the content of the dataset, so that a dataset is only fitted
+    once across processes.
+
+    Args:
+        data_T (pint.Quantity): the temperatures in K
+        data_y (pint.Quantity): the values of the property
+        weights (np.ndarray, optional): the weights of the points.
+            Defaults to None.
+        method (str, optional): the fitting method (see segmented_regression).
+            Defaults to "ols".
+
+    Returns:
+        float, float, np.ndarray: the intercept, the slope (in K) and the
+            covariance matrix of (intercept, slope)
+    """
+    cache_filename = f"fits/{fit_key(data_T, data_y, weights, method)}.json"
+    cached_fit = read_from_cache(cache_filename)
+    if cached_fit is not None:
+        try:
+            cached_fit = json.loads(cached_fit)
+            return (
+                cached_fit["intercept"],
+                cached_fit["slope"],
+                np.array(cached_fit["covariance"], dtype=float),
+            )
+        except (ValueError, KeyError):
+            # corrupted cache file, fit again
+            pass
+
+    data_T = np.asarray(data_T.magnitude, dtype=float)
+    intercepts, slopes, covariances = segmented_regression(
+        1 / data_T,
+        np.log(np.asarray(data_y.magnitude, dtype=float)),
+        [len(data_T)],
+        weights=weights,
+        method=method,
+    )
+    intercept, slope, covariance = (
+        float(intercepts[0]),
+        float(slopes[0]),
+        covariances[0],
+    )
+
+    cached_fit = {
+        "intercept": intercept,
+        "slope": slope,
+        "covariance": covariance.tolist(),
+    }
+    write_to_cache(cache_filename, json.dumps(cached_fit).encode())
+    return intercept, slope, covariance
+
+
+def arrhenius_covariance(covariance: np.ndarray) -> np.ndarray:
+    """Converts the covariance of the regression of ln(y) = intercept + slope / T
+    to the covariance of the Arrhenius parameters (ln(pre_exp), act_energy)
+
+    Args:
+        covariance (np.ndarray): the covariance matrix (or matrices) of
+            (intercept, slope) with slope in K
+
+    Returns:
+        np.ndarray: the covariance matrix (or matrices) of (ln(pre_exp),
+            act_energy) with act_energy in eV/particle
+    """
+    # act_energy = -k_B * slope, the jacobian is diagonal
+    jacobian = np.array([1, -K_B])
+    return covariance * np.outer(jacobian, jacobian)
+
+
+def segmented_regression(
+    x: np.ndarray, y: np.ndarray, lengths, weights=None, method: str = "ols"
+):
+    """Fits y = intercept + slope * x on several datasets at once.
+    The datasets are concatenated in x and y.
+
+    Methods:
+
+    * ``"ols"``: (weighted) least squares
+    * ``"huber"``: (weighted) least squares with the Huber loss, solved by
+      iteratively reweighted least squares. Points further than
+      HUBER_THRESHOLD robust standard deviations from the fit are
+      downweighted.
+    * ``"theil-sen"``: the slope is the median of the slopes between all
+      pairs of points and the intercept the median of y - slope * x.
+      Weights are not supported.
+
+    The covariance is the least squares covariance, using the final
+    robust weights for the Huber loss. It is only an approximation
+    for the Theil-Sen estimator.
+
+    Args:
+        x (np.ndarray): the concatenated x values of the datasets
+        y (np.ndarray): the concatenated y values of the datasets
+        lengths (np.ndarray): the number of points of each dataset
+        weights (np.ndarray, optional): the concatenated weights of the
+            points. Defaults to None.
+        method (str, optional): "ols", "huber" or "theil-sen".
+            Defaults to "ols".
+
+    Raises:
+        ValueError: if the method is unknown or weights are given with
+            the Theil-Sen estimator
+
+    Returns:
+        np.ndarray, np.ndarray, np.ndarray: the intercept, the slope
+            and the covariance matrix of (intercept, slope) of each dataset
+            (nan for datasets with less than two distinct x values)
+    """
+    if method not in FIT_METHODS:
+        raise ValueError(f"method should be one of {FIT_METHODS}, not {method}")
+    lengths = np.asarray(lengths)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # index of the dataset of each point
+    segments = np.repeat(np.arange(len(lengths)), lengths)
+
+    if weights is None:
+        weights = np.ones_like(x)
+    elif method == "theil-sen":
+        raise ValueError("weights are not supported with the Theil-Sen estimator")
+    else:
+        weights = np.asarray(weights, dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "theil-sen":
+            intercepts, slopes = _theil_sen(x, y, segments, lengths)
+        else:
+            intercepts, slopes = _weighted_least_squares(
+                x, y, weights, segments, lengths
+            )
+        if method == "huber":
+            intercepts, slopes, weights = _huber(
+                x, y, weights, segments, lengths, intercepts, slopes
+            )
+        covariances = _covariances(x, y, weights, segments, lengths, intercepts, slopes)
+    return intercepts, slopes, covariances
+
+
+def _bincount(segments, values, nb_segments):
+    return np.bincount(segments, values, minlength=nb_segments)
+
+
+def _weighted_least_squares(x, y, weights, segments, lengths):
+    nb_segments = len(lengths)
+    sum_weights = _bincount(segments, weights, nb_segments)
+    x_mean = _bincount(segments, weights * x, nb_segments) / sum_weights
+    y_mean = _bincount(segments, weights * y, nb_segments) / sum_weights
+    # centered sums like scipy.stats.linregress for accuracy
+    dx = x - x_mean[segments]
+    dy = y - y_mean[segments]
+    ss_xx = _bincount(segments, weights * dx * dx, nb_segments)
+    ss_xy = _bincount(segments, weights * dx * dy, nb_segments)
+
+    slopes = ss_xy / ss_xx
+    intercepts = y_mean - slopes * x_mean
+    return intercepts, slopes
+
+
+def _covariances(x, y, weights, segments, lengths, intercepts, slopes):
+    nb_segments = len(lengths)
+    sum_weights = _bincount(segments, weights, nb_segments)
+    x_mean = _bincount(segments, weights * x, nb_segments) / sum_weights
+    dx = x - x_mean[segments]
+    ss_xx = _bincount(segments, weights * dx * dx, nb_segments)
+
+    residuals = y - intercepts[segments] - slopes[segments] * x
+    # weights are relative, the variance of the errors is estimated
+    # from the residuals
+    variances = _bincount(segments, weights * residuals**2, nb_segments) / (lengths - 2)
+
+    covariances = np.empty((nb_segments, 2, 2))
+    covariances[:, 1, 1] = variances / ss_xx
+    covariances[:, 0, 0] = variances * (1 / sum_weights + x_mean**2 / ss_xx)
+    covariances[:, 0, 1] = covariances[:, 1, 0] = -x_mean * variances / ss_xx
+    return covariances
+
+
+def _segmented_median(values, segments, lengths):
+    """Returns the median of each segment of values (nan for empty segments)"""
+    lengths = np.asarray(lengths)
+    order = np.lexsort((values, segments))
+    sorted_values = np.append(values[order], np.nan)
+    starts = np.cumsum(lengths) - lengths
+    # empty segments point to the trailing nan
+    low = np.where(lengths > 0, starts + (lengths - 1) // 2, len(values))
+    high = np.where(lengths > 0, starts + lengths // 2, len(values))
+    return (sorted_values[low] + sorted_values[high]) / 2
+
+
+def _huber(x, y, weights, segments, lengths, intercepts, slopes):
+    robust_weights = np.ones_like(x)
+    for _ in range(HUBER_MAX_ITERATIONS):
+        residuals = y - intercepts[segments] - slopes[segments] * x
+        # robust standard deviation of the residuals of each dataset
+        medians = _segmented_median(residuals, segments, lengths)
+        deviations = np.abs(residuals - medians[segments])
+        scales = _segmented_median(deviations, segments, lengths) / 0.6745
+        scaled_residuals = np.abs(residuals) / scales[segments]
+        robust_weights = np.where(
+            scaled_residuals > HUBER_THRESHOLD,
+            HUBER_THRESHOLD / scaled_residuals,
+            1.0,
+        )
+        new_intercepts, new_slopes = _weighted_least_squares(
+            x, y, weights * robust_weights, segments, lengths
+        )
+        converged = np.allclose(
+            [new_intercepts, new_slopes],
+            [intercepts, slopes],
+            rtol=HUBER_TOLERANCE,
+            atol=0,
+            equal_nan=True,
+        )
+        intercepts, slopes = new_intercepts, new_slopes
+        if converged:
+            break
+    return intercepts, slopes, weights * robust_weights
+
+
+def _theil_sen(x, y, segments, lengths):
+    starts = np.cumsum(lengths) - lengths
+    first_points, second_points = [], []
+    # pairs of points of all the datasets with the same number of points
+    for length in np.unique(lengths):
+        i, j = np.triu_indices(length, k=1)
+        dataset_starts = starts[lengths == length][:, None]
+        first_points.append((dataset_starts + i).ravel())
+        second_points.append((dataset_starts + j).ravel())
+    first_points = np.concatenate(first_points).astype(int)
+    second_points = np.concatenate(second_points).astype(int)
+
+    pair_slopes = (y[second_points] - y[first_points]) / (
+        x[second_points] - x[first_points]
+    )
+    pair_segments = segments[first_points]
+    # pairs with the same x have no slope
+    valid = np.isfinite(pair_slopes)
+    pair_slopes, pair_segments = pair_slopes[valid], pair_segments[valid]
+    nb_pairs = np.bincount(pair_segments, minlength=len(lengths))
+
+    slopes = _segmented_median(pair_slopes, pair_segments, nb_pairs)
+    intercepts = _segmented_median(y - slopes[segments] * x, segments, lengths)
+    return intercepts, slopes
+
+
+def bootstrap_parameters(
+    x: np.ndarray,
+    y: np.ndarray,
+    lengths,
+    nb_resamples: int = 1000,
+    seed=None,
+    method: str = "ols",
+    processes: int = None,
+    resamples_per_job: int = BOOTSTRAP_RESAMPLES_PER_JOB,
+):
+    """Bootstraps the fits of several datasets: the points of each dataset
+    are resampled with replacement and the resamples are fitted with
+    segmented_regression. The resamples are split in jobs of
+    resamples_per_job resamples, each with its own random generator
+    spawned from seed, so that the results only depend on seed (and not on
+    the number of processes).
+
+    Args:
+        x (np.ndarray): the concatenated x values of the datasets
+        y (np.ndarray): the concatenated y values of the datasets
+        lengths (np.ndarray): the number of points of each dataset
+        nb_resamples (int, optional): the number of resamples.
+            Defaults to 1000.
+        seed (int or np.random.SeedSequence, optional): the seed of the
+            random generators. Defaults to None.
+        method (str, optional): the fitting method (see
+            segmented_regression). Defaults to "ols".
+        processes (int, optional): the number of processes the jobs are
+            spread across. If None, the jobs are run in this process.
+            Defaults to None.
+        resamples_per_job (int, optional): the number of resamples of
+            each job. Defaults to BOOTSTRAP_RESAMPLES_PER_JOB.
+
+    Returns:
+        np.ndarray, np.ndarray: the intercepts and slopes of the resamples
+            with shape (number of datasets, nb_resamples)
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    nb_jobs = -(-nb_resamples // resamples_per_job)
+    jobs = []
+    for i, job_seed in enumerate(seed.spawn(nb_jobs)):
+        nb_job_resamples = min(resamples_per_job, nb_resamples - i * resamples_per_job)
+        jobs.append((x, y, lengths, nb_job_resamples, job_seed, method))
+
+    if processes is None:
+        results = [_bootstrap_job(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_bootstrap_job, jobs))
+
+    intercepts = np.concatenate([intercepts for intercepts, _ in results], axis=1)
+    slopes = np.concatenate([slopes for _, slopes in results], axis=1)
+    return intercepts, slopes
+
+
+def _bootstrap_job(job):
+    """Fits nb_resamples resamples of the datasets
+
+    Args:
+        job (tuple): x, y, lengths, nb_resamples, seed and method
+
+    Returns:
+        np.ndarray, np.ndarray: the intercepts and slopes of the resamples
+            with shape (number of datasets, nb_resamples)
+    """
+    x, y, lengths, nb_resamples, seed, method = job
+    lengths = np.asarray(lengths)
+    rng = np.random.default_rng(seed)
+    starts = np.cumsum(lengths) - lengths
+    segments = np.repeat(np.arange(len(lengths)), lengths)
+
+    # indices of the points of all the resamples at once, each
+    # resample is the concatenation of the resampled datasets
+    indices = starts[segments] + (
+        rng.random((nb_resamples, len(x))) * lengths[segments]
+    ).astype(int)
+    intercepts, slopes, _ = segmented_regression(
+        x[indices].ravel(),
+        y[indices].ravel(),
+        np.tile(lengths, nb_resamples),
+        method=method,
+    )
+    return (
+        intercepts.reshape(nb_resamples, -1).T,
+        slopes.reshape(nb_resamples, -1).T,
+    )
+
+
+def percentile_bands(
+    intercepts: np.ndarray,
+    slopes: np.ndarray,
+    T: np.ndarray,
+    percentiles=(2.5, 50, 97.5),
+    chunk_size: int = None,
+):
+    """Computes percentiles of exp(intercept + slope / T) over resamples.
+    T is processed in chunks so that only chunk_size temperatures of the
+    resampled curves are in memory at once.
+
+    Args:
+        intercepts (np.ndarray): the intercepts with shape
+            (number of datasets, number of resamples)
+        slopes (np.ndarray): the slopes with the same shape
+        T (np.ndarray): the temperatures in K (1D)
+        percentiles (tuple, optional): the percentiles.
+            Defaults to (2.5, 50, 97.5).
+        chunk_size (int, optional): the number of temperatures per chunk.
+            If None, chunks hold about BAND_CHUNK_ELEMENTS values.
+            Defaults to None.
+
+    Returns:
+        np.ndarray: the percentiles with shape (number of datasets,
+            number of percentiles, number of temperatures)
+    """
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    if chunk_size is None:
+        chunk_size = max(1, BAND_CHUNK_ELEMENTS // max(intercepts.size, 1))
+
+    bands = np.empty((intercepts.shape[0], len(percentiles), len(T)))
+    has_nan = np.isnan(intercepts).any() or np.isnan(slopes).any()
+    for start in range(0, len(T), chunk_size):
+        T_chunk = T[start : start + chunk_size]
+        # shape (number of datasets, number of resamples, chunk_size)
+        values = np.exp(intercepts[..., None] + slopes[..., None] / T_chunk)
+        if has_nan:
+            # degenerated resamples (eg. a single temperature) are ignored
+            chunk_bands = nan_percentiles(values, percentiles, axis=1)
+        else:
+            chunk_bands = np.percentile(values, percentiles, axis=1)
+        bands[..., start : start + chunk_size] = np.moveaxis(chunk_bands, 0, 1)
+    return bands
+
+
+def nan_percentiles(values: np.ndarray, percentiles, axis: int = 0) -> np.ndarray:
+    """Computes percentiles ignoring nan values, like np.nanpercentile with
+    linear interpolation but vectorised (np.nanpercentile loops over the
+    slices containing nan values)
+
+    Args:
+        values (np.ndarray): the values
+        percentiles (array-like): the percentiles (between 0 and 100)
+        axis (int, optional): the axis along which the percentiles are
+            computed. Defaults to 0.
+
+    Returns:
+        np.ndarray: the percentiles with shape (number of percentiles,
+            *shape of values without axis), nan where all values are nan
+    """
+    # nan values are sorted last
+    sorted_values = np.moveaxis(np.sort(values, axis=axis), axis, 0)
+    nb_values = np.count_nonzero(~np.isnan(sorted_values), axis=0)
+    # fractional position of the percentiles in the non nan values
+    positions = np.multiply.outer(np.asarray(percentiles) / 100, nb_values - 1)
+    positions = np.clip(positions, 0, None)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, np.maximum(nb_values - 1, 0))
+    lower_values = np.take_along_axis(sorted_values, lower, axis=0)
+    upper_values = np.take_along_axis(sorted_values, upper, axis=0)
+    result = lower_values + (upper_values - lower_values) * (positions - lower)
+    result[:, nb_values == 0] = np.nan
+    return result
@@ -1,7 +1,14 @@
 from pathlib import Path
+import hashlib
 import inspect
+import io
+import json
+import os
+import tarfile
 import numpy as np
 
+from h_transport_materials.cache import read_from_cache, write_to_cache
+
 
 def absolute_path(filename: str, level=1):
     """Returns the absolute path of a file. Based on a relative path.
@@ -16,23 +23,88 @@ def absolute_path(filename: str, level=1):
     Returns:
         str: the absolute path of the file
     """
-    caller_frame = inspect.stack()[level]
-    return str(Path(caller_frame.filename).parent) + "/" + filename
+    # walking up the frames is much cheaper than inspect.stack(), which
+    # reads the source lines of the whole stack
+    frame = inspect.currentframe()
+    for _ in range(level):
+        frame = frame.f_back
+    return str(Path(frame.f_code.co_filename).parent) + "/" + filename
 
 
 def structure_data_from_wpd(filename: str):
-    """Returns a structured dataset based on a csv file from WebPlotDigitizer
-    exported with the "Export all data" option
+    """Returns a structured dataset based on a WebPlotDigitizer project
+    (.tar file, read without extracting it) or on a csv file from
+    WebPlotDigitizer exported with the "Export all data" option.
+    The parsed dataset is cached on disk until the file is modified.
 
     Args:
-        filename (str): the relative path to the csv file
+        filename (str): the relative path to the .tar or csv file
 
     Returns:
         dict: structured dictionary with keys corresponding to field names.
             Ex: {"fieldA": {"x": [1,2,3], "y": [1,2,3]}}
     """
+    path = absolute_path(filename, level=2)
+    cache_filename = f"wpd/{wpd_key(path)}.npz"
+    cached_data = read_from_cache(cache_filename)
+    if cached_data is not None:
+        try:
+            return _read_structured_data(cached_data)
+        except (ValueError, OSError, KeyError):
+            # corrupted cache file, parse again
+            pass
+
+    if path.endswith(".tar"):
+        structured_data = read_wpd_project(path)
+    else:
+        structured_data = _read_wpd_csv(path)
+
+    write_to_cache(cache_filename, _write_structured_data(structured_data))
+    return structured_data
+
+
+def read_wpd_project(path: str):
+    """Reads the datasets of a WebPlotDigitizer project (.tar file).
+    The archive is streamed and only the project file is read.
+
+    Args:
+        path (str): the path of the .tar file
+
+    Raises:
+        ValueError: if the archive doesn't contain a wpd.json file
+
+    Returns:
+        dict: structured dictionary with the names of the datasets as keys.
+            Ex: {"dataset A": {"x": [1,2,3], "y": [1,2,3]}}
+    """
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            if member.isfile() and Path(member.name).name == "wpd.json":
+                project = json.load(archive.extractfile(member))
+                break
+        else:
+            raise ValueError(f"{path} is not a WebPlotDigitizer project")
+
+    structured_data = {}
+    for dataset in project["datasetColl"]:
+        values = np.array(
+            [point["value"][:2] for point in dataset["data"]], dtype=float
+        ).reshape(-1, 2)
+        structured_data[dataset["name"]] = {"x": values[:, 0], "y": values[:, 1]}
+    return structured_data
+
+
+def _read_wpd_csv(path: str):
+    """Reads a csv file exported from WebPlotDigitizer
+
+    Args:
+        path (str): the path of the csv file
+
+    Returns:
+        dict: structured dictionary with keys corresponding to field names
+    """
     data = np.genfromtxt(
-        absolute_path(filename, level=2),
+        path,
         delimiter=",",
         names=True,
     )
@@ -43,3 +115,52 @@ def structure_data_from_wpd(filename: str):
         y = data[name_y]
         structured_data[name_x] = {"x": x, "y": y}
     return structured_data
+
+
+def wpd_key(path: str):
+    """Returns the key of a csv file in the cache, which changes when
+    the file is modified
+
+    Args:
+        path (str): the absolute path of the csv file
+
+    Returns:
+        str: the hexadecimal digest of the path, modification time and size
+    """
+    stat = os.stat(path)
+    key = f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _write_structured_data(structured_data: dict):
+    """Serialises a structured dataset to the npz format
+
+    Args:
+        structured_data (dict): the dataset (see structure_data_from_wpd)
+
+    Returns:
+        bytes: the npz file
+    """
+    arrays = {"names": np.array(list(structured_data), dtype=str)}
+    for i, dataset in enumerate(structured_data.values()):
+        arrays[f"x_{i}"] = dataset["x"]
+        arrays[f"y_{i}"] = dataset["y"]
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _read_structured_data(data: bytes):
+    """Reads a structured dataset serialised by _write_structured_data
+
+    Args:
+        data (bytes): the npz file
+
+    Returns:
+        dict: the dataset (see structure_data_from_wpd)
+    """
+    with np.load(io.BytesIO(data)) as arrays:
+        return {
+            name: {"x": arrays[f"x_{i}"], "y": arrays[f"y_{i}"]}
+            for i, name in enumerate(arrays["names"].tolist())
+        }
@@ -0,0 +1,322 @@
+import inspect
+import json
+from pathlib import Path
+import warnings
+
+import numpy as np
+import pint
+
+from h_transport_materials import ureg
+from h_transport_materials.columnar import STRING_COLUMNS, group_to_arrays
+from h_transport_materials.columns import Categorical
+from h_transport_materials.fitting import K_B
+from h_transport_materials.property import Property, _parse_units
+
+# bump when the files or their layout change
+MAPPED_FORMAT_VERSION = 1
+
+# written last by export_to_mmap, a directory without it is incomplete
+METADATA_FILENAME = "metadata.json"
+
+NUMERIC_ARRAYS = ["year", "pre_exp", "act_energy", "T_min", "T_max"]
+
+
+def export_to_mmap(group, directory: str):
+    """Exports a group to a directory of .npy files that can be opened
+    memory-mapped with MappedPropertiesGroup. The columns are those of
+    group_to_arrays, string columns being stored as integer codes referring
+    to the categories listed in the metadata file.
+
+    Args:
+        group (PropertiesGroup): the properties
+        directory (str): the path of the directory, created if needed
+    """
+    arrays, schema = group_to_arrays(group)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    categories = {}
+    for name in STRING_COLUMNS:
+        categories[name], codes = np.unique(arrays[name], return_inverse=True)
+        categories[name] = categories[name].tolist()
+        arrays[name] = codes.reshape(-1).astype(np.int32)
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+
+    metadata = {
+        **schema,
+        "mapped_format_version": MAPPED_FORMAT_VERSION,
+        "length": len(group),
+        "categories": categories,
+    }
+    with open(directory / METADATA_FILENAME, "w") as f:
+        json.dump(metadata, f, indent=1)
+
+
+class MappedPropertiesGroup:
+    """Read-only view of a group exported with
+    PropertiesGroup.export_to_mmap. The arrays are memory-mapped: processes
+    opening the same directory share the same physical pages and nothing is
+    deserialised until properties are accessed.
+    Usage::
+
+        htm.database.export_to_mmap("htm_database")
+
+        # in each worker
+        database = htm.MappedPropertiesGroup("htm_database")
+        tungsten = database.filter(material="tungsten", type="diffusivity")
+        values = tungsten.values(T)
+        prop = tungsten[0]  # Diffusivity
+
+    Filters and evaluations only read the arrays. Properties are created
+    when they are accessed by index or iteration, and to_group returns
+    a PropertiesGroup of all the properties of the view.
+
+    Args:
+        directory (str): the path of the directory
+    """
+
+    def __init__(self, directory: str):
+        directory = Path(directory)
+        with open(directory / METADATA_FILENAME) as f:
+            self.metadata = json.load(f)
+        if self.metadata["mapped_format_version"] != MAPPED_FORMAT_VERSION:
+            raise ValueError(
+                f"{directory} was written with an incompatible version of HTM"
+            )
+        self.directory = directory
+        self._arrays = {
+            path.stem: np.load(path, mmap_mode="r") for path in directory.glob("*.npy")
+        }
+        # rows of the arrays in the view, None for all the rows
+        self._indices = None
+        self._columns = {}
+
+    def __len__(self) -> int:
+        if self._indices is None:
+            return self.metadata["length"]
+        return len(self._indices)
+
+    def __getitem__(self, i: int) -> Property:
+        row = range(len(self))[i]
+        if self._indices is not None:
+            row = self._indices[row]
+        return self._property(int(row))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"MappedPropertiesGroup({str(self.directory)!r}, {len(self)} properties)"
+
+    def column(self, name: str):
+        """Returns a column of the view
+
+        Args:
+            name (str): the name of the column: a string column (see
+                STRING_COLUMNS) or "year", "pre_exp", "act_energy",
+                "T_min", "T_max"
+
+        Returns:
+            np.ndarray or Categorical: the values of a numeric column (nan
+            when missing) or the Categorical column of a string attribute
+            ("" when missing)
+        """
+        if name not in self._columns:
+            if name in STRING_COLUMNS:
+                codes = self._rows(self._arrays[name])
+                column = Categorical(codes, self.metadata["categories"][name])
+            elif name in NUMERIC_ARRAYS:
+                column = self._rows(self._arrays[name])
+            else:
+                raise ValueError(f"{name} is not a column")
+            self._columns[name] = column
+        return self._columns[name]
+
+    @property
+    def units(self):
+        all_units = self.column("units").unique()
+        if len(all_units) == 1:
+            return _parse_units(all_units[0])
+        else:
+            return "mixed units"
+
+    def filter(self, exclude=False, **kwargs):
+        """
+        Returns the properties that match the specified arguments, with the
+        semantics of PropertiesGroup.filter except that materials only match
+        their name and that properties only match their own class
+        (ex: type=htm.Diffusivity or type="diffusivity").
+
+        Args:
+            exclude (bool, optional): if True, the searched
+                keys will be excluded. Defaults to False.
+            kwargs: string attributes (see STRING_COLUMNS) or year.
+
+        Returns:
+            MappedPropertiesGroup: the view of the resulting properties
+        """
+        match = np.ones(len(self), dtype=bool)
+        for attr, value in kwargs.items():
+            if attr == "type":
+                match &= self.column(attr).matches(_type_names(value))
+            elif attr == "year":
+                years = value if isinstance(value, list) else [value]
+                match &= np.isin(self.column("year"), np.array(years, dtype=float))
+            else:
+                match &= self.column(attr).matches(value)
+        if exclude:
+            match = ~match
+
+        view = self._take(np.flatnonzero(match))
+        if len(view) == 0:
+            warnings.warn("No property matching the requirements")
+        return view
+
+    def values(self, T):
+        """
+        Evaluates all the properties of the view at once.
+
+        Args:
+            T (pint.Quantity): the temperature(s). If not a Quantity,
+                T is assumed in K.
+
+        Raises:
+            ValueError: When called on a mixed units view
+
+        Returns:
+            pint.Quantity: the values of the properties with shape
+            (number of properties, number of temperatures) for a 1D T
+        """
+        if not isinstance(T, pint.Quantity):
+            T = ureg.Quantity(T, ureg.K)
+        return self.values_magnitude(T.to(ureg.K).magnitude) * self.units
+
+    def values_magnitude(self, T):
+        """
+        Evaluates all the properties of the view at once without pint
+        quantities.
+
+        Args:
+            T (float or np.ndarray): the temperature(s) in K
+
+        Raises:
+            ValueError: When called on a mixed units view
+
+        Returns:
+            np.ndarray: the values of the properties in the units of the view
+        """
+        if self.units == "mixed units":
+            raise ValueError("Can't evaluate mixed units groups")
+        T = np.asarray(T, dtype=float)
+        act_energies_over_k_B = self.column("act_energy") / K_B
+        values = np.exp(np.multiply.outer(-act_energies_over_k_B, 1 / T))
+        values *= self.column("pre_exp").reshape(-1, *[1] * T.ndim)
+        return values
+
+    def to_group(self):
+        """Creates the properties of the view
+
+        Returns:
+            PropertiesGroup: the properties
+        """
+        from h_transport_materials.properties_group import PropertiesGroup
+
+        return PropertiesGroup(self)
+
+    def _rows(self, array: np.ndarray) -> np.ndarray:
+        """Returns the rows of an array in the view, without copy for
+        the whole database
+
+        Args:
+            array (np.ndarray): the array of all the rows
+
+        Returns:
+            np.ndarray: the rows of the view
+        """
+        if self._indices is None:
+            return array
+        return array[self._indices]
+
+    def _take(self, indices: np.ndarray):
+        """Returns a view of some of the properties of the view.
+        The memory-mapped arrays are shared.
+
+        Args:
+            indices (np.ndarray): the indices of the properties in the view
+
+        Returns:
+            MappedPropertiesGroup: the new view
+        """
+        view = object.__new__(MappedPropertiesGroup)
+        view.metadata = self.metadata
+        view.directory = self.directory
+        view._arrays = self._arrays
+        view._indices = indices if self._indices is None else self._indices[indices]
+        view._columns = {}
+        return view
+
+    def _property(self, row: int) -> Property:
+        """Creates the property of a row of the arrays
+
+        Args:
+            row (int): the row
+
+        Returns:
+            Property: the property
+        """
+        arrays = self._arrays
+        strings = {
+            name: self.metadata["categories"][name][arrays[name][row]] or None
+            for name in STRING_COLUMNS
+        }
+        year = float(arrays["year"][row])
+        as_json = {
+            "type": strings["type"],
+            "material": strings["material"],
+            "source": strings["source"] or "",
+            "author": strings["author"] or "",
+            "year": None if np.isnan(year) else int(year),
+            "isotope": strings["isotope"],
+            "note": strings["note"],
+        }
+        T_min, T_max = float(arrays["T_min"][row]), float(arrays["T_max"][row])
+        if not np.isnan(T_min):
+            as_json["range"] = {"value": (T_min, T_max), "units": "kelvin"}
+        if not np.isnan(arrays["pre_exp"][row]):
+            as_json["pre_exp"] = {
+                "value": float(arrays["pre_exp"][row]),
+                "units": strings["units"],
+            }
+            as_json["act_energy"] = {
+                "value": float(arrays["act_energy"][row]),
+                "units": "eV / particle",
+            }
+        start, end = arrays["data_offsets"][row : row + 2]
+        if end > start:
+            as_json["data_T"] = {
+                "value": np.array(arrays["data_T"][start:end]),
+                "units": "kelvin",
+            }
+            as_json["data_y"] = {
+                "value": np.array(arrays["data_y"][start:end]),
+                "units": strings["units"],
+            }
+        return Property.from_json(as_json)
+
+
+def _type_names(value):
+    """Returns the lowercase name(s) of classes of properties
+
+    Args:
+        value (type, str or list): the class(es) or their name(s)
+
+    Returns:
+        str or list: the name(s)
+    """
+    if isinstance(value, list):
+        return [_type_names(val) for val in value]
+    if inspect.isclass(value):
+        return value.__name__.lower()
+    return value
@@ -1,18 +1,89 @@
 import numpy as np
-import json
-from pybtex.database import BibliographyData
+import functools
+import pint
+import threading
 import warnings
 from textwrap import dedent
 
-from h_transport_materials import ureg, ArrheniusProperty, __version__
+from h_transport_materials import ureg, ArrheniusProperty
+from h_transport_materials.property import _NOT_FETCHED, _lock
+from h_transport_materials.aggregation import GroupBy, MeanAccumulator
+from h_transport_materials.columns import NUMERIC_COLUMNS, PropertiesColumns
+from h_transport_materials.fitting import (
+    K_B,
+    segmented_regression,
+    arrhenius_covariance,
+    BAND_CHUNK_ELEMENTS,
+    bootstrap_parameters,
+    nan_percentiles,
+    percentile_bands,
+)
+from h_transport_materials.streaming import iter_json, write_json
+from h_transport_materials.tables import InterpolationTable, _kelvin
+from h_transport_materials.value_cache import value_cache
 
 warnings.filterwarnings("always", message="No property matching the requirements")
 
 
+def _invalidating(method):
+    """Wraps a list method modifying the group so that the cached
+    columns are discarded"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._invalidate()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class PropertiesGroup(list):
+    _columns = None
+
+    @property
+    def columns(self):
+        """PropertiesColumns: columnar representation of the group used by
+        filter, mean and values. It is cached until the group or one of its
+        properties is modified."""
+        if self._columns is None or self._columns.outdated:
+            self._columns = PropertiesColumns(self)
+        return self._columns
+
+    def _invalidate(self):
+        """Discards the cached columns"""
+        self._columns = None
+
+    def _take(self, indices: np.ndarray):
+        """Returns a new group with some of the properties of the group.
+        The columns already built are passed to the new group.
+
+        Args:
+            indices (np.ndarray): the indices of the properties
+
+        Returns:
+            PropertiesGroup: the new group
+        """
+        columns = self.columns.take(indices)
+        new_group = PropertiesGroup(columns.properties)
+        new_group._columns = columns
+        return new_group
+
+    append = _invalidating(list.append)
+    extend = _invalidating(list.extend)
+    insert = _invalidating(list.insert)
+    remove = _invalidating(list.remove)
+    pop = _invalidating(list.pop)
+    clear = _invalidating(list.clear)
+    sort = _invalidating(list.sort)
+    reverse = _invalidating(list.reverse)
+    __setitem__ = _invalidating(list.__setitem__)
+    __delitem__ = _invalidating(list.__delitem__)
+    __iadd__ = _invalidating(list.__iadd__)
+    __imul__ = _invalidating(list.__imul__)
+
     @property
     def units(self):
-        all_units = list(set([prop.units for prop in self]))
+        all_units = self.columns["units"].unique()
         if len(all_units) == 1:
             return all_units[0]
         else:
@@ -20,6 +91,8 @@ class PropertiesGroup(list):
 
     @property
     def bibdata(self):
+        from pybtex.database import BibliographyData
+
         bibdata = {}
 
         for prop in self:
@@ -51,64 +124,490 @@ class PropertiesGroup(list):
                 keys will be excluded. Defaults to False.
             kwargs: attributes of properties (ex: material="tungsten").
                 String values must be lowercase to ensure good comparison.
+                The class of the properties can be filtered with the
+                ``type`` keyword (ex: type=htm.Diffusivity).
 
         Returns:
             PropertiesGroup: the resulting properties
 
         """
-        filtered_props = PropertiesGroup()
-
-        # iterate through properties
-        for prop in self:
-            match = True
-            for attr, value in kwargs.items():
-                prop_attr = getattr(prop, attr)
-
-                if isinstance(prop_attr, str):
-                    # make sure prop_attr are lower
-                    prop_attr = prop_attr.lower()
-
-                if isinstance(value, list):
-                    if prop_attr not in value:
-                        match = False
-                elif prop_attr != value:
-                    match = False
-
-            # append the property to the filtered list
-            if (match and not exclude) or (not match and exclude):
-                filtered_props.append(prop)
+        # the columns of the group are indexed on first use, so that
+        # subsequent filters are lookups rather than scans
+        match = np.ones(len(self), dtype=bool)
+        for attr, value in kwargs.items():
+            match &= self.columns.attribute(attr).matches(value)
+        if exclude:
+            match = ~match
+
+        filtered_props = self._take(np.flatnonzero(match))
         if len(filtered_props) == 0:
             warnings.warn("No property matching the requirements")
         return filtered_props
 
-    def mean(self):
+    def query(self, condition):
+        """
+        Returns the properties fulfilling a condition. Unlike filter,
+        conditions can be combined and compare ranges. The condition is
+        evaluated on the columns of the group, without intermediate groups.
+        Usage::
+
+            from h_transport_materials import Field, covers
+
+            group = htm.diffusivities
+            condition = (
+                (Field("material") == "tungsten")
+                & (Field("year") >= 2000)
+                & covers(900 * htm.ureg.K)
+                & ~(Field("isotope") == "t")
+            )
+            filtered_props = group.query(condition)
+
+        Args:
+            condition (h_transport_materials.query.Condition): the condition
+
+        Returns:
+            PropertiesGroup: the resulting properties
         """
-        Returns the mean Arrhenius property.
+        return self._take(np.flatnonzero(condition.mask(self.columns)))
+
+    def explain(self, condition) -> str:
+        """
+        Describes how a condition is evaluated by query: the order of
+        evaluation of the conditions, how they are evaluated and the
+        number of matching properties.
+
+        Args:
+            condition (h_transport_materials.query.Condition): the condition
+
+        Returns:
+            str: the query plan
+        """
+        _, lines = condition.plan(self.columns)
+        return "\n".join(lines)
+
+    def mean(self, weights=None, by=None):
+        """
+        Returns the mean Arrhenius property. The pre-exponential factors are
+        averaged geometrically (in log space) and the activation energies
+        arithmetically.
+        Usage::
+
+            # mean weighted by the number of citations
+            htm.diffusivities.fetch_nb_citations()
+            mean = htm.diffusivities.mean(weights="nb_citations")
+
+            # mean of each material in one pass
+            means = htm.diffusivities.mean(by="material")
+
+        Args:
+            weights (str, callable or array-like, optional): the weight of
+                each property: the name of a numeric attribute (eg. "year"),
+                a function of the property or one value per property.
+                If None, all the properties have the same weight.
+                Defaults to None.
+            by (str or list, optional): the name(s) of the attribute(s) by
+                which the properties are grouped (eg. "material" or
+                ["material", "isotope"]). Defaults to None.
 
         Raises:
             ValueError: When called on a mixed units group
 
         Returns:
-            ArrheniusProperty: the mean arrhenius property
+            ArrheniusProperty or dict: the mean arrhenius property, or the mean
+            property of each group if by is given
         """
         if self.units == "mixed units":
             raise ValueError("Can't compute mean on mixed units groups")
 
-        # geometric mean of pre-exponential factor
-        pre_exps = np.array([prop.pre_exp.magnitude for prop in self])
-        scaling_factor = np.max(pre_exps)
-        pre_exps = pre_exps / scaling_factor  # scale pre-exps to avoid inf
+        if weights is None or isinstance(weights, str) or callable(weights):
+            accumulator = MeanAccumulator(weights=weights, by=by)
+            accumulator.add(self)
+        else:
+            accumulator = MeanAccumulator(by=by)
+            accumulator.add(self, weights=weights)
+        return accumulator.result()
+
+    def groupby(self, keys):
+        """
+        Partitions the group by the values of one or several attributes
+        in one pass over the columns of the group.
+        Usage::
+
+            grouped = htm.diffusivities.groupby(["material", "isotope"])
+
+            # spread of the diffusivities at 600 K for each material and isotope
+            table = grouped.aggregate(T=600 * htm.ureg.K)
+            spread = table["max"] / table["min"]
+
+            tungsten_H = grouped[(htm.TUNGSTEN, "H")]
+
+        Args:
+            keys (str or list): the name(s) of the attribute(s)
+
+        Returns:
+            GroupBy: the partitioned group
+        """
+        return GroupBy(self, keys)
+
+    def values(self, T):
+        """
+        Evaluates all the properties of the group at once.
+        Usage::
+
+            T = np.linspace(300, 1200, num=10000) * htm.ureg.K
+            values = htm.diffusivities.filter(material="tungsten").values(T)
+
+        Args:
+            T (pint.Quantity): the temperature(s). If not a Quantity,
+                T is assumed in K.
+
+        Raises:
+            ValueError: When called on a mixed units group
+
+        Returns:
+            pint.Quantity: the values of the properties with shape
+            (number of properties, number of temperatures) for a 1D T
+        """
+        if not isinstance(T, pint.Quantity):
+            warnings.warn(f"no units were given with T, assuming {ureg.K}")
+            T = ureg.Quantity(T, ureg.K)
+        if value_cache.enabled:
+            # the columns are rebuilt when the group is modified
+            return value_cache.get_or_compute(
+                self.columns,
+                T,
+                lambda: self.values_magnitude(T.to(ureg.K).magnitude) * self.units,
+            )
+        return self.values_magnitude(T.to(ureg.K).magnitude) * self.units
+
+    def values_magnitude(self, T, units=None):
+        """
+        Evaluates all the properties of the group at once without pint
+        quantities.
+
+        Args:
+            T (float or np.ndarray): the temperature(s) in K
+            units (pint.Unit, optional): the units of the returned values.
+                If None, the units of the group are used. Defaults to None.
+
+        Raises:
+            ValueError: When called on a mixed units group
+
+        Returns:
+            np.ndarray: the values of the properties with shape
+            (number of properties, number of temperatures) for a 1D T
+        """
+        if self.units == "mixed units":
+            raise ValueError("Can't evaluate mixed units groups")
+
+        # pre-exponential factors are in the units of the group
+        pre_exps = self.columns["pre_exp"]
+        act_energies_over_k_B = self.columns["act_energy"] / K_B
+
+        if units is not None:
+            pre_exps = pre_exps * ureg.Quantity(1, self.units).to(units).magnitude
+
+        T = np.asarray(T, dtype=float)
+        values = np.exp(np.multiply.outer(-act_energies_over_k_B, 1 / T))
+        values *= pre_exps.reshape(-1, *[1] * T.ndim)
+        return values
+
+    def envelope(self, T, percentiles=(0, 50, 100), mask_range=False, chunk_size=None):
+        """
+        Computes percentile curves of the properties of the group (eg. the
+        min, median and max values at each temperature).
+        Usage::
+
+            T = np.linspace(300, 1200, num=100000) * htm.ureg.K
+            group = htm.diffusivities.filter(material="tungsten")
+            minimum, median, maximum = group.envelope(T, mask_range=True)
+
+        Args:
+            T (pint.Quantity): the temperatures. If not a Quantity,
+                T is assumed in K.
+            percentiles (tuple, optional): the percentiles (between 0 and 100).
+                Defaults to (0, 50, 100).
+            mask_range (bool, optional): if True, the properties are ignored
+                outside of their range of validity. Properties without
+                range are never ignored. Defaults to False.
+            chunk_size (int, optional): the number of temperatures evaluated
+                at once. If None, chunks hold about BAND_CHUNK_ELEMENTS values.
+                Defaults to None.
+
+        Raises:
+            ValueError: When called on a mixed units group
+
+        Returns:
+            pint.Quantity: the percentile curves with shape
+            (number of percentiles, number of temperatures), nan where no
+            property is valid
+        """
+        if self.units == "mixed units":
+            raise ValueError("Can't evaluate mixed units groups")
+        if not isinstance(T, pint.Quantity):
+            warnings.warn(f"no units were given with T, assuming {ureg.K}")
+            T = ureg.Quantity(T, ureg.K)
+        T = np.atleast_1d(T.to(ureg.K).magnitude).astype(float)
+        if chunk_size is None:
+            chunk_size = max(1, BAND_CHUNK_ELEMENTS // max(len(self), 1))
+
+        T_min = self.columns["T_min"][:, None]
+        T_max = self.columns["T_max"][:, None]
+        curves = np.empty((len(percentiles), len(T)))
+        for start in range(0, len(T), chunk_size):
+            T_chunk = T[start : start + chunk_size]
+            values = self.values_magnitude(T_chunk)
+            if mask_range:
+                values[(T_chunk < T_min) | (T_chunk > T_max)] = np.nan
+            if np.isnan(values).any():
+                chunk_curves = nan_percentiles(values, percentiles, axis=0)
+            else:
+                chunk_curves = np.percentile(values, percentiles, axis=0)
+            curves[:, start : start + chunk_size] = chunk_curves
+        return curves * self.units
+
+    def to_table(
+        self, T_min, T_max, n: int, kind="log-linear in 1/T", dtype=np.float64
+    ):
+        """
+        Tabulates all the properties of the group in one contiguous array
+        (see ArrheniusProperty.to_table).
+        Usage::
+
+            table = group.to_table(300 * htm.ureg.K, 1200 * htm.ureg.K, 1000)
+            values = table(T)  # shape (len(group), len(T)) in group.units
+
+        Args:
+            T_min (pint.Quantity): the lower bound of the table. If not a
+                Quantity, T_min is assumed in K.
+            T_max (pint.Quantity): the upper bound of the table. If not a
+                Quantity, T_max is assumed in K.
+            n (int): the number of points of the table
+            kind (str, optional): "log-linear in 1/T", "linear in 1/T" or
+                "linear in T". Defaults to "log-linear in 1/T".
+            dtype (np.dtype, optional): the type of the tabulated values
+                (np.float64 or np.float32). Defaults to np.float64.
+
+        Raises:
+            ValueError: When called on a mixed units group
+
+        Returns:
+            InterpolationTable: the table
+        """
+        if self.units == "mixed units":
+            raise ValueError("Can't tabulate mixed units groups")
+        return InterpolationTable.from_arrhenius(
+            self.columns["pre_exp"],
+            self.columns["act_energy"] / K_B,
+            _kelvin(T_min),
+            _kelvin(T_max),
+            n,
+            kind=kind,
+            dtype=dtype,
+            units=self.units,
+        )
 
-        pre_exp = pre_exps.prod() ** (1.0 / len(pre_exps))  # compute mean
-        pre_exp = pre_exp * scaling_factor  # re-scale
+    def fit_all(self, refit: bool = False, weights=None, method: str = "ols"):
+        """
+        Fits all the properties with experimental points (data_T, data_y)
+        at once. The fits of all the datasets are computed in a single
+        vectorised computation (without the disk cache of
+        ArrheniusProperty.fit). The pre-exponential factors, activation
+        energies, ranges and fit covariances of the properties are set.
 
-        # arithmetic mean of activation energy
-        act_energy = np.array([prop.act_energy.magnitude for prop in self]).mean()
+        Args:
+            refit (bool, optional): if True, the properties that are already
+                fitted are fitted again. Defaults to False.
+            weights (list, optional): the weights of the points of each
+                property of the group (None for unweighted properties).
+                Defaults to None.
+            method (str, optional): "ols" (least squares), "huber" (least
+                squares with the Huber loss) or "theil-sen" (Theil-Sen
+                estimator). Defaults to "ols".
+        """
+        if weights is None:
+            weights = [None] * len(self)
+        to_fit = []
+        for prop, prop_weights in zip(self, weights):
+            has_data = (
+                isinstance(prop, ArrheniusProperty)
+                and prop.data_T is not None
+                and prop.data_y is not None
+                and len(prop.data_T) > 0
+            )
+            if not has_data:
+                continue
+            if (
+                refit
+                or prop._pre_exp is None
+                or prop._act_energy is None
+                or prop._range is None
+            ):
+                to_fit.append((prop, prop_weights))
+        if not to_fit:
+            return
+
+        # data_T is always stored in K
+        data_T = [prop.data_T.magnitude for prop, _ in to_fit]
+        data_y = [prop.data_y.magnitude for prop, _ in to_fit]
+        lengths = np.array([len(T) for T in data_T])
+        all_T = np.concatenate(data_T).astype(float)
+        all_weights = None
+        if any(prop_weights is not None for _, prop_weights in to_fit):
+            all_weights = np.concatenate(
+                [
+                    np.ones(length) if prop_weights is None else prop_weights
+                    for (_, prop_weights), length in zip(to_fit, lengths)
+                ]
+            )
 
-        property = ArrheniusProperty(
-            pre_exp * self.units, act_energy * ureg.eV * ureg.particle**-1
+        intercepts, slopes, covariances = segmented_regression(
+            1 / all_T,
+            np.log(np.concatenate(data_y).astype(float)),
+            lengths,
+            weights=all_weights,
+            method=method,
         )
-        return property
+        covariances = arrhenius_covariance(covariances)
+        # first point of each dataset
+        starts = np.cumsum(lengths) - lengths
+        T_min = np.minimum.reduceat(all_T, starts)
+        T_max = np.maximum.reduceat(all_T, starts)
+
+        pre_exps = np.exp(intercepts)
+        act_energies = -slopes * K_B
+        energy_units = ureg.eV * ureg.particle**-1
+        for i, (prop, _) in enumerate(to_fit):
+            with _lock(prop):
+                # quantities are created directly, avoiding numpy operations
+                # with units
+                prop.pre_exp = ureg.Quantity(float(pre_exps[i]), prop.data_y.units)
+                prop.act_energy = ureg.Quantity(float(act_energies[i]), energy_units)
+                prop.range = (
+                    ureg.Quantity(float(T_min[i]), ureg.K),
+                    ureg.Quantity(float(T_max[i]), ureg.K),
+                )
+                prop.fit_covariance = covariances[i]
+
+    def bootstrap(
+        self,
+        T,
+        nb_resamples: int = 1000,
+        percentiles=(2.5, 50, 97.5),
+        seed=None,
+        method: str = "ols",
+        processes: int = None,
+    ):
+        """
+        Confidence bands of all the properties of the group obtained by
+        bootstrapping their experimental points (see
+        ArrheniusProperty.bootstrap). All the resamples of all the
+        properties are fitted together.
+
+        Args:
+            T (pint.Quantity): the temperatures. If not a Quantity,
+                T is assumed in K.
+            nb_resamples (int, optional): the number of resamples.
+                Defaults to 1000.
+            percentiles (tuple, optional): the percentiles of the bands.
+                Defaults to (2.5, 50, 97.5).
+            seed (int, optional): the seed of the random generators.
+                Defaults to None.
+            method (str, optional): the fitting method. Defaults to "ols".
+            processes (int, optional): the number of processes the resamples
+                are spread across. If None, they are fitted in this process.
+                Defaults to None.
+
+        Raises:
+            ValueError: When called on a mixed units group
+
+        Returns:
+            pint.Quantity: the bands with shape (number of properties,
+            number of percentiles, number of temperatures), nan for the
+            properties without experimental points
+        """
+        if self.units == "mixed units":
+            raise ValueError("Can't bootstrap mixed units groups")
+        if not isinstance(T, pint.Quantity):
+            warnings.warn(f"no units were given with T, assuming {ureg.K}")
+            T = ureg.Quantity(T, ureg.K)
+        T = np.atleast_1d(T.to(ureg.K).magnitude)
+
+        with_data = [
+            i
+            for i, prop in enumerate(self)
+            if isinstance(prop, ArrheniusProperty)
+            and prop.data_T is not None
+            and prop.data_y is not None
+        ]
+        bands = np.full((len(self), len(percentiles), len(T)), np.nan)
+        if with_data:
+            data_T = [self[i].data_T.magnitude for i in with_data]
+            data_y = [self[i].data_y.magnitude for i in with_data]
+            intercepts, slopes = bootstrap_parameters(
+                1 / np.concatenate(data_T).astype(float),
+                np.log(np.concatenate(data_y).astype(float)),
+                [len(T_i) for T_i in data_T],
+                nb_resamples=nb_resamples,
+                seed=seed,
+                method=method,
+                processes=processes,
+            )
+            bands[with_data] = percentile_bands(intercepts, slopes, T, percentiles)
+        return bands * self.units
+
+    def fetch_nb_citations(self, **kwargs):
+        """
+        Sets the number of citations of all the properties at once.
+        The counts are fetched concurrently from crossref and cached
+        on disk (see h_transport_materials.citations.fetch_nb_citations).
+        Usage::
+
+            htm.diffusivities.fetch_nb_citations()
+            most_cited = max(htm.diffusivities, key=lambda prop: prop.nb_citations)
+
+        Args:
+            kwargs: arguments of h_transport_materials.citations.fetch_nb_citations
+                (ex: max_workers=4)
+        """
+        from h_transport_materials.citations import fetch_nb_citations
+
+        props_and_dois = []
+        for prop in self:
+            if prop._nb_citations is not _NOT_FETCHED:
+                continue
+            if prop.bibsource is None or not prop.doi:
+                prop.nb_citations = 0
+            else:
+                props_and_dois.append((prop, prop.doi))
+
+        nb_citations = fetch_nb_citations([doi for _, doi in props_and_dois], **kwargs)
+        for prop, doi in props_and_dois:
+            # 0 if it couldn't be fetched (fetch_nb_citations warns)
+            prop.nb_citations = nb_citations.get(doi, 0)
+
+    def warm(self, citations: bool = False, **kwargs):
+        """
+        Performs the lazy initialisations of the properties at once:
+        fits the properties with experimental points, parses their
+        references and builds the columns of the group. Servers can call it
+        before accepting requests so that readers don't pay these costs.
+        Usage::
+
+            htm.database.warm()
+
+        Args:
+            citations (bool, optional): if True, the number of citations
+                are also fetched (see fetch_nb_citations). Defaults to False.
+            kwargs: arguments of fetch_nb_citations
+        """
+        self.fit_all()
+        for prop in self:
+            prop.bibsource
+        for name in NUMERIC_COLUMNS + ["type", "units", "material", "isotope"]:
+            self.columns[name]
+        if citations:
+            self.fetch_nb_citations(**kwargs)
 
     def export_bib(self, filename: str):
         """
@@ -120,15 +619,97 @@ class PropertiesGroup(list):
 
         self.bibdata.to_file(filename)
 
-    def export_to_json(self, filename: str):
-        data = {"data": []}
-        for prop in self:
-            data["data"].append(prop.to_json())
+    def export_to_json(self, filename: str, lines: bool = False, compact: bool = False):
+        """
+        Exports the group to a JSON file. The properties are written one at
+        a time (see htm.write_json).
+
+        Args:
+            filename (str): the path of the file
+            lines (bool, optional): if True, the file is written in the JSON
+                Lines format (one compact property per line).
+                Defaults to False.
+            compact (bool, optional): if True, the JSON is written without
+                indentation and spaces. Defaults to False.
+        """
+        write_json(self, filename, lines=lines, compact=compact)
 
-        data["htm_version"] = __version__
+    def export_to_npz(self, filename: str, compressed: bool = False):
+        """
+        Exports the group to a numpy .npz file with one array per attribute
+        (one row per property). Pre-exponential factors and experimental
+        points are in the units of the ``units`` column, activation
+        energies in eV/particle and temperatures in K. The experimental
+        points of property i are ``data_T[data_offsets[i]:data_offsets[i + 1]]``.
+        Usage::
+
+            htm.database.export_to_npz("database.npz")
+            data = np.load("database.npz")
+
+        Args:
+            filename (str): the path of the file
+            compressed (bool, optional): if True, the arrays are compressed.
+                Defaults to False.
+        """
+        from h_transport_materials.columnar import export_to_npz
 
-        with open(filename, "w") as outfile:
-            json.dump(data, outfile, indent=4)
+        export_to_npz(self, filename, compressed=compressed)
+
+    def export_to_parquet(self, filename: str):
+        """
+        Exports the group to a Parquet file with the columns of
+        export_to_npz, experimental points being list columns.
+        Requires pyarrow.
+
+        Args:
+            filename (str): the path of the file
+
+        Raises:
+            ImportError: if pyarrow is not installed
+        """
+        from h_transport_materials.columnar import export_to_parquet
+
+        export_to_parquet(self, filename)
+
+    def export_to_mmap(self, directory: str):
+        """
+        Exports the group to a directory of .npy files that can be opened
+        memory-mapped and shared by several processes with
+        htm.MappedPropertiesGroup.
+        Usage::
+
+            htm.database.export_to_mmap("htm_database")
+            database = htm.MappedPropertiesGroup("htm_database")
+
+        Args:
+            directory (str): the path of the directory, created if needed
+        """
+        from h_transport_materials.mapped import export_to_mmap
+
+        export_to_mmap(self, directory)
+
+    @classmethod
+    def from_json(cls, filename: str, lines: bool = None):
+        """
+        Reads a group exported with export_to_json, without importing the
+        HTM database. Files too large to be held in memory can be read one
+        property at a time with htm.iter_json.
+        Usage::
+
+            htm.diffusivities.export_to_json("diffusivities.json")
+            diffusivities = htm.PropertiesGroup.from_json("diffusivities.json")
+
+        Args:
+            filename (str): the path of the JSON file
+            lines (bool, optional): True for the JSON Lines format. If None,
+                it is inferred from the suffix of the file (.jsonl or
+                .ndjson). Defaults to None.
+
+        Returns:
+            PropertiesGroup: the properties, of the classes they were
+            exported from
+        """
+        return cls(iter_json(filename, lines=lines))
 
     def to_latex_table(self):
         """Exports to simple latex table"""
@@ -158,3 +739,113 @@ class PropertiesGroup(list):
 
         latex_table = dedent(latex_table).strip("\n")
         return latex_table
+
+
+def _materialised(method):
+    """Wraps a list method so that the lazy group is fully loaded before
+    calling it"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._materialise()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class LazyPropertiesGroup(PropertiesGroup):
+    """A PropertiesGroup which properties are only loaded when needed.
+
+    The whole group is loaded when it is iterated through, indexed or
+    measured. Filtering by material only loads the properties of the
+    requested materials.
+    Usage::
+
+        # only loads the tungsten properties
+        tungsten_diffusivities = htm.diffusivities.filter(material="tungsten")
+
+    Args:
+        load (callable): function loading the properties of a material
+            in the group (or of all the materials if called with None)
+        parent (LazyPropertiesGroup, optional): if given, the group holds
+            the properties of parent that are instances of prop_type.
+            Defaults to None.
+        prop_type (type, optional): the type of properties taken from
+            parent. Defaults to None.
+    """
+
+    # the lazy groups share the modules they load from, modules are loaded
+    # by one thread at a time so that their properties are only added once
+    _materialise_lock = threading.RLock()
+
+    def __init__(self, load, parent=None, prop_type=None):
+        super().__init__()
+        self._load = load
+        self._parent = parent
+        self._prop_type = prop_type
+        self._nb_parent_props_seen = 0
+        self._loaded_group = None
+
+    def _materialise(self, material=None):
+        """Loads the properties of a material
+
+        Args:
+            material (str, Material, type or list, optional): the material(s)
+                to load. If None, all the properties are loaded.
+                Defaults to None.
+        """
+        with self._materialise_lock:
+            self._load(material)
+            if self._parent is None:
+                return
+            # the parent only grows, only look at its new properties
+            nb_parent_props = list.__len__(self._parent)
+            new_props = list.__getitem__(
+                self._parent, slice(self._nb_parent_props_seen, nb_parent_props)
+            )
+            self._invalidate()
+            list.extend(
+                self, (prop for prop in new_props if isinstance(prop, self._prop_type))
+            )
+            self._nb_parent_props_seen = nb_parent_props
+
+    def _invalidate(self):
+        super()._invalidate()
+        self._loaded_group = None
+
+    def _loaded(self):
+        """Returns the properties loaded so far
+
+        Returns:
+            PropertiesGroup: the loaded properties
+        """
+        if self._loaded_group is None:
+            self._loaded_group = PropertiesGroup(list.__iter__(self))
+        return self._loaded_group
+
+    def filter(self, exclude=False, **kwargs):
+        if "material" in kwargs and not exclude:
+            self._materialise(kwargs["material"])
+        else:
+            self._materialise()
+        return self._loaded().filter(exclude=exclude, **kwargs)
+
+    filter.__doc__ = PropertiesGroup.filter.__doc__
+
+    __iter__ = _materialised(PropertiesGroup.__iter__)
+    __reversed__ = _materialised(PropertiesGroup.__reversed__)
+    __len__ = _materialised(PropertiesGroup.__len__)
+    __getitem__ = _materialised(PropertiesGroup.__getitem__)
+    __setitem__ = _materialised(PropertiesGroup.__setitem__)
+    __delitem__ = _materialised(PropertiesGroup.__delitem__)
+    __contains__ = _materialised(PropertiesGroup.__contains__)
+    __eq__ = _materialised(PropertiesGroup.__eq__)
+    __add__ = _materialised(PropertiesGroup.__add__)
+    __repr__ = _materialised(PropertiesGroup.__repr__)
+    copy = _materialised(PropertiesGroup.copy)
+    count = _materialised(PropertiesGroup.count)
+    index = _materialised(PropertiesGroup.index)
+    pop = _materialised(PropertiesGroup.pop)
+    remove = _materialised(PropertiesGroup.remove)
+    reverse = _materialised(PropertiesGroup.reverse)
+    sort = _materialised(PropertiesGroup.sort)
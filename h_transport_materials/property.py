@@ -1,15 +1,82 @@
 from collections.abc import Iterable
+import functools
 import numpy as np
-import scipy.stats as stats
 from crossref.restful import Works, Etiquette
 import pint
-from pybtex.database import BibliographyData, parse_string
 from h_transport_materials import k_B, bib_database, ureg
+from h_transport_materials import material as htm_material
+from h_transport_materials.fitting import (
+    arrhenius_regression,
+    arrhenius_covariance,
+    bootstrap_parameters,
+    percentile_bands,
+)
+from h_transport_materials.tables import InterpolationTable, _kelvin
+from h_transport_materials.value_cache import value_cache
 
+import threading
 import warnings
 
 DEFAULT_ENERGY_UNITS = ureg.eV * ureg.particle**-1
 
+# units of the properties, built once as they are used for every property
+SOLUBILITY_UNITS = {
+    "sievert": ureg.particle * ureg.meter**-3 * ureg.Pa**-0.5,
+    "henry": ureg.particle * ureg.meter**-3 * ureg.Pa**-1,
+}
+DIFFUSIVITY_UNITS = ureg.meter**2 * ureg.second**-1
+PERMEABILITY_UNITS = {
+    "sievert": ureg.particle * ureg.meter**-1 * ureg.second**-1 * ureg.Pa**-0.5,
+    "henry": ureg.particle * ureg.meter**-1 * ureg.second**-1 * ureg.Pa**-1,
+}
+RECOMBINATION_COEFF_UNITS = (
+    ureg.particle * ureg.meter**4 * ureg.second**-1 * ureg.particle**-2
+)
+DISSOCIATION_COEFF_UNITS = ureg.particle * ureg.meter**-2 * ureg.s**-1 * ureg.Pa**-1
+
+# locks making the lazy initialisations (fit, bibsource, nb_citations) of
+# each property happen once when several threads read it. They are shared
+# between properties (striped) rather than stored in the properties so that
+# properties can still be copied and pickled
+_LOCKS = [threading.RLock() for _ in range(64)]
+
+
+class _NotFetched:
+    """Number of citations of the properties whose count wasn't fetched yet,
+    a singleton which is kept by copies and pickling"""
+
+    def __reduce__(self):
+        return "_NOT_FETCHED"
+
+
+_NOT_FETCHED = _NotFetched()
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_units(units: str) -> pint.Unit:
+    """Parses units once, the same few units are read for all the
+    properties of JSON documents
+
+    Args:
+        units (str): the units
+
+    Returns:
+        pint.Unit: the parsed units
+    """
+    return ureg.Unit(units)
+
+
+def _lock(prop) -> threading.RLock:
+    """Returns the lock of a property
+
+    Args:
+        prop (Property): the property
+
+    Returns:
+        threading.RLock: the lock
+    """
+    return _LOCKS[(id(prop) >> 4) % len(_LOCKS)]
+
 
 class Property:
     """Base Property class
@@ -26,6 +93,11 @@ class Property:
         note (str, optional): additional information. Defaults to None.
     """
 
+    # incremented each time a public attribute of a property stored in
+    # PropertiesColumns is set, so that the columns know they are outdated
+    _nb_modifications = 0
+    _in_columns = False
+
     def __init__(
         self,
         material: str = "",
@@ -41,13 +113,22 @@ class Property:
         self.isotope = isotope
         self.note = note
 
-        self.nb_citations = None
+        self._nb_citations = _NOT_FETCHED
         self.author = author
         self.year = year
         self.source = source
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if self._in_columns and not name.startswith("_"):
+            Property._nb_modifications += 1
+        if name in ["_pre_exp", "_act_energy"]:
+            value_cache.invalidate(self)
+
     @property
     def bibdata(self):
+        from pybtex.database import BibliographyData
+
         if self.bibsource is None:
             raise ValueError("No bibsource found")
 
@@ -80,8 +161,14 @@ class Property:
         self._source = value
         # try to set bibsource
         if value in bib_database.entries:
-            self.bibsource = bib_database.entries[value]
+            # the entry is only parsed when bibsource is accessed,
+            # author and year are read from the bibliography index
+            self._bibsource = None
+            self._bibsource_key = value
+            self._set_author_and_year(*bib_database.author_and_year(value))
         elif value.startswith("@"):
+            from pybtex.database import parse_string
+
             self.bibsource = list(
                 parse_string(self.source, bib_format="bibtex").entries.values()
             )[0]
@@ -90,11 +177,17 @@ class Property:
 
     @property
     def bibsource(self):
+        if self._bibsource_key is not None:
+            with _lock(self):
+                if self._bibsource_key is not None:
+                    self._bibsource = bib_database.entries[self._bibsource_key]
+                    self._bibsource_key = None
         return self._bibsource
 
     @bibsource.setter
     def bibsource(self, value):
         self._bibsource = value
+        self._bibsource_key = None
         if value is not None:
             self.get_author_and_year_from_bibsource()
 
@@ -114,18 +207,27 @@ class Property:
     @property
     def nb_citations(self):
         # if nb_citations doesn't already exist, compute it
-        if self._nb_citations is None:
-            if self.bibsource is None:
-                self.nb_citations = 0
-            elif self.doi:
-                self.nb_citations = get_nb_citations(self.doi)
-            else:
-                self.nb_citations = 0
+        if self._nb_citations is _NOT_FETCHED:
+            # fetched without the lock so that other threads aren't blocked
+            # by the request, the lock only publishes the first result
+            nb_citations = self._fetch_nb_citations()
+            with _lock(self):
+                if self._nb_citations is _NOT_FETCHED:
+                    self._nb_citations = nb_citations
         return self._nb_citations
 
+    def _fetch_nb_citations(self) -> int:
+        if self.bibsource is None or not self.doi:
+            return 0
+        from h_transport_materials.citations import fetch_nb_citations
+
+        # 0 if it couldn't be fetched (fetch_nb_citations warns)
+        return fetch_nb_citations([self.doi]).get(self.doi, 0)
+
     @nb_citations.setter
     def nb_citations(self, value):
-        self._nb_citations = value
+        # None discards the number of citations, it is fetched again
+        self._nb_citations = _NOT_FETCHED if value is None else value
 
     def export_bib(self, filename: str):
         """Exports the property reference to bib
@@ -148,9 +250,10 @@ class Property:
         as_json = {}
         if self.range is not None:
             as_json["range"] = {}
+            # numpy scalars (eg. fitted ranges) aren't JSON serialisable
             as_json["range"]["value"] = (
-                self.range[0].magnitude,
-                self.range[1].magnitude,
+                float(self.range[0].magnitude),
+                float(self.range[1].magnitude),
             )
             as_json["range"]["units"] = f"{self.range[0].units}"
         as_json["material"] = self.material.name
@@ -164,12 +267,55 @@ class Property:
 
         return as_json
 
+    @staticmethod
+    def from_json(as_json: dict):
+        """Creates a property from its dictionary representation
+
+        Args:
+            as_json (dict): the dict representation of the property
+                as returned by to_json
+
+        Returns:
+            Property: the property, of the class given by as_json["type"]
+        """
+        prop = PROPERTY_TYPES[as_json["type"]]()
+        prop._set_attributes_from_json(as_json)
+        return prop
+
+    def _set_attributes_from_json(self, as_json: dict):
+        """Sets the attributes of the property from its dictionary representation
+
+        Args:
+            as_json (dict): the dict representation of the property
+        """
+        if "range" in as_json:
+            range_units = _parse_units(as_json["range"]["units"])
+            self.range = tuple(
+                ureg.Quantity(bound, range_units) for bound in as_json["range"]["value"]
+            )
+        self.material = MATERIALS.get(as_json["material"], as_json["material"])
+        self.source = as_json["source"]
+        # author and year are set after source to avoid warnings
+        self.author = as_json["author"]
+        self.year = as_json["year"]
+        self.isotope = as_json["isotope"]
+        self.note = as_json["note"]
+
     def get_author_and_year_from_bibsource(self):
         year_from_source = int(self.bibsource.fields["year"])
+        author_from_source = self.bibsource.persons["author"][0].last_names[0].lower()
+        self._set_author_and_year(author_from_source, year_from_source)
+
+    def _set_author_and_year(self, author_from_source: str, year_from_source: int):
+        """Sets the author and year found in the bib source
+
+        Args:
+            author_from_source (str): the author of the bib source
+            year_from_source (int): the year of the bib source
+        """
         if self.year is not None:
             warnings.warn("year argument will be ignored since a bib source was found")
         self.year = year_from_source
-        author_from_source = self.bibsource.persons["author"][0].last_names[0].lower()
         if self.author != "":
             warnings.warn(
                 "author argument will be ignored since a bib source was found"
@@ -203,6 +349,8 @@ class ArrheniusProperty(Property):
         data_y: list = None,
         **kwargs,
     ) -> None:
+        self._magnitudes_cache = None
+        self.fit_covariance = None
         self.pre_exp = pre_exp
         self.act_energy = act_energy
         self.data_T = data_T
@@ -273,7 +421,7 @@ class ArrheniusProperty(Property):
     @property
     def range(self):
         if self._range is None and self.data_T is not None:
-            self.fit()
+            self._fit_once()
         return self._range
 
     @range.setter
@@ -301,7 +449,7 @@ class ArrheniusProperty(Property):
     @property
     def pre_exp(self):
         if self._pre_exp is None and self.data_T is not None:
-            self.fit()
+            self._fit_once()
         return self._pre_exp
 
     @pre_exp.setter
@@ -324,7 +472,7 @@ class ArrheniusProperty(Property):
     @property
     def act_energy(self):
         if self._act_energy is None and self.data_T is not None:
-            self.fit()
+            self._fit_once()
         return self._act_energy
 
     @act_energy.setter
@@ -401,25 +549,196 @@ class ArrheniusProperty(Property):
 
         return ureg.Quantity(quantity_mag, quantity.units)
 
-    def fit(self):
+    def _fit_once(self):
+        """Fits the property unless another thread fitted it meanwhile"""
+        with _lock(self):
+            if any(
+                value is None
+                for value in [self._pre_exp, self._act_energy, self._range]
+            ):
+                self.fit()
+
+    def fit(self, weights=None, method: str = "ols"):
+        """Fits the Arrhenius parameters on the experimental points
+        data_T and data_y. The covariance of (ln(pre_exp), act_energy)
+        (with act_energy in eV/particle) is stored in fit_covariance.
+
+        Args:
+            weights (np.ndarray, optional): the weights of the points.
+                Defaults to None.
+            method (str, optional): "ols" (least squares), "huber" (least
+                squares with the Huber loss) or "theil-sen" (Theil-Sen
+                estimator). Defaults to "ols".
+        """
         assert self.data_T.units == ureg.K
 
-        D_ln = np.log(self.data_y.magnitude)
-        T_inv = 1 / self.data_T.magnitude
+        # the regression is cached on disk
+        intercept, slope, covariance = arrhenius_regression(
+            self.data_T, self.data_y, weights=weights, method=method
+        )
+
+        # readers waiting for the lock see all the fitted attributes at once
+        with _lock(self):
+            self.pre_exp = np.exp(intercept) * self.data_y.units
+            self.act_energy = -(slope * ureg.K) * k_B
+            self.fit_covariance = arrhenius_covariance(covariance)
+
+            self.range = (self.data_T.min(), self.data_T.max())
 
-        res = stats.linregress(T_inv, D_ln)
+    def bootstrap(
+        self,
+        T,
+        nb_resamples: int = 1000,
+        percentiles=(2.5, 50, 97.5),
+        seed=None,
+        method: str = "ols",
+        processes: int = None,
+    ):
+        """Confidence bands of the property obtained by bootstrapping the
+        experimental points data_T and data_y.
+        Usage::
+
+            T = np.linspace(300, 1200) * htm.ureg.K
+            low, median, high = prop.bootstrap(T, seed=42)
 
-        self.pre_exp = np.exp(res.intercept) * self.data_y.units
-        self.act_energy = -(res.slope * ureg.K) * k_B
+        Args:
+            T (pint.Quantity): the temperatures. If not a Quantity,
+                T is assumed in K.
+            nb_resamples (int, optional): the number of resamples.
+                Defaults to 1000.
+            percentiles (tuple, optional): the percentiles of the bands.
+                Defaults to (2.5, 50, 97.5).
+            seed (int, optional): the seed of the random generators.
+                Defaults to None.
+            method (str, optional): the fitting method (see fit).
+                Defaults to "ols".
+            processes (int, optional): the number of processes the resamples
+                are spread across. If None, they are fitted in this process.
+                Defaults to None.
 
-        self.range = (self.data_T.min(), self.data_T.max())
+        Raises:
+            ValueError: if the property has no experimental points
+
+        Returns:
+            pint.Quantity: the bands with shape (number of percentiles,
+            number of temperatures)
+        """
+        if self.data_T is None or self.data_y is None:
+            raise ValueError("bootstrap requires data_T and data_y")
+        if not isinstance(T, pint.Quantity):
+            warnings.warn(f"no units were given with T, assuming {ureg.K}")
+            T = ureg.Quantity(T, ureg.K)
+
+        intercepts, slopes = bootstrap_parameters(
+            1 / np.asarray(self.data_T.magnitude, dtype=float),
+            np.log(np.asarray(self.data_y.magnitude, dtype=float)),
+            [len(self.data_T)],
+            nb_resamples=nb_resamples,
+            seed=seed,
+            method=method,
+            processes=processes,
+        )
+        bands = percentile_bands(
+            intercepts, slopes, T.to(ureg.K).magnitude, percentiles
+        )
+        return bands[0] * self.data_y.units
 
     def value(self, T, exp=np.exp):
         if not isinstance(T, pint.Quantity):
             warnings.warn(f"no units were given with T, assuming {ureg.K}")
-            T *= ureg.K
+            T = T * ureg.K
+        if value_cache.enabled and exp is np.exp:
+            return value_cache.get_or_compute(
+                self, T, lambda: self.pre_exp * exp(-self.act_energy / k_B / T)
+            )
         return self.pre_exp * exp(-self.act_energy / k_B / T)
 
+    def value_magnitude(self, T, units=None):
+        """Evaluates the property with plain floats or numpy arrays.
+        Much faster than value() as no pint quantities are involved,
+        useful when the property is evaluated many times (eg. in solvers).
+
+        Args:
+            T (float or np.ndarray): the temperature(s) in K
+            units (pint.Unit, optional): the units of the returned value.
+                If None, the units of the property are used. Defaults to None.
+
+        Returns:
+            float or np.ndarray: the value of the property
+        """
+        pre_exp, act_energy_over_k_B = self._magnitudes(units)
+        return pre_exp * np.exp(-act_energy_over_k_B / T)
+
+    def to_table(
+        self, T_min, T_max, n: int, kind="log-linear in 1/T", dtype=np.float64
+    ):
+        """Tabulates the property for solvers evaluating it many times.
+        The table is evaluated in O(1) with plain floats or numpy arrays.
+        Usage::
+
+            table = prop.to_table(300 * htm.ureg.K, 1200 * htm.ureg.K, 1000)
+            values = table(T)  # T in K, values in prop.units
+
+        Args:
+            T_min (pint.Quantity): the lower bound of the table. If not a
+                Quantity, T_min is assumed in K.
+            T_max (pint.Quantity): the upper bound of the table. If not a
+                Quantity, T_max is assumed in K.
+            n (int): the number of points of the table
+            kind (str, optional): "log-linear in 1/T", "linear in 1/T" or
+                "linear in T" (see InterpolationTable).
+                Defaults to "log-linear in 1/T".
+            dtype (np.dtype, optional): the type of the tabulated values
+                (np.float64 or np.float32). Defaults to np.float64.
+
+        Returns:
+            InterpolationTable: the table, with its relative error bound in
+            table.relative_error
+        """
+        pre_exp, act_energy_over_k_B = self._magnitudes(self.units)
+        return InterpolationTable.from_arrhenius(
+            pre_exp,
+            act_energy_over_k_B,
+            _kelvin(T_min),
+            _kelvin(T_max),
+            n,
+            kind=kind,
+            dtype=dtype,
+            units=self.units,
+        )
+
+    def _magnitudes(self, units=None):
+        """Returns the Arrhenius parameters as floats. They are computed once
+        and cached until pre_exp or act_energy are modified.
+
+        Args:
+            units (pint.Unit, optional): the units of the pre-exponential
+                factor. If None, the units of the property are used.
+                Defaults to None.
+
+        Returns:
+            float, float: the pre-exponential factor and the activation energy
+            divided by k_B in K
+        """
+        pre_exp, act_energy = self.pre_exp, self.act_energy
+        cache = self._magnitudes_cache
+        if (
+            cache is None
+            or cache["pre_exp"] is not pre_exp
+            or (cache["act_energy"] is not act_energy)
+        ):
+            cache = {
+                "pre_exp": pre_exp,
+                "act_energy": act_energy,
+                "act_energy_over_k_B": (act_energy / k_B).to(ureg.K).magnitude,
+                "pre_exp_in_units": {None: pre_exp.magnitude},
+            }
+            self._magnitudes_cache = cache
+
+        if units not in cache["pre_exp_in_units"]:
+            cache["pre_exp_in_units"][units] = pre_exp.to(units).magnitude
+        return cache["pre_exp_in_units"][units], cache["act_energy_over_k_B"]
+
     def to_json(self):
         """Returns a dictionary with the relevant attributes of the property
 
@@ -441,8 +760,28 @@ class ArrheniusProperty(Property):
             as_json["data_y"] = {}
             as_json["data_y"]["value"] = self.data_y.magnitude.tolist()
             as_json["data_y"]["units"] = f"{self.data_y.units}"
+        if self.fit_covariance is not None:
+            # undefined covariances (eg. fits of two points) are stored as
+            # null and read as nan
+            as_json["fit_covariance"] = [
+                [value if np.isfinite(value) else None for value in row]
+                for row in np.asarray(self.fit_covariance, dtype=float).tolist()
+            ]
         return as_json
 
+    def _set_attributes_from_json(self, as_json: dict):
+        # set pre_exp and act_energy before range and data to avoid fitting
+        for attribute in ["pre_exp", "act_energy", "data_T", "data_y"]:
+            if attribute in as_json:
+                value = ureg.Quantity(
+                    as_json[attribute]["value"],
+                    _parse_units(as_json[attribute]["units"]),
+                )
+                setattr(self, attribute, value)
+        if "fit_covariance" in as_json:
+            self.fit_covariance = np.array(as_json["fit_covariance"], dtype=float)
+        super()._set_attributes_from_json(as_json)
+
 
 class Solubility(ArrheniusProperty):
     """Solubility class
@@ -519,10 +858,7 @@ class Solubility(ArrheniusProperty):
 
     @property
     def units(self):
-        if self.law == "sievert":
-            return ureg.particle * ureg.meter**-3 * ureg.Pa**-0.5
-        elif self.law == "henry":
-            return ureg.particle * ureg.meter**-3 * ureg.Pa**-1
+        return SOLUBILITY_UNITS.get(self.law)
 
 
 class Diffusivity(ArrheniusProperty):
@@ -538,7 +874,7 @@ class Diffusivity(ArrheniusProperty):
 
     @property
     def units(self):
-        return ureg.meter**2 * ureg.second**-1
+        return DIFFUSIVITY_UNITS
 
 
 class Permeability(ArrheniusProperty):
@@ -632,10 +968,7 @@ class Permeability(ArrheniusProperty):
 
     @property
     def units(self):
-        if self.law == "sievert":
-            return ureg.particle * ureg.meter**-1 * ureg.second**-1 * ureg.Pa**-0.5
-        elif self.law == "henry":
-            return ureg.particle * ureg.meter**-1 * ureg.second**-1 * ureg.Pa**-1
+        return PERMEABILITY_UNITS.get(self.law)
 
 
 class RecombinationCoeff(ArrheniusProperty):
@@ -646,7 +979,7 @@ class RecombinationCoeff(ArrheniusProperty):
 
     @property
     def units(self):
-        return ureg.particle * ureg.meter**4 * ureg.second**-1 * ureg.particle**-2
+        return RECOMBINATION_COEFF_UNITS
 
 
 class DissociationCoeff(ArrheniusProperty):
@@ -657,7 +990,27 @@ class DissociationCoeff(ArrheniusProperty):
 
     @property
     def units(self):
-        return ureg.particle * ureg.meter**-2 * ureg.s**-1 * ureg.Pa**-1
+        return DISSOCIATION_COEFF_UNITS
+
+
+PROPERTY_TYPES = {
+    prop_type.__name__: prop_type
+    for prop_type in [
+        Property,
+        ArrheniusProperty,
+        Solubility,
+        Diffusivity,
+        Permeability,
+        RecombinationCoeff,
+        DissociationCoeff,
+    ]
+}
+
+MATERIALS = {
+    mat.name: mat
+    for mat in vars(htm_material).values()
+    if isinstance(mat, htm_material.Material)
+}
 
 
 def get_nb_citations(doi: str):
@@ -1,76 +1,123 @@
-from . import aluminium
-from . import alumina
-
-from . import copper
-
-from . import cucrzr
-
-from . import eurofer_97
-
-from . import flinak
-from . import flibe
-
-from . import lipb
-
-from . import lithium
-
-from . import pdag
-
-from . import zirconium
-
-from . import beryllium
-
-from . import carbon
-
-from . import gold
-
-from . import iron
-from . import hastelloy_x
-from . import hastelloy_n
-
-from . import molybdenum
-
-from . import nickel
-
-from . import niobium
-
-from . import palladium
-
-from . import silver
-
-from . import tantalum
-from . import titanium
-
-from . import tungsten
-
-from . import vanadium
-
-
-from . import rafm_steel
-
-from . import series_300_steel
-
-from . import steel_316L
-from . import ss_304
-
-from . import inconel_600
-
-from . import inconel_625
-from . import inconel_750
-from . import nimonic_80A
-
-from . import incoloy_800
-
-from . import vanadium_alloy
-
-from . import FeCrAl
-
-from . import yttrium
-
-from . import tzm
-
-from . import palladium_copper
-
-from . import sic
-
-from . import chromium
+import importlib
+
+import h_transport_materials as htm
+
+# modules of the database and the materials they hold properties for.
+# A module is only imported when one of its materials is requested
+MODULES = {
+    "aluminium": [htm.ALUMINIUM],
+    "alumina": [htm.ALUMINA],
+    "copper": [htm.COPPER],
+    "cucrzr": [htm.CUCRZR],
+    "eurofer_97": [htm.EUROFER],
+    "flinak": [htm.FLINAK],
+    "flibe": [htm.FLIBE],
+    "lipb": [htm.LIPB],
+    "lithium": [htm.LITHIUM],
+    "pdag": [htm.PDAG],
+    "zirconium": [htm.ZIRCONIUM],
+    "beryllium": [htm.BERYLLIUM],
+    "carbon": [htm.CARBON],
+    "gold": [htm.GOLD],
+    "iron": [htm.IRON],
+    "hastelloy_x": [htm.HASTELLOY_X],
+    "hastelloy_n": [htm.HASTELLOY_N],
+    "molybdenum": [htm.MOLYBDENUM],
+    "nickel": [htm.NICKEL],
+    "niobium": [htm.NIOBIUM],
+    "palladium": [htm.PALLADIUM],
+    "silver": [htm.SILVER],
+    "tantalum": [htm.TANTALUM],
+    "titanium": [htm.TITANIUM],
+    "tungsten": [htm.TUNGSTEN],
+    "vanadium": [htm.VANADIUM],
+    "rafm_steel": [htm.STEEL_RAFM],
+    "series_300_steel": [htm.STEEL_SERIES_300],
+    "steel_316L": [htm.STEEL_316L],
+    "ss_304": [htm.STEEL_304],
+    "inconel_600": [htm.INCONEL_600],
+    "inconel_625": [htm.INCONEL_625],
+    "inconel_750": [htm.INCONEL_750],
+    "nimonic_80A": [htm.NIMONIC_80A],
+    "incoloy_800": [htm.INCOLOY_800],
+    "vanadium_alloy": [htm.V4CR4TI],
+    "FeCrAl": [
+        htm.APMT,
+        htm.FE22CR5AL,
+        htm.OXIDIZED_1605,
+        htm.T35Y,
+        htm.T54Y,
+        htm.THERMACORE,
+        htm.THERMACORE_OXIDIZED,
+    ],
+    "yttrium": [htm.YTTRIUM],
+    "tzm": [htm.TZM],
+    "palladium_copper": [htm.PD52CU, htm.PD60CU40],
+    "sic": [htm.SIC],
+    "chromium": [htm.CHROMIUM],
+}
+
+# properties of the loaded modules
+loaded_modules = {}
+
+
+def load(material=None, use_snapshot=True):
+    """Loads the database modules holding properties of a material and
+    appends their properties to htm.database.
+
+    Args:
+        material (str, Material, type or list, optional): the requested
+            material(s), compared to the materials of each module like in
+            PropertiesGroup.filter (name, family, symbol or class). If None,
+            all the modules are loaded. Defaults to None.
+        use_snapshot (bool, optional): if True, the properties are rebuilt
+            from the database snapshot when it is up to date, instead of
+            importing the modules. Defaults to True.
+    """
+    if len(loaded_modules) == len(MODULES):
+        return
+
+    for name, materials in MODULES.items():
+        if name in loaded_modules:
+            continue
+        if material is None or _has_material(materials, material):
+            loaded_modules[name] = _load_module(name, use_snapshot)
+
+
+def _load_module(name: str, use_snapshot: bool):
+    """Loads the properties of a database module
+
+    Args:
+        name (str): the name of the module
+        use_snapshot (bool): if True, the properties are rebuilt from
+            the snapshot when it is up to date
+
+    Returns:
+        list: the properties of the module
+    """
+    # imported here so that the snapshot module can be run as a script
+    from h_transport_materials import snapshot
+
+    props = snapshot.load_properties(name) if use_snapshot else None
+    if props is not None:
+        htm.database += props
+        return props
+
+    nb_props = list.__len__(htm.database)
+    importlib.import_module(f"{__name__}.{name}")
+    return list.__getitem__(htm.database, slice(nb_props, None))
+
+
+def _has_material(materials: list, material) -> bool:
+    """Checks if one of the materials matches the requested material(s)
+
+    Args:
+        materials (list): list of Material objects
+        material (str, Material, type or list): the requested material(s)
+
+    Returns:
+        bool: True if one of the materials matches
+    """
+    if isinstance(material, list):
+        return any(mat in material for mat in materials)
+    return any(mat == material for mat in materials)
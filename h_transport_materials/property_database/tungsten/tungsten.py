@@ -247,20 +247,12 @@ liang_permeability = Permeability(
 
 # LIU 2016 PAPER
 
-liu_permeability_data = np.genfromtxt(
-    htm.absolute_path("liu_2016/permeability.csv"),
-    delimiter=",",
-    names=True,
-)
-liu_diffusivity_data = np.genfromtxt(
-    htm.absolute_path("liu_2016/diffusivity.csv"),
-    delimiter=",",
-    names=True,
-)
+liu_permeability_data = htm.structure_data_from_wpd("liu_2016/permeablity.tar")
+liu_diffusivity_data = htm.structure_data_from_wpd("liu_2016/diffusivity.tar")
 
-rolled_50um_data_invT = liu_permeability_data["rolled_50umX"] * u.K**-1
+rolled_50um_data_invT = liu_permeability_data["rolled_50um"]["x"] * u.K**-1
 rolled_50um_data_y = (
-    liu_permeability_data["rolled_50umY"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
+    liu_permeability_data["rolled_50um"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
 )
 liu_permeability_rolled_50um = Permeability(
     data_T=1 / rolled_50um_data_invT,
@@ -270,9 +262,9 @@ liu_permeability_rolled_50um = Permeability(
     isotope="D",
 )
 
-rolled_114um_data_invT = liu_permeability_data["rolled_114umX"] * u.K**-1
+rolled_114um_data_invT = liu_permeability_data["rolled_114um"]["x"] * u.K**-1
 rolled_114um_data_y = (
-    liu_permeability_data["rolled_114umY"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
+    liu_permeability_data["rolled_114um"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
 )
 liu_permeability_rolled_114um = Permeability(
     data_T=1 / rolled_114um_data_invT,
@@ -282,9 +274,9 @@ liu_permeability_rolled_114um = Permeability(
     isotope="D",
 )
 
-rolled_240um_data_invT = liu_permeability_data["rolled_240umX"] * u.K**-1
+rolled_240um_data_invT = liu_permeability_data["rolled_240um"]["x"] * u.K**-1
 rolled_240um_data_y = (
-    liu_permeability_data["rolled_240umY"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
+    liu_permeability_data["rolled_240um"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
 )
 liu_permeability_rolled_240um = Permeability(
     data_T=1 / rolled_240um_data_invT,
@@ -294,9 +286,9 @@ liu_permeability_rolled_240um = Permeability(
     isotope="D",
 )
 
-annealed_50um_data_invT = liu_permeability_data["annealed_50umX"] * u.K**-1
+annealed_50um_data_invT = liu_permeability_data["annealed_50um"]["x"] * u.K**-1
 annealed_50um_data_y = (
-    liu_permeability_data["annealed_50umY"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
+    liu_permeability_data["annealed_50um"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
 )
 liu_permeability_annealed_50um = Permeability(
     data_T=1 / annealed_50um_data_invT,
@@ -306,9 +298,13 @@ liu_permeability_annealed_50um = Permeability(
     note="annealed_50um",
 )
 
-annealed_250um_data_invT = liu_permeability_data["annealed_250umX"] * u.K**-1
+annealed_250um_data_invT = liu_permeability_data["annealed_250um"]["x"] * u.K**-1
 annealed_250um_data_y = (
-    liu_permeability_data["annealed_250umY"] * u.mol * u.m**-1 * u.s**-1 * u.Pa**-0.5
+    liu_permeability_data["annealed_250um"]["y"]
+    * u.mol
+    * u.m**-1
+    * u.s**-1
+    * u.Pa**-0.5
 )
 liu_permeability_annealed_250um = Permeability(
     data_T=1 / annealed_250um_data_invT,
@@ -319,10 +315,10 @@ liu_permeability_annealed_250um = Permeability(
 )
 
 recrystallized_250um_data_invT = (
-    liu_permeability_data["recrystallized_250umX"] * u.K**-1
+    liu_permeability_data["recrystallized_250um"]["x"] * u.K**-1
 )
 recrystallized_250um_data_y = (
-    liu_permeability_data["recrystallized_250umY"]
+    liu_permeability_data["recrystallized_250um"]["y"]
     * u.mol
     * u.m**-1
     * u.s**-1
@@ -337,8 +333,8 @@ liu_permeability_recrystallized_250um = Permeability(
 )
 
 
-rolled_114um_data_invT = liu_diffusivity_data["rolled_114umX"] * u.K**-1
-rolled_114um_data_y = liu_diffusivity_data["rolled_114umY"] * u.m**2 * u.s**-1
+rolled_114um_data_invT = liu_diffusivity_data["rolled_114um"]["x"] * u.K**-1
+rolled_114um_data_y = liu_diffusivity_data["rolled_114um"]["y"] * u.m**2 * u.s**-1
 liu_diffusivity_rolled_114um = Diffusivity(
     data_T=1 / rolled_114um_data_invT,
     data_y=rolled_114um_data_y,
@@ -347,8 +343,8 @@ liu_diffusivity_rolled_114um = Diffusivity(
     isotope="D",
 )
 
-rolled_240um_data_invT = liu_diffusivity_data["rolled_240umX"] * u.K**-1
-rolled_240um_data_y = liu_diffusivity_data["rolled_240umY"] * u.m**2 * u.s**-1
+rolled_240um_data_invT = liu_diffusivity_data["rolled_240um"]["x"] * u.K**-1
+rolled_240um_data_y = liu_diffusivity_data["rolled_240um"]["y"] * u.m**2 * u.s**-1
 liu_diffusivity_rolled_240um = Diffusivity(
     data_T=1 / rolled_240um_data_invT,
     data_y=rolled_240um_data_y,
@@ -357,8 +353,8 @@ liu_diffusivity_rolled_240um = Diffusivity(
     isotope="D",
 )
 
-annealed_102um_data_invT = liu_diffusivity_data["annealed_102umX"] * u.K**-1
-annealed_102um_data_y = liu_diffusivity_data["annealed_102umY"] * u.m**2 * u.s**-1
+annealed_102um_data_invT = liu_diffusivity_data["annealed_102um"]["x"] * u.K**-1
+annealed_102um_data_y = liu_diffusivity_data["annealed_102um"]["y"] * u.m**2 * u.s**-1
 liu_diffusivity_annealed_102um = Diffusivity(
     data_T=1 / annealed_102um_data_invT,
     data_y=annealed_102um_data_y,
@@ -367,8 +363,8 @@ liu_diffusivity_annealed_102um = Diffusivity(
     isotope="D",
 )
 
-annealed_250um_data_invT = liu_diffusivity_data["annealed_250umX"] * u.K**-1
-annealed_250um_data_y = liu_diffusivity_data["annealed_250umY"] * u.m**2 * u.s**-1
+annealed_250um_data_invT = liu_diffusivity_data["annealed_250um"]["x"] * u.K**-1
+annealed_250um_data_y = liu_diffusivity_data["annealed_250um"]["y"] * u.m**2 * u.s**-1
 liu_diffusivity_annealed_250um = Diffusivity(
     data_T=1 / annealed_250um_data_invT,
     data_y=annealed_250um_data_y,
@@ -378,9 +374,11 @@ liu_diffusivity_annealed_250um = Diffusivity(
 )
 
 
-recrystallized_250um_data_invT = liu_diffusivity_data["recrystallized_250umX"] * u.K**-1
+recrystallized_250um_data_invT = (
+    liu_diffusivity_data["recrystallized_250um"]["x"] * u.K**-1
+)
 recrystallized_250um_data_y = (
-    liu_diffusivity_data["recrystallized_250umY"] * u.m**2 * u.s**-1
+    liu_diffusivity_data["recrystallized_250um"]["y"] * u.m**2 * u.s**-1
 )
 liu_diffusivity_recrystallized_250um = Diffusivity(
     data_T=1 / recrystallized_250um_data_invT,
@@ -390,7 +388,7 @@ liu_diffusivity_recrystallized_250um = Diffusivity(
     isotope="D",
 )
 
-buchenauer_data = htm.structure_data_from_wpd("buchenauer_2016/data.csv")
+buchenauer_data = htm.structure_data_from_wpd("buchenauer_2016/buchenauer_2016.tar")
 
 bauchenaeur_permeability_foil = Permeability(
     data_T=1000 / (buchenauer_data["foil"]["x"] * u.K**-1),
@@ -400,8 +398,8 @@ bauchenaeur_permeability_foil = Permeability(
 )
 
 bauchenaeur_permeability_iter_grade = Permeability(
-    data_T=1000 / (buchenauer_data["ITER_grade"]["x"] * u.K**-1),
-    data_y=buchenauer_data["ITER_grade"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.MPa**-0.5,
+    data_T=1000 / (buchenauer_data["ITER grade"]["x"] * u.K**-1),
+    data_y=buchenauer_data["ITER grade"]["y"] * u.mol * u.m**-1 * u.s**-1 * u.MPa**-0.5,
     source="buchenauer_permeation_2016",
     isotope="D",
     note="ITER grade Tungsten",
@@ -425,10 +423,10 @@ otsuka_diffusivity = Diffusivity(
     source="otsuka_visualization_2009",
 )
 
-data_ikeda = np.genfromtxt(htm.absolute_path("ikeda_2011/data.csv"), delimiter=",")
+data_ikeda = htm.structure_data_from_wpd("ikeda_2011/ikeda_2011.tar")["Default Dataset"]
 ikeda_diffusivity = Diffusivity(
-    data_T=1000 / (data_ikeda[:, 0] * u.K**-1),
-    data_y=data_ikeda[:, 1] * u.m**2 * u.s**-1,
+    data_T=1000 / (data_ikeda["x"] * u.K**-1),
+    data_y=data_ikeda["y"] * u.m**2 * u.s**-1,
     source="ikeda_application_2011",
     isotope="T",
 )
@@ -0,0 +1,356 @@
+import operator
+
+import numpy as np
+import pint
+
+from h_transport_materials import ureg
+from h_transport_materials.columns import NUMERIC_COLUMNS, PropertiesColumns
+
+# units of the numeric columns, pre-exponential factors are compared
+# in the units of each property
+COLUMN_UNITS = {
+    "act_energy": ureg.eV * ureg.particle**-1,
+    "T_min": ureg.K,
+    "T_max": ureg.K,
+}
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class Condition:
+    """Base class of the conditions of PropertiesGroup.query.
+    Conditions are combined with ``&`` (and), ``|`` (or) and ``~`` (not).
+    """
+
+    # relative cost of the evaluation, cheaper conditions are evaluated first
+    cost = 1
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def mask(self, columns: PropertiesColumns) -> np.ndarray:
+        """Evaluates the condition
+
+        Args:
+            columns (PropertiesColumns): the columns of the properties
+
+        Returns:
+            np.ndarray: boolean mask of the matching properties
+        """
+        raise NotImplementedError
+
+    def plan(self, columns: PropertiesColumns, depth: int = 0) -> list:
+        """Evaluates the condition and describes how it was evaluated
+
+        Args:
+            columns (PropertiesColumns): the columns of the properties
+            depth (int, optional): the depth of the condition in the query.
+                Defaults to 0.
+
+        Returns:
+            np.ndarray, list: the boolean mask of the matching properties
+                and the lines of the plan
+        """
+        mask = self.mask(columns)
+        return mask, [_plan_line(self, mask, depth)]
+
+
+class Field:
+    """Attribute of the properties used to build conditions.
+    Usage::
+
+        from h_transport_materials import Field
+
+        recent = Field("year") >= 2000
+        tungsten_or_copper = Field("material").isin(["tungsten", "copper"])
+        low_energy = Field("act_energy").between(0, 0.5 * htm.ureg.eV * htm.ureg.particle**-1)
+
+    Equality and membership have the semantics of PropertiesGroup.filter.
+    Numeric columns (pre_exp, act_energy, T_min, T_max) are compared as
+    arrays, nan values never match.
+
+    Args:
+        name (str): the name of the attribute or column
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value):
+        return Match(self.name, value)
+
+    def __ne__(self, value):
+        return Not(Match(self.name, value))
+
+    def __lt__(self, value):
+        return Compare(self.name, "<", value)
+
+    def __le__(self, value):
+        return Compare(self.name, "<=", value)
+
+    def __gt__(self, value):
+        return Compare(self.name, ">", value)
+
+    def __ge__(self, value):
+        return Compare(self.name, ">=", value)
+
+    __hash__ = None
+
+    def isin(self, values: list):
+        """Condition on the attribute matching one of the values
+
+        Args:
+            values (list): the values
+
+        Returns:
+            Condition: the condition
+        """
+        return Match(self.name, list(values))
+
+    def between(self, low, high):
+        """Condition on the attribute being in [low, high]
+
+        Args:
+            low (float or pint.Quantity): the lower bound
+            high (float or pint.Quantity): the upper bound
+
+        Returns:
+            Condition: the condition
+        """
+        return Compare(self.name, ">=", low) & Compare(self.name, "<=", high)
+
+
+class Match(Condition):
+    """Equality (or membership if value is a list) with the semantics of
+    PropertiesGroup.filter, evaluated with the index of the column
+
+    Args:
+        name (str): the name of the attribute
+        value (object or list): the value or list of values
+    """
+
+    cost = 0
+
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
+
+    def mask(self, columns):
+        return columns.attribute(self.name).matches(self.value)
+
+    def __repr__(self) -> str:
+        op = "in" if isinstance(self.value, list) else "=="
+        return f"{self.name} {op} {self.value!r} (index lookup)"
+
+
+class Compare(Condition):
+    """Comparison of an attribute with a value. Numeric columns are
+    compared as arrays, other attributes once per unique value.
+
+    Args:
+        name (str): the name of the attribute
+        op (str): the operator ("<", "<=", ">", ">=", "==" or "!=")
+        value (float or pint.Quantity): the value. Quantities are
+            converted to the units of the column.
+    """
+
+    def __init__(self, name: str, op: str, value):
+        self.name = name
+        self.op = op
+        self.value = value
+
+    def mask(self, columns):
+        compare = OPERATORS[self.op]
+        if self.name in NUMERIC_COLUMNS:
+            value = _magnitude(self.value, self.name)
+            with np.errstate(invalid="ignore"):
+                return compare(columns[self.name], value)
+
+        def predicate(category):
+            try:
+                return bool(compare(category, self.value))
+            except TypeError:
+                # eg. None compared with a number
+                return False
+
+        return columns.attribute(self.name).where(predicate)
+
+    def __repr__(self) -> str:
+        if self.name in NUMERIC_COLUMNS:
+            evaluation = "array comparison"
+        else:
+            evaluation = "comparison of unique values"
+        return f"{self.name} {self.op} {self.value} ({evaluation})"
+
+
+class And(Condition):
+    """Both conditions are fulfilled. The cheapest condition is
+    evaluated first and the second one is skipped if nothing matches.
+
+    Args:
+        first (Condition): the first condition
+        second (Condition): the second condition
+    """
+
+    def __init__(self, first: Condition, second: Condition):
+        self.conditions = sorted([first, second], key=lambda cond: cond.cost)
+        self.cost = first.cost + second.cost
+
+    def mask(self, columns):
+        return self.plan(columns)[0]
+
+    def plan(self, columns, depth=0):
+        lines = []
+        mask = np.ones(len(columns), dtype=bool)
+        for condition in self.conditions:
+            if not mask.any():
+                lines.append("  " * (depth + 1) + f"skipped: {condition!r}")
+                continue
+            condition_mask, condition_lines = condition.plan(columns, depth + 1)
+            mask &= condition_mask
+            lines += condition_lines
+        return mask, [_plan_line(self, mask, depth)] + lines
+
+    def __repr__(self) -> str:
+        return "AND"
+
+
+class Or(Condition):
+    """At least one of the conditions is fulfilled. The cheapest condition
+    is evaluated first and the second one is skipped if everything matches.
+
+    Args:
+        first (Condition): the first condition
+        second (Condition): the second condition
+    """
+
+    def __init__(self, first: Condition, second: Condition):
+        self.conditions = sorted([first, second], key=lambda cond: cond.cost)
+        self.cost = first.cost + second.cost
+
+    def mask(self, columns):
+        return self.plan(columns)[0]
+
+    def plan(self, columns, depth=0):
+        lines = []
+        mask = np.zeros(len(columns), dtype=bool)
+        for condition in self.conditions:
+            if mask.all():
+                lines.append("  " * (depth + 1) + f"skipped: {condition!r}")
+                continue
+            condition_mask, condition_lines = condition.plan(columns, depth + 1)
+            mask |= condition_mask
+            lines += condition_lines
+        return mask, [_plan_line(self, mask, depth)] + lines
+
+    def __repr__(self) -> str:
+        return "OR"
+
+
+class Not(Condition):
+    """The condition is not fulfilled
+
+    Args:
+        condition (Condition): the condition
+    """
+
+    def __init__(self, condition: Condition):
+        self.condition = condition
+        self.cost = condition.cost
+
+    def mask(self, columns):
+        return ~self.condition.mask(columns)
+
+    def plan(self, columns, depth=0):
+        mask, lines = self.condition.plan(columns, depth + 1)
+        return ~mask, [_plan_line(self, ~mask, depth)] + lines
+
+    def __repr__(self) -> str:
+        return "NOT"
+
+
+def covers(T_min, T_max=None):
+    """Condition on the validity range of the properties containing
+    a temperature or a temperature range
+
+    Args:
+        T_min (float or pint.Quantity): the temperature (or the lower bound
+            of the range). Floats are assumed in K.
+        T_max (float or pint.Quantity, optional): the upper bound of the
+            range. If None, the range is reduced to T_min. Defaults to None.
+
+    Returns:
+        Condition: the condition
+    """
+    if T_max is None:
+        T_max = T_min
+    return Compare("T_min", "<=", T_min) & Compare("T_max", ">=", T_max)
+
+
+def overlaps(T_min, T_max):
+    """Condition on the validity range of the properties overlapping
+    a temperature range
+
+    Args:
+        T_min (float or pint.Quantity): the lower bound of the range.
+            Floats are assumed in K.
+        T_max (float or pint.Quantity): the upper bound of the range.
+            Floats are assumed in K.
+
+    Returns:
+        Condition: the condition
+    """
+    return Compare("T_min", "<=", T_max) & Compare("T_max", ">=", T_min)
+
+
+def within(T_min, T_max):
+    """Condition on the validity range of the properties being contained
+    in a temperature range
+
+    Args:
+        T_min (float or pint.Quantity): the lower bound of the range.
+            Floats are assumed in K.
+        T_max (float or pint.Quantity): the upper bound of the range.
+            Floats are assumed in K.
+
+    Returns:
+        Condition: the condition
+    """
+    return Compare("T_min", ">=", T_min) & Compare("T_max", "<=", T_max)
+
+
+def _magnitude(value, name: str) -> float:
+    """Converts a value to the units of a numeric column
+
+    Args:
+        value (float or pint.Quantity): the value
+        name (str): the name of the column
+
+    Raises:
+        ValueError: if value is a Quantity compared to pre_exp
+
+    Returns:
+        float: the magnitude of value in the units of the column
+    """
+    if not isinstance(value, pint.Quantity):
+        return value
+    if name not in COLUMN_UNITS:
+        raise ValueError(f"{name} can only be compared to floats")
+    return value.to(COLUMN_UNITS[name]).magnitude
+
+
+def _plan_line(condition: Condition, mask: np.ndarray, depth: int) -> str:
+    return "  " * depth + f"{condition!r}: {np.count_nonzero(mask)}/{len(mask)}"
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from h_transport_materials.property import Property
+
+# bump when the snapshot format or the stored data change
+SNAPSHOT_VERSION = 2
+
+DATABASE_DIR = Path(__file__).parent / "property_database"
+SNAPSHOT_PATH = DATABASE_DIR / "snapshot.json.gz"
+BIB_PATH = Path(__file__).parent / "references.bib"
+
+# files of the database modules taken into account in the staleness check
+SOURCE_SUFFIXES = (".py", ".csv", ".tar")
+
+_snapshot = None
+
+
+def module_digest(name: str):
+    """Returns a digest of the source files of a database module
+
+    Args:
+        name (str): the name of the module in property_database
+
+    Returns:
+        str: the hexadecimal digest
+    """
+    path = DATABASE_DIR / name
+    if path.is_dir():
+        files = sorted(
+            filename
+            for filename in path.rglob("*")
+            if filename.suffix in SOURCE_SUFFIXES
+        )
+    else:
+        files = [path.with_suffix(".py")]
+
+    digest = hashlib.sha1()
+    for filename in files:
+        digest.update(filename.relative_to(DATABASE_DIR).as_posix().encode())
+        digest.update(filename.read_bytes())
+    return digest.hexdigest()
+
+
+def bib_digest():
+    """Returns a digest of the references.bib file
+
+    Returns:
+        str: the hexadecimal digest
+    """
+    return hashlib.sha1(BIB_PATH.read_bytes()).hexdigest()
+
+
+def build_snapshot(filename: str = SNAPSHOT_PATH):
+    """Serialises the whole database to a compressed snapshot.
+    The properties are stored per database module with a digest
+    of the module source files. Run ``python -m h_transport_materials.snapshot``
+    to rebuild the snapshot shipped with HTM.
+
+    Args:
+        filename (str, optional): the path of the snapshot.
+            Defaults to SNAPSHOT_PATH.
+    """
+    from h_transport_materials import property_database
+
+    property_database.load(use_snapshot=False)
+
+    modules = {}
+    for name, props in property_database.loaded_modules.items():
+        modules[name] = {
+            "digest": module_digest(name),
+            "properties": [prop.to_json() for prop in props],
+        }
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "bib_digest": bib_digest(),
+        "modules": modules,
+    }
+
+    # mtime=0 makes the snapshot reproducible
+    with gzip.GzipFile(filename, "wb", mtime=0) as outfile:
+        outfile.write(json.dumps(snapshot, separators=(",", ":")).encode("utf-8"))
+
+
+def read_snapshot(filename: str = SNAPSHOT_PATH):
+    """Reads a snapshot
+
+    Args:
+        filename (str, optional): the path of the snapshot.
+            Defaults to SNAPSHOT_PATH.
+
+    Returns:
+        dict: the snapshot, None if it doesn't exist, has a different
+            version or was built with different references
+    """
+    if not Path(filename).exists():
+        return None
+    with gzip.open(filename, "rt", encoding="utf-8") as infile:
+        snapshot = json.load(infile)
+    if snapshot["version"] != SNAPSHOT_VERSION:
+        return None
+    if snapshot["bib_digest"] != bib_digest():
+        return None
+    return snapshot
+
+
+def load_properties(name: str):
+    """Rebuilds the properties of a database module from the snapshot
+    shipped with HTM, without importing the module.
+
+    Args:
+        name (str): the name of the module in property_database
+
+    Returns:
+        list: the properties of the module, None if the snapshot
+            doesn't exist or is outdated for this module
+    """
+    global _snapshot
+    if _snapshot is None:
+        # False means no valid snapshot
+        _snapshot = read_snapshot() or False
+    if not _snapshot:
+        return None
+
+    module = _snapshot["modules"].get(name)
+    if module is None or module["digest"] != module_digest(name):
+        return None
+    return [Property.from_json(as_json) for as_json in module["properties"]]
+
+
+if __name__ == "__main__":
+    build_snapshot()
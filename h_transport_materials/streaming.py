@@ -0,0 +1,185 @@
+import json
+from pathlib import Path
+from textwrap import indent
+
+from h_transport_materials import __version__
+from h_transport_materials.property import Property
+
+# number of characters read at once by iter_json
+JSON_CHUNK_SIZE = 1024**2
+
+# suffixes of JSON Lines files
+JSON_LINES_SUFFIXES = [".jsonl", ".ndjson"]
+
+COMPACT_SEPARATORS = (",", ":")
+
+
+def write_json(properties, filename: str, lines: bool = False, compact: bool = False):
+    """Writes properties to a JSON file one at a time, so that the
+    properties don't need to be held in memory at once (eg. a generator).
+    By default, the file is the same as the one written by
+    PropertiesGroup.export_to_json.
+
+    Args:
+        properties (iterable): the properties
+        filename (str): the path of the file
+        lines (bool, optional): if True, the file is written in the JSON
+            Lines format (one compact property per line, without the HTM
+            version). Defaults to False.
+        compact (bool, optional): if True, the JSON is written without
+            indentation and spaces. Defaults to False.
+    """
+    with open(filename, "w") as outfile:
+        if lines:
+            for prop in properties:
+                outfile.write(json.dumps(prop.to_json(), separators=COMPACT_SEPARATORS))
+                outfile.write("\n")
+            return
+
+        if compact:
+            outfile.write('{"data":[')
+            separator = ","
+        else:
+            outfile.write('{\n    "data": [\n')
+            separator = ",\n"
+        for i, prop in enumerate(properties):
+            if i > 0:
+                outfile.write(separator)
+            if compact:
+                outfile.write(json.dumps(prop.to_json(), separators=COMPACT_SEPARATORS))
+            else:
+                outfile.write(indent(json.dumps(prop.to_json(), indent=4), " " * 8))
+        version = json.dumps(__version__)
+        if compact:
+            outfile.write(f'],"htm_version":{version}}}')
+        else:
+            outfile.write(f'\n    ],\n    "htm_version": {version}\n}}')
+
+
+def iter_json(filename: str, lines: bool = None, chunk_size: int = JSON_CHUNK_SIZE):
+    """Reads the properties of a JSON file written by
+    PropertiesGroup.export_to_json or write_json one at a time, so that
+    files larger than the memory can be processed.
+    Usage::
+
+        for prop in htm.iter_json("measurements.jsonl"):
+            pass
+
+    Args:
+        filename (str): the path of the file
+        lines (bool, optional): True for the JSON Lines format. If None, it
+            is inferred from the suffix of the file (see
+            JSON_LINES_SUFFIXES). Defaults to None.
+        chunk_size (int, optional): the number of characters read at once.
+            Defaults to JSON_CHUNK_SIZE.
+
+    Raises:
+        ValueError: if the file isn't a JSON export of properties
+
+    Yields:
+        Property: the properties, of the classes they were exported from
+    """
+    if lines is None:
+        lines = Path(filename).suffix in JSON_LINES_SUFFIXES
+    with open(filename, "r") as infile:
+        if lines:
+            for line in infile:
+                if line.strip():
+                    yield Property.from_json(json.loads(line))
+            return
+
+        reader = _JSONReader(infile, chunk_size)
+        reader.expect("{")
+        while reader.next_character() != "}":
+            key = reader.decode()
+            reader.expect(":")
+            if key != "data":
+                reader.decode()
+            else:
+                reader.expect("[")
+                while reader.next_character() != "]":
+                    yield Property.from_json(reader.decode())
+                    if reader.next_character() == ",":
+                        reader.expect(",")
+                reader.expect("]")
+            if reader.next_character() == ",":
+                reader.expect(",")
+
+
+class _JSONReader:
+    """Decodes the values of a JSON document one at a time, holding
+    at most one value and one chunk of the file in memory
+
+    Args:
+        infile (file): the file
+        chunk_size (int): the number of characters read at once
+    """
+
+    def __init__(self, infile, chunk_size: int):
+        self.infile = infile
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.end_of_file = False
+        self.decoder = json.JSONDecoder()
+
+    def _read(self) -> bool:
+        """Reads a chunk of the file, discarding the decoded characters
+
+        Returns:
+            bool: False if the end of the file was reached
+        """
+        chunk = self.infile.read(self.chunk_size)
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        self.end_of_file = not chunk
+        return bool(chunk)
+
+    def next_character(self) -> str:
+        """Skips whitespace and returns the next character
+
+        Raises:
+            ValueError: if the end of the file is reached
+
+        Returns:
+            str: the character
+        """
+        while True:
+            while self.position < len(self.buffer):
+                if not self.buffer[self.position].isspace():
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self._read():
+                raise ValueError("Unexpected end of the JSON file")
+
+    def expect(self, character: str):
+        """Consumes the next character
+
+        Args:
+            character (str): the expected character
+
+        Raises:
+            ValueError: if the next character is different
+        """
+        if self.next_character() != character:
+            raise ValueError(f"Expected {character!r} in the JSON file")
+        self.position += 1
+
+    def decode(self):
+        """Decodes the next value
+
+        Returns:
+            object: the value
+        """
+        self.next_character()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end < len(self.buffer) or self.end_of_file or not self._read():
+                self.position = end
+                return value
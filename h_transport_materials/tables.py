@@ -0,0 +1,271 @@
+import math
+import warnings
+
+import numpy as np
+import pint
+
+from h_transport_materials import ureg
+
+TABLE_KINDS = ["log-linear in 1/T", "linear in 1/T", "linear in T"]
+
+
+class InterpolationTable:
+    """Lookup table of one or several Arrhenius properties on a uniform
+    grid, evaluated in O(1) per temperature without pint. Created by
+    ArrheniusProperty.to_table and PropertiesGroup.to_table.
+
+    Three kinds of tables are available:
+
+    * ``"log-linear in 1/T"``: log(value) is interpolated on a grid uniform
+      in 1/T. It is exact for Arrhenius properties (up to rounding errors).
+    * ``"linear in 1/T"``: the value is interpolated on a grid uniform in
+      1/T, no exponential is evaluated.
+    * ``"linear in T"``: the value is interpolated on a grid uniform in T,
+      no exponential is evaluated.
+
+    Usage::
+
+        table = prop.to_table(300 * htm.ureg.K, 1200 * htm.ureg.K, 1000)
+        values = table(T)  # T in K, values in table.units
+        assert table.relative_error < 1e-6
+
+    Args:
+        data (np.ndarray): the tabulated values (or their log) with shape
+            (number of points,) or (number of properties, number of points)
+        x_start (float): the first node, in K or 1/K
+        x_step (float): the spacing of the nodes, in K or 1/K
+        kind (str): the kind of table (see TABLE_KINDS)
+        T_min (float): the lower bound of the table in K
+        T_max (float): the upper bound of the table in K
+        units (pint.Unit, optional): the units of the values.
+            Defaults to None.
+        relative_error (float or np.ndarray, optional): upper bound of the
+            relative error of the table compared to the exact Arrhenius
+            expression, for each property. Defaults to None.
+        scale (float or np.ndarray, optional): factor by which the
+            interpolated values of each property are multiplied.
+            Defaults to 1.0.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        x_start: float,
+        x_step: float,
+        kind: str,
+        T_min: float,
+        T_max: float,
+        units=None,
+        relative_error=None,
+        scale=1.0,
+    ):
+        if kind not in TABLE_KINDS:
+            raise ValueError(f"kind must be one of {TABLE_KINDS}")
+        self.data = np.ascontiguousarray(data)
+        self.scale = scale
+        self.x_start = x_start
+        self.x_step = x_step
+        self.kind = kind
+        self.T_min = T_min
+        self.T_max = T_max
+        self.units = units
+        self.relative_error = relative_error
+        self._inverse_step = 1 / x_step
+        # plain floats for the evaluation of single properties at scalars
+        self._values = self.data.tolist() if self.data.ndim == 1 else None
+
+    @classmethod
+    def from_arrhenius(
+        cls,
+        pre_exps,
+        act_energies_over_k_B,
+        T_min: float,
+        T_max: float,
+        n: int,
+        kind: str = "log-linear in 1/T",
+        dtype=np.float64,
+        units=None,
+    ):
+        """Tabulates Arrhenius properties
+
+        Args:
+            pre_exps (float or np.ndarray): the pre-exponential factors
+            act_energies_over_k_B (float or np.ndarray): the activation
+                energies divided by k_B in K
+            T_min (float): the lower bound of the table in K
+            T_max (float): the upper bound of the table in K
+            n (int): the number of points of the table
+            kind (str, optional): the kind of table (see TABLE_KINDS).
+                Defaults to "log-linear in 1/T".
+            dtype (np.dtype, optional): the type of the tabulated values
+                (np.float64 or np.float32). Defaults to np.float64.
+            units (pint.Unit, optional): the units of the values.
+                Defaults to None.
+
+        Raises:
+            ValueError: if kind is unknown, n < 2 or T_min >= T_max
+
+        Returns:
+            InterpolationTable: the table
+        """
+        if kind not in TABLE_KINDS:
+            raise ValueError(f"kind must be one of {TABLE_KINDS}")
+        if n < 2:
+            raise ValueError("tables need at least 2 points")
+        if not 0 < T_min < T_max:
+            raise ValueError("T_min must be positive and lower than T_max")
+
+        pre_exps = np.asarray(pre_exps, dtype=float)
+        slopes = np.asarray(act_energies_over_k_B, dtype=float)
+        if kind == "linear in T":
+            x_start, x_step = T_min, (T_max - T_min) / (n - 1)
+            nodes = x_start + x_step * np.arange(n)
+            inverse_T = 1 / nodes
+        else:
+            x_start, x_step = 1 / T_max, (1 / T_min - 1 / T_max) / (n - 1)
+            inverse_T = x_start + x_step * np.arange(n)
+
+        log_values = np.log(pre_exps)[..., None] - np.multiply.outer(slopes, inverse_T)
+        # rounding errors of the stored values
+        epsilon = np.finfo(dtype).eps
+        if kind == "log-linear in 1/T":
+            data, scale = log_values, 1.0
+            # an absolute error on log(value) is a relative error on value
+            max_log = np.max(np.abs(log_values), axis=-1)
+            relative_error = 2 * epsilon * (1 + max_log)
+        else:
+            # values are stored relative to their maximum so that float32
+            # tables don't underflow for small pre-exponential factors
+            max_log = np.max(log_values, axis=-1)
+            data = np.exp(log_values - max_log[..., None])
+            scale = np.exp(max_log)
+            relative_error = 2 * epsilon + _interpolation_error(
+                slopes, kind, x_step, T_min
+            )
+            underflow = np.min(data, axis=-1) < np.finfo(dtype).tiny
+            relative_error = np.where(underflow, np.inf, relative_error)
+
+        return cls(
+            data.astype(dtype),
+            x_start,
+            x_step,
+            kind,
+            T_min,
+            T_max,
+            units=units,
+            relative_error=relative_error,
+            scale=scale,
+        )
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """np.ndarray: the temperatures of the nodes in K"""
+        x = self.x_start + self.x_step * np.arange(self.data.shape[-1])
+        if self.kind == "linear in T":
+            return x
+        return 1 / x
+
+    @property
+    def nbytes(self) -> int:
+        """int: the size of the tabulated values in bytes"""
+        return self.data.nbytes
+
+    def __call__(self, T):
+        """Evaluates the table
+
+        Args:
+            T (float or np.ndarray): the temperature(s) in K
+
+        Returns:
+            np.ndarray: the values, with shape T.shape for a single property
+            and (number of properties, *T.shape) for a group, nan outside
+            of [T_min, T_max]
+        """
+        if isinstance(T, (float, int)) and self._values is not None:
+            return self._evaluate_scalar(float(T))
+        shape = np.shape(T)
+        T = np.asarray(T, dtype=float).ravel()
+        if self.kind == "linear in T":
+            position = T - self.x_start
+        else:
+            position = 1 / T
+            position -= self.x_start
+        position *= self._inverse_step
+        index = position.astype(np.intp)
+        np.clip(index, 0, self.data.shape[-1] - 2, out=index)
+        position -= index
+        lower = np.take(self.data, index, axis=-1).astype(float, copy=False)
+        values = np.take(self.data, index + 1, axis=-1).astype(float, copy=False)
+        values -= lower
+        values *= position
+        values += lower
+        if self.kind == "log-linear in 1/T":
+            np.exp(values, out=values)
+        values *= np.reshape(self.scale, np.shape(self.scale) + (1,))
+        if T.size and (T.min() < self.T_min or T.max() > self.T_max):
+            values[..., (T < self.T_min) | (T > self.T_max)] = np.nan
+        return values.reshape(values.shape[:-1] + shape)
+
+    def _evaluate_scalar(self, T: float) -> float:
+        """Evaluates a table of a single property at one temperature
+        with plain floats, faster than numpy for scalars
+
+        Args:
+            T (float): the temperature in K
+
+        Returns:
+            float: the value, nan outside of [T_min, T_max]
+        """
+        if not self.T_min <= T <= self.T_max:
+            return math.nan
+        x = T if self.kind == "linear in T" else 1 / T
+        position = (x - self.x_start) * self._inverse_step
+        index = min(int(position), len(self._values) - 2)
+        lower = self._values[index]
+        value = lower + (self._values[index + 1] - lower) * (position - index)
+        if self.kind == "log-linear in 1/T":
+            value = math.exp(value)
+        return value * self.scale
+
+
+def _interpolation_error(slopes, kind: str, step: float, T_min: float):
+    """Upper bound of the relative error of the linear interpolation of
+    exp(-slope / T) between nodes separated by step
+
+    The error of the linear interpolation of f on an interval of length h is
+    lower than h**2 / 8 * max|f''|, which is divided by min(f) on the
+    interval. The bound is the largest at the lowest temperatures.
+
+    Args:
+        slopes (np.ndarray): the activation energies divided by k_B in K
+        kind (str): "linear in 1/T" or "linear in T"
+        step (float): the spacing of the nodes in 1/K or K
+        T_min (float): the lower bound of the table in K
+
+    Returns:
+        np.ndarray: the bound for each slope
+    """
+    slopes = np.abs(slopes)
+    if kind == "linear in 1/T":
+        # f(x) = exp(-b x): f'' = b**2 f
+        return step**2 / 8 * slopes**2 * np.exp(slopes * step)
+    # f(T) = exp(-b / T): |f''| <= (b**2 / T**4 + 2 b / T**3) f
+    curvature = slopes**2 / T_min**4 + 2 * slopes / T_min**3
+    ratio = np.exp(slopes * step / (T_min * (T_min + step)))
+    return step**2 / 8 * curvature * ratio
+
+
+def _kelvin(T) -> float:
+    """Converts a temperature to K
+
+    Args:
+        T (pint.Quantity or float): the temperature. If not a Quantity,
+            T is assumed in K.
+
+    Returns:
+        float: the temperature in K
+    """
+    if not isinstance(T, pint.Quantity):
+        warnings.warn(f"no units were given with T, assuming {ureg.K}")
+        return float(T)
+    return float(T.to(ureg.K).magnitude)
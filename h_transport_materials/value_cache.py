@@ -0,0 +1,160 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import weakref
+
+import numpy as np
+import pint
+
+# default bounds of value_cache
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024**2
+
+
+class ValueCache:
+    """Least recently used cache of the evaluations of properties and
+    groups (ArrheniusProperty.value and PropertiesGroup.values), for
+    dashboards and notebooks evaluating the same properties on the same
+    temperatures many times. Disabled by default.
+    Usage::
+
+        htm.value_cache.enable()
+        prop.value(T)  # computed
+        prop.value(T)  # read from the cache
+
+    Entries are keyed on the evaluated object and on a digest of the values
+    and units of T. The entries of a property are discarded when its
+    pre_exp or act_energy is set, and groups are keyed on their columns,
+    which are rebuilt when the group or its properties are modified.
+    Cached values are read-only.
+
+    Args:
+        max_entries (int, optional): the maximum number of entries.
+            Defaults to MAX_ENTRIES.
+        max_bytes (int, optional): the maximum total size of the cached
+            values in bytes. Defaults to MAX_BYTES.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        # key -> (weak reference to the object, value, size in bytes)
+        self._entries = OrderedDict()
+        # id of the object -> keys of its entries
+        self._keys_by_id = {}
+        self._lock = threading.Lock()
+
+    def enable(self, max_entries: int = None, max_bytes: int = None):
+        """Enables the cache
+
+        Args:
+            max_entries (int, optional): the maximum number of entries.
+                If None, unchanged. Defaults to None.
+            max_bytes (int, optional): the maximum total size of the cached
+                values in bytes. If None, unchanged. Defaults to None.
+        """
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self.enabled = True
+        with self._lock:
+            self._evict()
+
+    def disable(self):
+        """Disables and clears the cache"""
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        """Removes all the entries"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, obj, T: pint.Quantity, compute):
+        """Returns the cached value of obj at T, computing it if needed
+
+        Args:
+            obj (object): the evaluated object
+            T (pint.Quantity): the temperature(s)
+            compute (callable): function without arguments computing the value
+
+        Returns:
+            pint.Quantity: the value
+        """
+        key = (id(obj), temperature_key(T))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is obj:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = compute()
+        if isinstance(value.magnitude, np.ndarray):
+            value.magnitude.flags.writeable = False
+        nbytes = np.asarray(value.magnitude).nbytes
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (weakref.ref(obj), value, nbytes)
+            self._keys_by_id.setdefault(id(obj), set()).add(key)
+            self.nbytes += nbytes
+            self._evict()
+        return value
+
+    def invalidate(self, obj):
+        """Removes the entries of an object
+
+        Args:
+            obj (object): the object
+        """
+        if id(obj) not in self._keys_by_id:
+            return
+        with self._lock:
+            for key in self._keys_by_id.pop(id(obj), ()):
+                _, _, nbytes = self._entries.pop(key)
+                self.nbytes -= nbytes
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+            self._keys_by_id[key[0]].discard(key)
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache
+        is within its bounds"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            if not self._keys_by_id[key[0]]:
+                del self._keys_by_id[key[0]]
+
+
+def temperature_key(T: pint.Quantity) -> tuple:
+    """Returns a key identifying the values and units of temperatures
+
+    Args:
+        T (pint.Quantity): the temperature(s)
+
+    Returns:
+        tuple: the units, dtype, shape and digest of the values
+    """
+    magnitude = np.ascontiguousarray(T.magnitude)
+    digest = hashlib.blake2b(magnitude.tobytes(), digest_size=16).hexdigest()
+    return (str(T.units), magnitude.dtype.str, magnitude.shape, digest)
+
+
+value_cache = ValueCache()
@@ -215,3 +215,108 @@ def test_multiply_property_by_str(factor):
 
     with pytest.raises(TypeError, match=error_msg):
         prop1 * factor
+
+
+@pytest.mark.parametrize("T", [300, np.linspace(300, 1200, num=10)])
+def test_value_magnitude_matches_value(T):
+    prop = htm.ArrheniusProperty(
+        pre_exp=1.5 * htm.ureg.m**2 * htm.ureg.s**-1,
+        act_energy=0.3 * htm.ureg.eV * htm.ureg.particle**-1,
+    )
+    expected = prop.value(T * htm.ureg.K)
+
+    assert np.allclose(prop.value_magnitude(T), expected.magnitude)
+    assert np.allclose(
+        prop.value_magnitude(T, units=htm.ureg.cm**2 * htm.ureg.s**-1),
+        expected.to(htm.ureg.cm**2 * htm.ureg.s**-1).magnitude,
+    )
+
+
+def test_value_magnitude_updated_when_parameters_change():
+    prop = htm.Diffusivity(
+        D_0=1 * htm.ureg.m**2 * htm.ureg.s**-1,
+        E_D=0 * htm.ureg.eV * htm.ureg.particle**-1,
+    )
+    assert prop.value_magnitude(300) == pytest.approx(1)
+
+    prop.pre_exp = 2 * htm.ureg.m**2 * htm.ureg.s**-1
+    assert prop.value_magnitude(300) == pytest.approx(2)
+
+    prop.act_energy = 0.1 * htm.ureg.eV * htm.ureg.particle**-1
+    assert prop.value_magnitude(300) == pytest.approx(
+        prop.value(300 * htm.ureg.K).magnitude
+    )
+
+
+def test_fit_is_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("HTM_CACHE_DIR", str(tmp_path))
+    data_T = np.linspace(300, 1000, num=10) * htm.ureg.K
+    data_y = 2 * np.exp(-5000 / data_T.magnitude) * htm.ureg.m**2 * htm.ureg.s**-1
+    prop = htm.ArrheniusProperty(data_T=data_T, data_y=data_y)
+    prop.fit()
+    assert len(list((tmp_path / "fits").iterdir())) == 1
+
+    # the same dataset is not fitted again
+    import scipy.stats
+
+    def linregress(*args, **kwargs):
+        raise AssertionError("linregress shouldn't be called")
+
+    monkeypatch.setattr(scipy.stats, "linregress", linregress)
+    other_prop = htm.ArrheniusProperty(data_T=data_T, data_y=data_y)
+
+    assert other_prop.pre_exp == prop.pre_exp
+    assert other_prop.act_energy == prop.act_energy
+
+
+def test_fit_cache_depends_on_units():
+    from h_transport_materials.fitting import fit_key
+
+    data_T = np.linspace(300, 1000, num=10) * htm.ureg.K
+    data_y = np.ones(10) * htm.ureg.m**2 * htm.ureg.s**-1
+
+    assert fit_key(data_T, data_y) != fit_key(data_T, data_y.to("cm**2/s"))
+    assert fit_key(data_T, data_y) != fit_key(data_T, data_y.magnitude * htm.ureg.m)
+    assert fit_key(data_T, data_y) == fit_key(data_T.copy(), data_y.copy())
+
+
+def test_lazy_fit_happens_once_with_concurrent_readers(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    import time
+
+    nb_fits = []
+    fit = htm.ArrheniusProperty.fit
+
+    def slow_fit(self, *args, **kwargs):
+        nb_fits.append(1)
+        time.sleep(0.05)
+        fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(htm.ArrheniusProperty, "fit", slow_fit)
+    prop = htm.ArrheniusProperty(
+        data_T=[300, 400, 500] * htm.ureg.K,
+        data_y=[1, 2, 3] * htm.ureg.dimensionless,
+    )
+
+    def read(attribute):
+        return getattr(prop, attribute)
+
+    attributes = ["pre_exp", "act_energy", "range"] * 10
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(read, attributes))
+
+    assert len(nb_fits) == 1
+    assert all(result is not None for result in results)
+
+
+def test_property_can_be_copied_and_pickled():
+    import copy
+    import pickle
+
+    prop = htm.ArrheniusProperty(
+        data_T=[300, 400, 500] * htm.ureg.K,
+        data_y=[1, 2, 3] * htm.ureg.dimensionless,
+    )
+
+    for new_prop in [copy.deepcopy(prop), pickle.loads(pickle.dumps(prop))]:
+        assert new_prop.pre_exp == prop.pre_exp
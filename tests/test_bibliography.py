@@ -0,0 +1,59 @@
+import h_transport_materials as htm
+from h_transport_materials.bibliography import Bibliography
+from pybtex.database import parse_file
+import pytest
+
+
+@pytest.fixture
+def bibliography(tmp_path, monkeypatch):
+    monkeypatch.setenv("HTM_CACHE_DIR", str(tmp_path))
+    return Bibliography(htm.bib_database.filename)
+
+
+def test_index_matches_pybtex(bibliography):
+    """Checks that the entries of the index are the ones parsed by pybtex"""
+    bib_data = parse_file(str(bibliography.filename))
+
+    assert set(bibliography.entries) == set(bib_data.entries.keys())
+    for key, entry in bib_data.entries.items():
+        author, year = bibliography.author_and_year(key)
+        if "author" in entry.persons:
+            assert author == entry.persons["author"][0].last_names[0].lower()
+        else:
+            assert author is None
+        if "year" in entry.fields:
+            assert year == int(entry.fields["year"])
+        else:
+            assert year is None
+        assert bibliography.entries[key].fields == entry.fields
+
+
+def test_index_is_cached_on_disk(bibliography, tmp_path):
+    bibliography.index
+
+    assert (tmp_path / "bib_index_references.json").exists()
+    assert Bibliography(bibliography.filename).index == bibliography.index
+
+
+def test_entries_are_parsed_on_demand(bibliography):
+    assert "alberro_experimental_2015" in bibliography.entries
+    assert bibliography.entries._parsed_entries == {}
+
+    entry = bibliography.entries["alberro_experimental_2015"]
+    assert entry.key == "alberro_experimental_2015"
+    assert list(bibliography.entries._parsed_entries) == ["alberro_experimental_2015"]
+
+
+def test_keys_are_case_insensitive(bibliography):
+    assert "ALBERRO_experimental_2015" in bibliography.entries
+    assert bibliography.entries["ALBERRO_experimental_2015"].key == (
+        "alberro_experimental_2015"
+    )
+
+
+def test_property_bibsource_is_resolved_lazily():
+    my_prop = htm.Property(source="alberro_experimental_2015")
+
+    assert my_prop._bibsource is None
+    assert my_prop.author == "alberro"
+    assert my_prop.bibsource.key == "alberro_experimental_2015"
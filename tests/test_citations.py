@@ -0,0 +1,214 @@
+import copy
+import h_transport_materials as htm
+from h_transport_materials import citations
+from h_transport_materials.property import _lock
+import json
+import threading
+import time
+import pytest
+import requests
+
+
+class StubCrossref:
+    """Replaces crossref: returns the length of the DOI as the number
+    of citations and records the requests"""
+
+    def __init__(self, failing_dois=()):
+        self.requested_dois = []
+        self.failing_dois = failing_dois
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, doi):
+        with self._lock:
+            self.requested_dois.append(doi)
+            self._concurrent_requests += 1
+            self.max_concurrent_requests = max(
+                self.max_concurrent_requests, self._concurrent_requests
+            )
+        time.sleep(0.01)
+        with self._lock:
+            self._concurrent_requests -= 1
+        if doi in self.failing_dois:
+            raise requests.ConnectionError
+        return len(doi)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HTM_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("HTM_OFFLINE", raising=False)
+    return tmp_path
+
+
+DOIS = [f"10.1000/{i}" for i in range(20)]
+
+
+def test_fetch_nb_citations():
+    stub = StubCrossref()
+
+    nb_citations = citations.fetch_nb_citations(DOIS, fetch=stub, rate=1000)
+
+    assert nb_citations == {doi: len(doi) for doi in DOIS}
+    assert sorted(stub.requested_dois) == sorted(DOIS)
+
+
+def test_concurrency_is_bounded():
+    stub = StubCrossref()
+
+    citations.fetch_nb_citations(DOIS, fetch=stub, max_workers=3, rate=1000)
+
+    assert 1 < stub.max_concurrent_requests <= 3
+
+
+def test_requests_are_rate_limited():
+    start = time.monotonic()
+
+    citations.fetch_nb_citations(DOIS[:5], fetch=StubCrossref(), rate=20)
+
+    assert time.monotonic() - start >= 4 / 20
+
+
+def test_counts_are_cached():
+    citations.fetch_nb_citations(DOIS, fetch=StubCrossref(), rate=1000)
+    stub = StubCrossref()
+
+    nb_citations = citations.fetch_nb_citations(DOIS, fetch=stub, rate=1000)
+
+    assert nb_citations == {doi: len(doi) for doi in DOIS}
+    assert stub.requested_dois == []
+
+
+def test_outdated_counts_are_fetched_again(cache_dir):
+    citations.fetch_nb_citations(DOIS, fetch=StubCrossref(), rate=1000)
+    stub = StubCrossref()
+
+    citations.fetch_nb_citations(DOIS, fetch=stub, rate=1000, ttl=0)
+
+    assert sorted(stub.requested_dois) == sorted(DOIS)
+
+
+def test_failed_requests_are_not_cached():
+    stub = StubCrossref(failing_dois=DOIS[:2])
+
+    with pytest.warns(UserWarning, match="citations of 2 DOIs"):
+        nb_citations = citations.fetch_nb_citations(DOIS, fetch=stub, rate=1000)
+
+    assert set(nb_citations) == set(DOIS[2:])
+    assert set(citations.read_cache()) == set(DOIS[2:])
+
+
+def test_other_errors_are_raised():
+    def fetch(doi):
+        raise TypeError
+
+    with pytest.raises(TypeError):
+        citations.fetch_nb_citations(DOIS, fetch=fetch, rate=1000)
+
+
+def test_offline_mode_only_uses_cache(cache_dir, monkeypatch):
+    cached = {DOIS[0]: {"nb_citations": 12, "time": 0}}
+    (cache_dir / citations.CACHE_FILENAME).write_text(json.dumps(cached))
+    monkeypatch.setenv("HTM_OFFLINE", "1")
+    stub = StubCrossref()
+
+    with pytest.warns(UserWarning, match="citations of 19 DOIs"):
+        nb_citations = citations.fetch_nb_citations(DOIS, fetch=stub)
+
+    assert nb_citations == {DOIS[0]: 12}
+    assert stub.requested_dois == []
+
+
+def test_nb_citations_offline(cache_dir, monkeypatch):
+    prop = htm.Property(source="alberro_experimental_2015")
+    cached = {prop.doi: {"nb_citations": 12, "time": time.time()}}
+    (cache_dir / citations.CACHE_FILENAME).write_text(json.dumps(cached))
+    monkeypatch.setenv("HTM_OFFLINE", "1")
+
+    assert prop.nb_citations == 12
+
+
+def test_nb_citations_is_0_when_not_fetched(monkeypatch):
+    prop = htm.Property(source="alberro_experimental_2015")
+    monkeypatch.setenv("HTM_OFFLINE", "1")
+
+    with pytest.warns(UserWarning, match="citations of 1 DOIs"):
+        assert prop.nb_citations == 0
+    # the count isn't fetched again
+    monkeypatch.delenv("HTM_OFFLINE")
+    assert prop.nb_citations == 0
+
+
+def test_setting_nb_citations_to_none_fetches_it_again(cache_dir, monkeypatch):
+    prop = htm.Property(source="alberro_experimental_2015")
+    prop.nb_citations = 3
+    cached = {prop.doi: {"nb_citations": 12, "time": time.time()}}
+    (cache_dir / citations.CACHE_FILENAME).write_text(json.dumps(cached))
+    monkeypatch.setenv("HTM_OFFLINE", "1")
+
+    prop.nb_citations = None
+
+    assert prop.nb_citations == 12
+
+
+def test_group_fetch_nb_citations_failures():
+    group = htm.PropertiesGroup(
+        htm.Property.from_json(prop.to_json())
+        for prop in htm.diffusivities.filter(material="tungsten")[:10]
+    )
+    dois = {prop.doi for prop in group if prop.bibsource is not None and prop.doi}
+    stub = StubCrossref(failing_dois=dois)
+
+    with pytest.warns(UserWarning, match="Couldn't get the number of citations"):
+        group.fetch_nb_citations(fetch=stub, rate=1000)
+
+    assert [prop.nb_citations for prop in group] == [0] * len(group)
+
+
+def test_group_fetch_nb_citations():
+    # copies of the properties of the database
+    group = htm.PropertiesGroup(
+        htm.Property.from_json(prop.to_json())
+        for prop in htm.diffusivities.filter(material="tungsten")[:10]
+    )
+    group.append(htm.Property(source="coucou"))
+    stub = StubCrossref()
+
+    group.fetch_nb_citations(fetch=stub, rate=1000)
+
+    for prop in group:
+        if prop.bibsource is not None and prop.doi:
+            assert prop.nb_citations == len(prop.doi)
+        else:
+            assert prop.nb_citations == 0
+    assert len(stub.requested_dois) == len(set(stub.requested_dois))
+
+
+def test_copies_fetch_nb_citations(cache_dir, monkeypatch):
+    prop = copy.deepcopy(htm.Property(source="alberro_experimental_2015"))
+    cached = {prop.doi: {"nb_citations": 12, "time": time.time()}}
+    (cache_dir / citations.CACHE_FILENAME).write_text(json.dumps(cached))
+    monkeypatch.setenv("HTM_OFFLINE", "1")
+
+    assert prop.nb_citations == 12
+
+
+def test_nb_citations_is_fetched_without_the_lock(monkeypatch):
+    prop = htm.Property(source="alberro_experimental_2015")
+    acquired = []
+
+    def fetch(dois, **kwargs):
+        # another thread can take the lock of the property during the request
+        thread = threading.Thread(
+            target=lambda: acquired.append(_lock(prop).acquire(timeout=1))
+        )
+        thread.start()
+        thread.join()
+        _lock(prop).release()
+        return {doi: 5 for doi in dois}
+
+    monkeypatch.setattr(citations, "fetch_nb_citations", fetch)
+
+    assert prop.nb_citations == 5
+    assert acquired == [True]
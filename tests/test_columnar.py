@@ -0,0 +1,67 @@
+import json
+
+import h_transport_materials as htm
+from h_transport_materials.columnar import STRING_COLUMNS
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def group():
+    fitted = htm.Diffusivity(
+        data_T=[300.0, 400.0, 500.0] * htm.ureg.K,
+        data_y=[1.0, 2.0, 3.0] * htm.ureg.cm**2 * htm.ureg.s**-1,
+        material=htm.COPPER,
+    )
+    return htm.PropertiesGroup(
+        [fitted] + list(htm.diffusivities.filter(material="tungsten"))
+    )
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_npz_export(group, tmp_path, compressed):
+    filename = tmp_path / "group.npz"
+
+    group.export_to_npz(filename, compressed=compressed)
+
+    data = np.load(filename)
+    assert len(data["pre_exp"]) == len(group)
+    for i, prop in enumerate(group):
+        assert data["type"][i] == type(prop).__name__
+        assert data["material"][i] == prop.material.name
+        assert data["units"][i] == f"{prop.units}"
+        assert data["pre_exp"][i] == pytest.approx(prop.pre_exp.magnitude)
+        assert data["act_energy"][i] == pytest.approx(prop.act_energy.magnitude)
+        assert data["T_min"][i] == pytest.approx(prop.range[0].to("K").magnitude)
+        start, end = data["data_offsets"][i : i + 2]
+        if prop.data_T is None:
+            assert start == end
+        else:
+            assert np.allclose(data["data_T"][start:end], prop.data_T.magnitude)
+            assert np.allclose(
+                data["data_y"][start:end], prop.data_y.to(prop.units).magnitude
+            )
+    schema = json.loads(str(data["schema"]))
+    assert schema["units"]["act_energy"] == "eV / particle"
+
+
+def test_npz_export_does_not_need_pickle(group, tmp_path):
+    filename = tmp_path / "group.npz"
+    group.export_to_npz(filename)
+
+    data = np.load(filename, allow_pickle=False)
+
+    for name in STRING_COLUMNS:
+        assert data[name].dtype.kind == "U"
+
+
+def test_parquet_export(group, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    filename = tmp_path / "group.parquet"
+
+    group.export_to_parquet(filename)
+
+    table = pq.read_table(filename)
+    assert table.num_rows == len(group)
+    assert table.column("data_T")[0].as_py() == [300.0, 400.0, 500.0]
+    assert b"htm" in table.schema.metadata
@@ -0,0 +1,233 @@
+import h_transport_materials as htm
+from h_transport_materials.fitting import (
+    segmented_regression,
+    arrhenius_covariance,
+    percentile_bands,
+    K_B,
+)
+import numpy as np
+import pytest
+import scipy.stats
+
+
+@pytest.fixture
+def datasets():
+    """Three noisy datasets y = intercept + slope * x"""
+    rng = np.random.default_rng(0)
+    lengths = np.array([10, 25, 7])
+    true_intercepts = np.array([1.0, -2.0, 0.5])
+    true_slopes = np.array([-3000.0, -8000.0, -500.0])
+    x = np.concatenate([1 / rng.uniform(300, 1000, size=n) for n in lengths])
+    segments = np.repeat(np.arange(3), lengths)
+    y = true_intercepts[segments] + true_slopes[segments] * x
+    y += rng.normal(scale=0.05, size=len(x))
+    return x, y, lengths, true_intercepts, true_slopes
+
+
+def split(values, lengths):
+    return np.split(values, np.cumsum(lengths)[:-1])
+
+
+def test_ols_matches_linregress(datasets):
+    x, y, lengths, _, _ = datasets
+
+    intercepts, slopes, covariances = segmented_regression(x, y, lengths)
+
+    for i, (x_i, y_i) in enumerate(zip(split(x, lengths), split(y, lengths))):
+        res = scipy.stats.linregress(x_i, y_i)
+        assert intercepts[i] == pytest.approx(res.intercept)
+        assert slopes[i] == pytest.approx(res.slope)
+        assert np.sqrt(covariances[i, 0, 0]) == pytest.approx(res.intercept_stderr)
+        assert np.sqrt(covariances[i, 1, 1]) == pytest.approx(res.stderr)
+
+
+def test_weighted_ols_matches_polyfit(datasets):
+    x, y, lengths, _, _ = datasets
+    weights = np.random.default_rng(1).uniform(0.1, 1, size=len(x))
+
+    intercepts, slopes, _ = segmented_regression(x, y, lengths, weights=weights)
+
+    for i, (x_i, y_i, w_i) in enumerate(
+        zip(split(x, lengths), split(y, lengths), split(weights, lengths))
+    ):
+        # polyfit weights multiply the residuals
+        slope, intercept = np.polyfit(x_i, y_i, 1, w=np.sqrt(w_i))
+        assert intercepts[i] == pytest.approx(intercept)
+        assert slopes[i] == pytest.approx(slope)
+
+
+@pytest.mark.parametrize("method", ["huber", "theil-sen"])
+def test_robust_methods_ignore_outliers(datasets, method):
+    x, y, lengths, true_intercepts, true_slopes = datasets
+    y = y.copy()
+    # one outlier in each dataset
+    y[np.cumsum(lengths) - 1] += 5
+
+    _, ols_slopes, _ = segmented_regression(x, y, lengths)
+    intercepts, slopes, covariances = segmented_regression(x, y, lengths, method=method)
+
+    assert np.all(np.abs(slopes - true_slopes) < np.abs(ols_slopes - true_slopes))
+    assert covariances.shape == (3, 2, 2)
+
+
+@pytest.mark.parametrize("method", ["ols", "huber", "theil-sen"])
+def test_segments_are_independent(datasets, method):
+    x, y, lengths, _, _ = datasets
+
+    intercepts, slopes, covariances = segmented_regression(x, y, lengths, method=method)
+
+    for i, (x_i, y_i) in enumerate(zip(split(x, lengths), split(y, lengths))):
+        intercept, slope, covariance = segmented_regression(
+            x_i, y_i, [len(x_i)], method=method
+        )
+        assert intercepts[i] == pytest.approx(intercept[0])
+        assert slopes[i] == pytest.approx(slope[0])
+        assert np.allclose(covariances[i], covariance[0])
+
+
+def test_theil_sen_with_weights_raises(datasets):
+    x, y, lengths, _, _ = datasets
+    with pytest.raises(ValueError, match="weights are not supported"):
+        segmented_regression(x, y, lengths, weights=np.ones_like(x), method="theil-sen")
+
+
+def test_unknown_method_raises(datasets):
+    x, y, lengths, _, _ = datasets
+    with pytest.raises(ValueError, match="method should be one of"):
+        segmented_regression(x, y, lengths, method="coucou")
+
+
+def test_arrhenius_covariance():
+    covariance = np.array([[1.0, 2.0], [2.0, 5.0]])
+
+    converted = arrhenius_covariance(covariance)
+
+    assert np.allclose(converted, [[1.0, -2.0 * K_B], [-2.0 * K_B, 5.0 * K_B**2]])
+
+
+@pytest.mark.parametrize("method", ["ols", "huber", "theil-sen"])
+def test_fit_all_matches_property_fit(method, tmp_path, monkeypatch):
+    monkeypatch.setenv("HTM_CACHE_DIR", str(tmp_path))
+    rng = np.random.default_rng(3)
+    group = htm.PropertiesGroup()
+    for _ in range(5):
+        data_T = rng.uniform(300, 1000, size=15) * htm.ureg.K
+        data_y = (
+            np.exp(-rng.uniform(1000, 5000) / data_T.magnitude)
+            * np.exp(rng.normal(scale=0.1, size=15))
+            * htm.ureg.m**2
+            * htm.ureg.s**-1
+        )
+        group.append(htm.Diffusivity(data_T=data_T, data_y=data_y))
+
+    group.fit_all(method=method)
+
+    for prop in group:
+        pre_exp, act_energy, covariance = (
+            prop.pre_exp,
+            prop.act_energy,
+            prop.fit_covariance,
+        )
+        prop.fit(method=method)
+        assert np.isclose(pre_exp, prop.pre_exp)
+        assert np.isclose(act_energy, prop.act_energy)
+        assert np.allclose(covariance, prop.fit_covariance)
+
+
+def test_fit_with_weights():
+    data_T = np.array([300, 400, 500, 600]) * htm.ureg.K
+    data_y = np.exp(-1000 / data_T.magnitude) * htm.ureg.m**2 * htm.ureg.s**-1
+    data_y[-1] *= 10
+    prop = htm.Diffusivity(data_T=data_T, data_y=data_y)
+
+    # the last point is ignored
+    prop.fit(weights=[1, 1, 1, 0])
+
+    assert prop.pre_exp.magnitude == pytest.approx(1)
+    assert prop.act_energy.magnitude == pytest.approx(1000 * K_B)
+
+
+@pytest.fixture
+def data_prop():
+    rng = np.random.default_rng(5)
+    data_T = rng.uniform(300, 1000, size=20) * htm.ureg.K
+    data_y = (
+        2
+        * np.exp(-3000 / data_T.magnitude)
+        * np.exp(rng.normal(scale=0.2, size=20))
+        * htm.ureg.m**2
+        * htm.ureg.s**-1
+    )
+    return htm.Diffusivity(data_T=data_T, data_y=data_y)
+
+
+def test_bootstrap_bands(data_prop):
+    T = np.linspace(300, 1000, num=30) * htm.ureg.K
+
+    low, median, high = data_prop.bootstrap(T, nb_resamples=500, seed=1)
+
+    assert low.units == data_prop.units
+    assert np.all(low < median) and np.all(median < high)
+    assert np.allclose(median, data_prop.value(T), rtol=0.1)
+
+
+def test_bootstrap_is_deterministic(data_prop):
+    T = np.linspace(300, 1000, num=5) * htm.ureg.K
+
+    bands = data_prop.bootstrap(T, nb_resamples=300, seed=1).magnitude
+
+    same_seed = data_prop.bootstrap(T, nb_resamples=300, seed=1).magnitude
+    other_seed = data_prop.bootstrap(T, nb_resamples=300, seed=2).magnitude
+    assert np.array_equal(bands, same_seed)
+    assert not np.array_equal(bands, other_seed)
+
+
+def test_bootstrap_with_processes(data_prop):
+    T = np.linspace(300, 1000, num=5) * htm.ureg.K
+
+    bands = data_prop.bootstrap(T, nb_resamples=600, seed=1, processes=2)
+
+    serial_bands = data_prop.bootstrap(T, nb_resamples=600, seed=1)
+    assert np.array_equal(bands.magnitude, serial_bands.magnitude)
+
+
+def test_percentile_bands_chunks():
+    rng = np.random.default_rng(0)
+    intercepts = rng.normal(size=(3, 100))
+    slopes = rng.normal(-1000, 100, size=(3, 100))
+    T = np.linspace(300, 1000, num=50)
+
+    bands = percentile_bands(intercepts, slopes, T)
+
+    assert bands.shape == (3, 3, 50)
+    assert np.allclose(bands, percentile_bands(intercepts, slopes, T, chunk_size=7))
+
+
+def test_group_bootstrap(data_prop):
+    T = np.linspace(300, 1000, num=5) * htm.ureg.K
+    no_data_prop = htm.Diffusivity(1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1)
+    group = htm.PropertiesGroup([data_prop, no_data_prop])
+
+    bands = group.bootstrap(T, nb_resamples=200, seed=3)
+
+    assert bands.shape == (2, 3, 5)
+    assert np.allclose(bands[0], data_prop.bootstrap(T, nb_resamples=200, seed=3))
+    assert np.all(np.isnan(bands[1]))
+
+
+def test_bootstrap_without_data_raises():
+    prop = htm.Diffusivity(1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1)
+    with pytest.raises(ValueError, match="bootstrap requires data_T and data_y"):
+        prop.bootstrap(300 * htm.ureg.K)
+
+
+def test_fit_covariance_json_round_trip():
+    prop = htm.Diffusivity(
+        data_T=[300, 400, 500] * htm.ureg.K,
+        data_y=[1, 2, 4] * htm.ureg.m**2 * htm.ureg.s**-1,
+        material=htm.TUNGSTEN,
+    )
+
+    rebuilt_prop = htm.Property.from_json(prop.to_json())
+
+    assert np.allclose(rebuilt_prop.fit_covariance, prop.fit_covariance)
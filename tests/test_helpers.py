@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import h_transport_materials as htm
+from h_transport_materials.helpers import wpd_key
+import numpy as np
+import pytest
+
+CSV = """a,,b,
+X,Y,X,Y
+1,2,3,4
+5,6,7,8
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HTM_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def wpd_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV)
+    return path
+
+
+def relative_path(path):
+    return os.path.relpath(path, Path(__file__).parent)
+
+
+def test_absolute_path():
+    assert htm.absolute_path("data.csv") == str(Path(__file__).parent / "data.csv")
+
+
+def test_structure_data_from_wpd(cache_dir, wpd_file):
+    data = htm.structure_data_from_wpd(relative_path(wpd_file))
+
+    assert list(data) == ["a", "b"]
+    # the X,Y row is read as nan
+    assert np.array_equal(data["a"]["x"], [np.nan, 1, 5], equal_nan=True)
+    assert np.array_equal(data["b"]["y"], [np.nan, 4, 8], equal_nan=True)
+    assert len(list((cache_dir / "wpd").iterdir())) == 1
+
+
+def test_structure_data_from_wpd_cached(cache_dir, wpd_file, monkeypatch):
+    expected = htm.structure_data_from_wpd(relative_path(wpd_file))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the csv file was parsed again")
+
+    monkeypatch.setattr(np, "genfromtxt", fail)
+    data = htm.structure_data_from_wpd(relative_path(wpd_file))
+
+    assert list(data) == list(expected)
+    for name in data:
+        assert np.array_equal(data[name]["x"], expected[name]["x"], equal_nan=True)
+        assert np.array_equal(data[name]["y"], expected[name]["y"], equal_nan=True)
+
+
+def test_modified_wpd_file_is_parsed_again(cache_dir, wpd_file):
+    htm.structure_data_from_wpd(relative_path(wpd_file))
+    key = wpd_key(str(wpd_file))
+
+    wpd_file.write_text(CSV.replace("1,2", "10,2"))
+
+    assert wpd_key(str(wpd_file)) != key
+    data = htm.structure_data_from_wpd(relative_path(wpd_file))
+    assert np.array_equal(data["a"]["x"], [np.nan, 10, 5], equal_nan=True)
+
+
+def wpd_project(path, datasets):
+    project = {
+        "version": [4, 0],
+        "datasetColl": [
+            {
+                "name": name,
+                "data": [{"x": 0, "y": 0, "value": point} for point in points],
+            }
+            for name, points in datasets.items()
+        ],
+    }
+    with tarfile.open(path, "w") as archive:
+        for filename, content in [
+            ("project/info.json", b'{"json": "wpd.json"}'),
+            ("project/wpd.json", json.dumps(project).encode()),
+            ("project/image.png", b"not an image"),
+        ]:
+            info = tarfile.TarInfo(filename)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+
+def test_structure_data_from_wpd_project(cache_dir, tmp_path):
+    path = tmp_path / "project.tar"
+    wpd_project(path, {"dataset A": [[1, 2], [3, 4]], "B": [[5, 6]]})
+
+    data = htm.structure_data_from_wpd(relative_path(path))
+
+    assert list(data) == ["dataset A", "B"]
+    assert np.array_equal(data["dataset A"]["x"], [1, 3])
+    assert np.array_equal(data["dataset A"]["y"], [2, 4])
+    assert np.array_equal(data["B"]["y"], [6])
+    assert len(list((cache_dir / "wpd").iterdir())) == 1
+
+
+def test_wpd_project_without_project_file(cache_dir, tmp_path):
+    path = tmp_path / "project.tar"
+    with tarfile.open(path, "w") as archive:
+        archive.addfile(tarfile.TarInfo("project/info.json"), io.BytesIO(b""))
+
+    with pytest.raises(ValueError, match="not a WebPlotDigitizer project"):
+        htm.structure_data_from_wpd(relative_path(path))
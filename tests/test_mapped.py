@@ -0,0 +1,86 @@
+import h_transport_materials as htm
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def group():
+    fitted = htm.Diffusivity(
+        data_T=[300.0, 400.0, 500.0] * htm.ureg.K,
+        data_y=[1.0, 2.0, 3.0] * htm.ureg.cm**2 * htm.ureg.s**-1,
+        material=htm.COPPER,
+        isotope="D",
+    )
+    return htm.PropertiesGroup(
+        [fitted]
+        + list(htm.diffusivities.filter(material="tungsten"))
+        + list(htm.solubilities.filter(material="tungsten"))
+    )
+
+
+@pytest.fixture
+def mapped(group, tmp_path):
+    group.export_to_mmap(tmp_path / "database")
+    return htm.MappedPropertiesGroup(tmp_path / "database")
+
+
+def test_arrays_are_memory_mapped(mapped, group):
+    assert len(mapped) == len(group)
+    assert isinstance(mapped.column("pre_exp"), np.memmap)
+    assert np.allclose(
+        mapped.column("pre_exp"), group.columns["pre_exp"], equal_nan=True
+    )
+
+
+def test_filter_matches_group(mapped, group):
+    for kwargs in [
+        {"material": "tungsten"},
+        {"isotope": ["h", "d"]},
+        {"type": htm.Solubility},
+        {"type": htm.Diffusivity, "exclude": True},
+        {"year": 1969},
+    ]:
+        assert len(mapped.filter(**kwargs)) == len(group.filter(**kwargs))
+
+
+def test_filter_of_view(mapped, group):
+    view = mapped.filter(type=htm.Diffusivity).filter(material="tungsten")
+    expected = group.filter(type=htm.Diffusivity).filter(material="tungsten")
+
+    assert [prop.author for prop in view] == [prop.author for prop in expected]
+
+
+def test_values(mapped, group):
+    T = np.linspace(300, 1200, num=5) * htm.ureg.K
+    view = mapped.filter(type=htm.Diffusivity)
+
+    values = view.values(T)
+
+    expected = group.filter(type=htm.Diffusivity).values(T)
+    assert values.units == expected.units
+    assert np.allclose(values.magnitude, expected.magnitude)
+
+
+def test_values_mixed_units(mapped):
+    with pytest.raises(ValueError, match="Can't evaluate mixed units groups"):
+        mapped.values(300 * htm.ureg.K)
+
+
+def test_properties_are_created_on_access(mapped, group):
+    for prop, expected in zip(mapped, group):
+        assert type(prop) is type(expected)
+        assert prop.material == expected.material
+        assert prop.isotope == expected.isotope
+        assert prop.pre_exp.magnitude == pytest.approx(expected.pre_exp.magnitude)
+        assert prop.pre_exp.units == expected.pre_exp.units
+        assert prop.act_energy.magnitude == pytest.approx(expected.act_energy.magnitude)
+    fitted = mapped[0]
+    assert np.allclose(fitted.data_T.magnitude, [300.0, 400.0, 500.0])
+    assert np.allclose(fitted.data_y.to("cm**2/s").magnitude, [1.0, 2.0, 3.0])
+    assert isinstance(mapped.to_group(), htm.PropertiesGroup)
+
+
+def test_filter_type_by_name(mapped):
+    assert len(mapped.filter(type="diffusivity")) == len(
+        mapped.filter(type=htm.Diffusivity)
+    )
@@ -4,6 +4,11 @@ import json
 import pytest
 from pybtex.database import BibliographyData
 
+from h_transport_materials.aggregation import stream_mean
+from h_transport_materials.fitting import nan_percentiles
+
+DEFAULT_ENERGY_UNITS = htm.ureg.eV * htm.ureg.particle**-1
+
 
 def test_iterable():
     """Checks that PropertiesGroup can be iterated through"""
@@ -162,6 +167,12 @@ def test_export_to_json():
                     assert np.array_equal(
                         getattr(prop_ref, key).magnitude, val["value"]
                     )
+                elif key == "fit_covariance":
+                    assert np.array_equal(
+                        getattr(prop_ref, key),
+                        np.array(val, dtype=float),
+                        equal_nan=True,
+                    )
                 elif key == "range":
                     prop_range = getattr(prop_ref, key)
                     assert [
@@ -172,6 +183,87 @@ def test_export_to_json():
                     assert getattr(prop_ref, key) == val
 
 
+def test_from_json_round_trip(tmp_path):
+    filename = tmp_path / "database.json"
+    htm.database.export_to_json(filename)
+
+    group = htm.PropertiesGroup.from_json(filename)
+
+    assert len(group) == len(htm.database)
+    for prop, prop_ref in zip(group, htm.database):
+        assert type(prop) is type(prop_ref)
+        assert prop.material is prop_ref.material
+        assert prop.to_json() == prop_ref.to_json()
+        if isinstance(prop, (htm.Solubility, htm.Permeability)):
+            assert prop.law == prop_ref.law
+
+
+def test_from_json_custom_properties(tmp_path):
+    filename = tmp_path / "group.json"
+    prop = htm.Solubility(
+        S_0=2 * htm.ureg.particle * htm.ureg.m**-3 * htm.ureg.Pa**-0.5,
+        E_S=0.3 * htm.ureg.eV * htm.ureg.particle**-1,
+        range=(300 * htm.ureg.K, 600 * htm.ureg.K),
+        material=htm.TUNGSTEN,
+        author="someone",
+        year=2021,
+        isotope="D",
+    )
+    fitted = htm.Diffusivity(
+        data_T=[300, 400, 500] * htm.ureg.K,
+        data_y=[1, 2, 3] * htm.ureg.m**2 * htm.ureg.s**-1,
+        material=htm.COPPER,
+    )
+    htm.PropertiesGroup([prop, fitted]).export_to_json(filename)
+
+    new_prop, new_fitted = htm.PropertiesGroup.from_json(filename)
+
+    assert new_prop.law == "sievert"
+    assert new_prop.material is htm.TUNGSTEN
+    assert new_prop.to_json() == prop.to_json()
+    assert np.array_equal(new_fitted.data_y.magnitude, [1, 2, 3])
+    assert new_fitted.pre_exp == fitted.pre_exp
+
+
+@pytest.mark.parametrize(
+    "filename,kwargs",
+    [
+        ("group.json", {}),
+        ("group.json", {"compact": True}),
+        ("group.jsonl", {"lines": True}),
+    ],
+)
+def test_json_streaming_round_trip(tmp_path, filename, kwargs):
+    filename = tmp_path / filename
+    group = htm.diffusivities.filter(material="tungsten")
+    group.export_to_json(filename, **kwargs)
+
+    for chunk_size in [7, htm.streaming.JSON_CHUNK_SIZE]:
+        props = list(htm.iter_json(filename, chunk_size=chunk_size))
+
+        assert [prop.to_json() for prop in props] == [prop.to_json() for prop in group]
+
+
+def test_write_json_generator(tmp_path):
+    filename = tmp_path / "group.jsonl"
+    props = (htm.Diffusivity(i + 1, 0.1, material=htm.TUNGSTEN) for i in range(3))
+
+    htm.write_json(props, filename, lines=True)
+
+    assert filename.read_text().count("\n") == 3
+    group = htm.PropertiesGroup.from_json(filename)
+    assert [prop.pre_exp.magnitude for prop in group] == [1, 2, 3]
+
+
+def test_iter_json_truncated_file(tmp_path):
+    filename = tmp_path / "group.json"
+    htm.diffusivities.filter(material="tungsten").export_to_json(filename)
+    filename.write_text(filename.read_text()[:-20])
+
+    with pytest.raises(ValueError):
+        list(htm.iter_json(filename))
+
+
 def test_filter_warns_when_no_props():
     with pytest.warns(UserWarning):
         htm.diffusivities.filter(material="material_that_doesn_not_exist")
@@ -222,3 +314,382 @@ def test_mean_of_large_numbers_properties():
 
     perm = htm.permeabilities.filter(material="steel").mean()
     assert not np.isinf(perm.pre_exp)
+
+
+def test_mean_does_not_underflow():
+    pre_exps = [1e-10, 1e10] * 1000
+    group = htm.PropertiesGroup(htm.Diffusivity(D_0, 0.1) for D_0 in pre_exps)
+
+    assert group.mean().pre_exp.magnitude == pytest.approx(1)
+
+
+def test_weighted_mean():
+    prop1 = htm.Diffusivity(1, 0.1, year=2000)
+    prop2 = htm.Diffusivity(100, 0.4, year=2020)
+    group = htm.PropertiesGroup([prop1, prop2])
+
+    mean = group.mean(weights=[1, 2])
+
+    assert mean.pre_exp.magnitude == pytest.approx(100 ** (2 / 3))
+    assert mean.act_energy.magnitude == pytest.approx(0.3)
+    by_year = group.mean(weights="year")
+    assert by_year.act_energy.magnitude == pytest.approx(
+        (0.1 * 2000 + 0.4 * 2020) / 4020
+    )
+    by_function = group.mean(weights=lambda prop: prop.year - 2000)
+    assert by_function.act_energy.magnitude == pytest.approx(0.4)
+
+
+@pytest.mark.parametrize("weights", [[1, -1], [1, np.nan], "year"])
+def test_mean_invalid_weights(weights):
+    group = htm.PropertiesGroup([htm.Diffusivity(1, 0.1), htm.Diffusivity(2, 0.2)])
+
+    with pytest.raises(ValueError, match="weights must be finite and non-negative"):
+        group.mean(weights=weights)
+
+
+@pytest.mark.parametrize("by", ["material", ["material", "isotope"]])
+def test_grouped_mean_matches_filter(by):
+    group = htm.diffusivities.filter(material=["tungsten", "copper", "nickel"])
+
+    means = group.mean(by=by)
+
+    for key, mean in means.items():
+        if isinstance(by, str):
+            expected = group.filter(**{by: key}).mean()
+        else:
+            expected = group.filter(material=key[0], isotope=key[1].lower()).mean()
+        assert mean.pre_exp.magnitude == pytest.approx(expected.pre_exp.magnitude)
+        assert mean.act_energy.magnitude == pytest.approx(expected.act_energy.magnitude)
+    assert len(means) > 1
+
+
+def test_stream_mean_matches_mean():
+    group = htm.diffusivities.filter(material=["tungsten", "copper"])
+
+    streamed = stream_mean(iter(group), by="material", chunk_size=7)
+
+    for key, mean in group.mean(by="material").items():
+        assert streamed[key].pre_exp.magnitude == pytest.approx(mean.pre_exp.magnitude)
+        assert streamed[key].act_energy.magnitude == pytest.approx(
+            mean.act_energy.magnitude
+        )
+
+
+def test_stream_mean_mixed_units():
+    props = [htm.Diffusivity(1, 0.1), htm.Solubility(1, 0.1, law="henry")]
+
+    with pytest.raises(ValueError, match="Can't compute mean on mixed units groups"):
+        stream_mean(props, chunk_size=1)
+
+
+def test_groupby_partitions_group():
+    group = htm.diffusivities.filter(material=["tungsten", "copper"])
+
+    grouped = group.groupby(["material", "isotope"])
+
+    assert sum(len(subgroup) for _, subgroup in grouped) == len(group)
+    for (material, isotope), subgroup in grouped:
+        assert all(prop.material == material for prop in subgroup)
+        assert all(prop.isotope == isotope for prop in subgroup)
+    key = grouped.group_keys[0]
+    assert list(grouped[key]) == list(dict(iter(grouped))[key])
+
+
+def test_groupby_aggregate():
+    group = htm.diffusivities.filter(material=["tungsten", "copper", "nickel"])
+    T = 600 * htm.ureg.K
+
+    table = group.groupby("material").aggregate(T=T)
+
+    assert len(table) == 3
+    for row in table:
+        subgroup = group.filter(material=row["material"])
+        values = subgroup.values(T).magnitude
+        years = [prop.year for prop in subgroup if prop.year is not None]
+        assert row["count"] == len(subgroup)
+        assert row["year_min"] == min(years)
+        assert row["year_max"] == max(years)
+        assert row["min"] == pytest.approx(values.min())
+        assert row["max"] == pytest.approx(values.max())
+        assert row["median"] == pytest.approx(np.median(values))
+        assert row["geometric_mean"] == pytest.approx(np.exp(np.log(values).mean()))
+
+
+def test_groupby_aggregate_without_T():
+    group = htm.PropertiesGroup(
+        [htm.Diffusivity(1, 0.1, author="a"), htm.Diffusivity(2, 0.1, author="b")]
+    )
+
+    table = group.groupby("author").aggregate()
+
+    assert list(table["author"]) == ["a", "b"]
+    assert list(table["count"]) == [1, 1]
+    assert np.isnan(table["year_min"]).all()
+    assert "median" not in table.dtype.names
+
+
+def test_envelope_matches_percentiles_of_values():
+    group = htm.diffusivities.filter(material="tungsten")
+    T = np.linspace(300, 1200, num=50) * htm.ureg.K
+
+    envelope = group.envelope(T, percentiles=(0, 25, 100), chunk_size=7)
+
+    values = group.values(T).magnitude
+    expected = np.percentile(values, (0, 25, 100), axis=0)
+    assert envelope.units == group.units
+    assert np.allclose(envelope.magnitude, expected)
+
+
+def test_envelope_masks_range():
+    prop1 = htm.Diffusivity(1, 0.1, range=(300 * htm.ureg.K, 600 * htm.ureg.K))
+    prop2 = htm.Diffusivity(2, 0.1, range=(500 * htm.ureg.K, 800 * htm.ureg.K))
+    group = htm.PropertiesGroup([prop1, prop2])
+    T = np.array([400, 550, 700, 900]) * htm.ureg.K
+
+    minimum, maximum = group.envelope(T, percentiles=(0, 100), mask_range=True)
+
+    assert minimum.magnitude == pytest.approx(
+        [prop1.value(T[0]).magnitude, prop1.value(T[1]).magnitude]
+        + [prop2.value(T[2]).magnitude, np.nan],
+        nan_ok=True,
+    )
+    assert maximum[1].magnitude == pytest.approx(prop2.value(T[1]).magnitude)
+
+
+def test_nan_percentiles_matches_numpy():
+    values = np.random.default_rng(0).random((30, 8))
+    values[values < 0.2] = np.nan
+    values[:, 0] = np.nan
+
+    result = nan_percentiles(values, [0, 10, 50, 100], axis=0)
+
+    with pytest.warns(RuntimeWarning):
+        expected = np.nanpercentile(values, [0, 10, 50, 100], axis=0)
+    assert np.allclose(result, expected, equal_nan=True)
+
+
+def test_warm():
+    props = [
+        htm.ArrheniusProperty(
+            data_T=[300, 400, 500] * htm.ureg.K,
+            data_y=[1, 2, 3] * htm.ureg.dimensionless,
+            source="causey_416_2012",
+        )
+        for _ in range(3)
+    ]
+    group = htm.PropertiesGroup(props)
+
+    group.warm()
+
+    for prop in props:
+        assert prop._pre_exp is not None and prop._range is not None
+        assert prop._bibsource_key is None and prop.bibsource is not None
+    assert "act_energy" in group.columns._columns
+
+
+def test_values_matches_value_of_each_property():
+    group = htm.diffusivities.filter(material="tungsten")
+    T = np.linspace(300, 1200, num=50) * htm.ureg.K
+
+    values = group.values(T)
+
+    assert values.shape == (len(group), len(T))
+    assert values.units == group.units
+    for prop, prop_values in zip(group, values):
+        assert np.allclose(prop_values, prop.value(T))
+
+
+def test_values_magnitude_units():
+    group = htm.PropertiesGroup(
+        [
+            htm.Diffusivity(
+                1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1 * DEFAULT_ENERGY_UNITS
+            ),
+            htm.Diffusivity(
+                2 * htm.ureg.m**2 * htm.ureg.s**-1, 0.2 * DEFAULT_ENERGY_UNITS
+            ),
+        ]
+    )
+    T = np.array([[400, 500], [600, 700]])
+
+    values = group.values_magnitude(T, units=htm.ureg.cm**2 * htm.ureg.s**-1)
+
+    assert values.shape == (2, 2, 2)
+    assert np.allclose(values, group.values(T * htm.ureg.K).to("cm**2/s").magnitude)
+
+
+def test_values_mixed_units_raises():
+    prop1 = htm.ArrheniusProperty(
+        0.1 * htm.ureg.dimensionless, 0.1 * htm.ureg.eV * htm.ureg.particle**-1
+    )
+    prop2 = htm.ArrheniusProperty(
+        0.1 * htm.ureg.m, 0.1 * htm.ureg.eV * htm.ureg.particle**-1
+    )
+    with pytest.raises(ValueError, match="Can't evaluate mixed units groups"):
+        htm.PropertiesGroup([prop1, prop2]).values(300 * htm.ureg.K)
+
+
+def test_filter_reuses_columns():
+    """Checks that the columns built for a group are passed to its subgroups"""
+    group = htm.diffusivities.filter(material="tungsten")
+    group.columns["isotope"]
+
+    filtered_group = group.filter(isotope="h")
+
+    assert (
+        filtered_group.columns["isotope"].categories
+        is group.columns["isotope"].categories
+    )
+    isotopes = filtered_group.columns["isotope"]
+    assert all(isotopes.categories[code] == "H" for code in isotopes.codes)
+
+
+def test_columns_invalidated_when_group_modified():
+    prop1 = htm.Diffusivity(
+        1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1 * DEFAULT_ENERGY_UNITS
+    )
+    prop2 = htm.Diffusivity(
+        2 * htm.ureg.m**2 * htm.ureg.s**-1, 0.3 * DEFAULT_ENERGY_UNITS
+    )
+    group = htm.PropertiesGroup([prop1])
+    assert group.mean().act_energy.magnitude == pytest.approx(0.1)
+
+    group.append(prop2)
+
+    assert group.mean().act_energy.magnitude == pytest.approx(0.2)
+
+
+def test_columns_invalidated_when_property_modified():
+    prop = htm.Diffusivity(
+        1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1 * DEFAULT_ENERGY_UNITS, isotope="H"
+    )
+    group = htm.PropertiesGroup([prop])
+    assert len(group.filter(isotope="h")) == 1
+
+    prop.isotope = "D"
+
+    assert len(group.filter(isotope="d")) == 1
+    prop.act_energy = 0.2 * DEFAULT_ENERGY_UNITS
+    assert group.mean().act_energy.magnitude == pytest.approx(0.2)
+
+
+def _scan_filter(group, exclude=False, **kwargs):
+    """Reference implementation of PropertiesGroup.filter without indexes"""
+    filtered_props = []
+    for prop in group:
+        match = True
+        for attr, value in kwargs.items():
+            prop_attr = getattr(prop, attr)
+            if isinstance(prop_attr, str):
+                prop_attr = prop_attr.lower()
+            if isinstance(value, list):
+                match = match and prop_attr in value
+            else:
+                match = match and not prop_attr != value
+        if match != exclude:
+            filtered_props.append(prop)
+    return filtered_props
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"material": "tungsten"},
+        {"material": "W"},
+        {"material": "metal"},
+        {"material": htm.TUNGSTEN},
+        {"material": htm.Steel},
+        {"material": [htm.TUNGSTEN, "copper", htm.FLIBE]},
+        {"isotope": ["h", "d"]},
+        {"isotope": None},
+        {"author": "frauenfelder"},
+        {"year": [1969, 2000]},
+        {"material": "steel", "isotope": "t"},
+    ],
+)
+@pytest.mark.parametrize("exclude", [False, True])
+def test_indexed_filter_matches_scan(kwargs, exclude):
+    """Checks that the indexed filter gives the same properties as a
+    full scan of the database"""
+    expected = _scan_filter(htm.database, exclude=exclude, **kwargs)
+    assert list(htm.database.filter(exclude=exclude, **kwargs)) == expected
+
+
+def test_filter_by_type():
+    solubilities = htm.database.filter(type=htm.Solubility)
+
+    assert len(solubilities) == len(htm.solubilities)
+    assert all(isinstance(prop, htm.Solubility) for prop in solubilities)
+
+
+def test_filtered_groups_share_index():
+    group = htm.PropertiesGroup(htm.diffusivities)
+    tungsten = group.filter(material="tungsten")
+    tungsten_h = tungsten.filter(isotope="h")
+
+    tungsten_h.filter(material="w")
+
+    index = group.columns["material"].index
+    assert tungsten.columns["material"].index is index
+    assert tungsten_h.columns["material"].index is index
+
+
+def test_filter_with_custom_material():
+    """Checks that materials with their own __eq__ are still compared
+    with it"""
+
+    class AnyMaterial(htm.Material):
+        def __eq__(self, mat) -> bool:
+            return True
+
+        __hash__ = htm.Material.__hash__
+
+    prop1 = htm.Property(material=AnyMaterial("foo"))
+    prop2 = htm.Property(material=htm.TUNGSTEN)
+    group = htm.PropertiesGroup([prop1, prop2])
+
+    assert list(group.filter(material="copper")) == [prop1]
+
+
+def test_fit_all_matches_fit():
+    rng = np.random.default_rng(42)
+    group = htm.PropertiesGroup()
+    for i in range(20):
+        data_T = rng.uniform(300, 1000, size=rng.integers(2, 30)) * htm.ureg.K
+        data_y = (
+            rng.uniform(1, 10)
+            * np.exp(-rng.uniform(1000, 10000) / data_T.magnitude)
+            * np.exp(rng.normal(scale=0.1, size=len(data_T)))
+            * htm.ureg.m**2
+            * htm.ureg.s**-1
+        )
+        group.append(htm.Diffusivity(data_T=data_T, data_y=data_y))
+    # a property without experimental points is left untouched
+    group.append(htm.Diffusivity(1 * htm.ureg.m**2 * htm.ureg.s**-1, 0.1))
+
+    group.fit_all()
+
+    for prop in group[:-1]:
+        pre_exp, act_energy, T_range = prop.pre_exp, prop.act_energy, prop.range
+        prop.fit()
+        assert np.isclose(pre_exp, prop.pre_exp, rtol=1e-10)
+        assert np.isclose(act_energy, prop.act_energy, rtol=1e-10)
+        assert T_range == prop.range
+    assert group[-1].pre_exp == 1 * htm.ureg.m**2 * htm.ureg.s**-1
+
+
+def test_fit_all_refit():
+    data_T = np.array([300, 400, 500]) * htm.ureg.K
+    data_y = np.exp(-1000 / data_T.magnitude) * htm.ureg.m**2 * htm.ureg.s**-1
+    prop = htm.Diffusivity(data_T=data_T, data_y=data_y)
+    prop.pre_exp = 2 * htm.ureg.m**2 * htm.ureg.s**-1
+    prop.act_energy = 0.1 * DEFAULT_ENERGY_UNITS
+    prop.range = (300 * htm.ureg.K, 500 * htm.ureg.K)
+    group = htm.PropertiesGroup([prop])
+
+    group.fit_all()
+    assert prop.pre_exp.magnitude == pytest.approx(2)
+
+    group.fit_all(refit=True)
+    assert prop.pre_exp.magnitude == pytest.approx(1)
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import h_transport_materials as htm
+from h_transport_materials import property_database
+
+
+def test_all_materials_are_registered():
+    """Checks that the material of each property of the database is registered
+    in property_database.MODULES, otherwise it can't be loaded lazily"""
+    registered_materials = [
+        mat for materials in property_database.MODULES.values() for mat in materials
+    ]
+    for prop in htm.database:
+        assert any(prop.material is mat for mat in registered_materials)
+
+
+def test_filter_only_loads_requested_material():
+    """Checks that filtering the database by material in a fresh interpreter
+    doesn't load the modules of other materials"""
+    code = """
+import h_transport_materials as htm
+
+assert len(htm.diffusivities.filter(material="tungsten")) > 0
+assert list(htm.property_database.loaded_modules) == ["tungsten"]
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_filter_gives_same_result_as_loaded_group():
+    for material in ["tungsten", "steel", htm.Steel, [htm.FLIBE, htm.LIPB]]:
+        lazy_result = htm.permeabilities.filter(material=material)
+        loaded_result = htm.PropertiesGroup(htm.permeabilities).filter(
+            material=material
+        )
+        assert lazy_result == loaded_result
+
+
+def test_derived_groups_have_all_properties_of_their_type():
+    for group, prop_type in [
+        (htm.diffusivities, htm.Diffusivity),
+        (htm.solubilities, htm.Solubility),
+        (htm.permeabilities, htm.Permeability),
+    ]:
+        expected = [prop for prop in htm.database if isinstance(prop, prop_type)]
+        assert list(group) == expected
+
+
+def test_lazy_group():
+    """Checks that a LazyPropertiesGroup only calls its load function
+    when its properties are needed"""
+    requested_materials = []
+    my_group = htm.LazyPropertiesGroup(load=requested_materials.append)
+
+    my_group.append(htm.Property(material=htm.GOLD))
+    assert requested_materials == []
+
+    my_group.filter(material="gold")
+    assert requested_materials == ["gold"]
+
+    assert len(my_group) == 1
+    assert requested_materials == ["gold", None]
@@ -0,0 +1,88 @@
+import h_transport_materials as htm
+from h_transport_materials import Field, covers, overlaps, within
+import pytest
+import warnings
+
+DEFAULT_ENERGY_UNITS = htm.ureg.eV * htm.ureg.particle**-1
+
+
+@pytest.fixture
+def group():
+    return htm.PropertiesGroup(
+        [
+            htm.Diffusivity(
+                1, 0.1, range=(300, 600), year=1990, isotope="H", material="tungsten"
+            ),
+            htm.Diffusivity(
+                2, 0.2, range=(500, 1000), year=2005, isotope="D", material="tungsten"
+            ),
+            htm.Diffusivity(
+                3, 0.3, range=(800, 1200), year=2015, isotope="H", material="copper"
+            ),
+            htm.Diffusivity(4, 0.4, year=None, isotope="T", material=htm.NICKEL),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "condition,expected_indices",
+    [
+        (Field("year") >= 2000, [1, 2]),
+        (Field("year").between(1990, 2005), [0, 1]),
+        (Field("isotope") == "h", [0, 2]),
+        (Field("isotope") != "h", [1, 3]),
+        (Field("material").isin(["copper", "nickel"]), [2, 3]),
+        (Field("material") == "metal", [3]),
+        (Field("act_energy") < 0.25 * DEFAULT_ENERGY_UNITS, [0, 1]),
+        (Field("act_energy").between(0.15, 0.35), [1, 2]),
+        (covers(550 * htm.ureg.K), [0, 1]),
+        (covers(600, 900), [1]),
+        (overlaps(550, 850), [0, 1, 2]),
+        (within(400, 1100), [1]),
+        ((Field("year") >= 2000) & (Field("isotope") == "h"), [2]),
+        ((Field("year") < 2000) | (Field("material") == "copper"), [0, 2]),
+        (~covers(550), [2, 3]),
+    ],
+)
+def test_query(group, condition, expected_indices):
+    assert list(group.query(condition)) == [group[i] for i in expected_indices]
+
+
+def test_query_matches_filter():
+    condition = (Field("material") == "tungsten") & (Field("isotope") == "h")
+
+    expected = htm.diffusivities.filter(material="tungsten").filter(isotope="h")
+    assert list(htm.diffusivities.query(condition)) == list(expected)
+
+
+def test_query_without_match_does_not_warn(group):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        filtered_group = group.query(Field("year") > 2020)
+
+    assert len(filtered_group) == 0
+
+
+def test_cannot_compare_pre_exp_with_quantity(group):
+    with pytest.raises(ValueError, match="pre_exp can only be compared to floats"):
+        group.query(Field("pre_exp") > 1 * htm.ureg.m**2 * htm.ureg.s**-1)
+
+
+def test_explain(group):
+    condition = (Field("year") >= 2000) & (Field("isotope") == "t")
+
+    plan = group.explain(condition)
+
+    lines = plan.splitlines()
+    assert lines[0] == "AND: 0/4"
+    # index lookups are evaluated first
+    assert lines[1] == "  isotope == 't' (index lookup): 1/4"
+    assert lines[2] == "  year >= 2000 (comparison of unique values): 2/4"
+
+
+def test_explain_skips_conditions(group):
+    condition = (Field("isotope") == "x") & (Field("year") >= 2000)
+
+    plan = group.explain(condition)
+
+    assert "skipped: year >= 2000" in plan
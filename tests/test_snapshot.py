@@ -0,0 +1,70 @@
+import numpy as np
+
+import h_transport_materials as htm
+from h_transport_materials import snapshot, property_database
+
+
+def test_shipped_snapshot_is_up_to_date():
+    """Checks that the snapshot shipped with HTM matches the database.
+    If this test fails, rebuild it with python -m h_transport_materials.snapshot"""
+    shipped_snapshot = snapshot.read_snapshot()
+
+    assert shipped_snapshot is not None
+    assert shipped_snapshot["modules"].keys() == property_database.MODULES.keys()
+    for name, module in shipped_snapshot["modules"].items():
+        assert module["digest"] == snapshot.module_digest(name)
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Checks that the properties rebuilt from a snapshot are the same as
+    the properties of the database"""
+    filename = tmp_path / "snapshot.json.gz"
+    snapshot.build_snapshot(filename)
+
+    modules = snapshot.read_snapshot(filename)["modules"]
+
+    for name, props in property_database.loaded_modules.items():
+        rebuilt_props = [
+            htm.Property.from_json(as_json) for as_json in modules[name]["properties"]
+        ]
+        assert len(rebuilt_props) == len(props)
+        for rebuilt_prop, prop in zip(rebuilt_props, props):
+            assert rebuilt_prop.to_json() == prop.to_json()
+            assert rebuilt_prop.material is prop.material
+
+
+def test_outdated_module_is_not_loaded_from_snapshot(monkeypatch):
+    shipped_snapshot = snapshot.read_snapshot()
+    shipped_snapshot["modules"]["tungsten"]["digest"] = "outdated"
+    monkeypatch.setattr(snapshot, "_snapshot", shipped_snapshot)
+
+    assert snapshot.load_properties("tungsten") is None
+    assert snapshot.load_properties("copper") is not None
+
+
+def test_snapshot_with_other_version_is_ignored(tmp_path, monkeypatch):
+    filename = tmp_path / "snapshot.json.gz"
+    snapshot.build_snapshot(filename)
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+
+    assert snapshot.read_snapshot(filename) is None
+
+
+def test_fit_covariance_is_loaded_from_snapshot():
+    props = snapshot.load_properties("tungsten")
+    fitted_props = [
+        prop
+        for prop in props
+        if prop.source == "liu_gas-driven_2016" and prop.data_T is not None
+    ]
+
+    assert fitted_props
+    for prop in fitted_props:
+        assert prop.fit_covariance.shape == (2, 2)
+        covariance = prop.fit_covariance
+        prop.fit()
+        # undefined covariances are stored as nan
+        expected = np.where(
+            np.isfinite(prop.fit_covariance), prop.fit_covariance, np.nan
+        )
+        assert np.allclose(covariance, expected, equal_nan=True)
@@ -0,0 +1,64 @@
+import h_transport_materials as htm
+from h_transport_materials.tables import TABLE_KINDS
+import numpy as np
+import pytest
+
+T_MIN = 300 * htm.ureg.K
+T_MAX = 1200 * htm.ureg.K
+
+
+@pytest.mark.parametrize("kind", TABLE_KINDS)
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_table_within_error_bound(kind, dtype):
+    group = htm.diffusivities.filter(material="tungsten")
+    T = np.random.default_rng(0).uniform(300, 1200, size=1000)
+
+    table = group.to_table(T_MIN, T_MAX, 2000, kind=kind, dtype=dtype)
+
+    exact = group.values_magnitude(T)
+    relative_error = np.abs(table(T) / exact - 1).max(axis=1)
+    assert table.data.dtype == dtype
+    assert table.data.flags["C_CONTIGUOUS"]
+    assert table.units == group.units
+    assert np.all(relative_error <= table.relative_error)
+
+
+@pytest.mark.parametrize("kind", TABLE_KINDS)
+def test_property_table(kind):
+    prop = htm.Diffusivity(
+        1e-7 * htm.ureg.m**2 * htm.ureg.s**-1,
+        0.4 * htm.ureg.eV * htm.ureg.particle**-1,
+    )
+    T = np.linspace(300, 1200, num=7)
+
+    table = prop.to_table(T_MIN, T_MAX, 500, kind=kind)
+
+    assert table(T) == pytest.approx(prop.value_magnitude(T), rel=table.relative_error)
+    assert table(600.0) == pytest.approx(
+        prop.value_magnitude(600.0), rel=table.relative_error
+    )
+    assert table.nodes.min() == pytest.approx(300)
+    assert table.nodes.max() == pytest.approx(1200)
+
+
+def test_table_is_nan_outside_range():
+    prop = htm.Diffusivity(1, 0.1)
+    table = prop.to_table(T_MIN, T_MAX, 10)
+
+    assert np.isnan(table(200.0))
+    assert np.isnan(table(np.array([200, 1300]))).all()
+    assert not np.isnan(table(np.array([300, 1200]))).any()
+
+
+def test_table_errors():
+    prop = htm.Diffusivity(1, 0.1)
+
+    with pytest.raises(ValueError, match="kind must be one of"):
+        prop.to_table(T_MIN, T_MAX, 10, kind="cubic")
+    with pytest.raises(ValueError, match="at least 2 points"):
+        prop.to_table(T_MIN, T_MAX, 1)
+    with pytest.raises(ValueError, match="lower than T_max"):
+        prop.to_table(T_MAX, T_MIN, 10)
+    group = htm.PropertiesGroup([prop, htm.Solubility(1, 0.1, law="henry")])
+    with pytest.raises(ValueError, match="Can't tabulate mixed units groups"):
+        group.to_table(T_MIN, T_MAX, 10)
@@ -0,0 +1,93 @@
+import h_transport_materials as htm
+from h_transport_materials.value_cache import ValueCache
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def cache():
+    htm.value_cache.enable()
+    htm.value_cache.hits = htm.value_cache.misses = 0
+    yield htm.value_cache
+    htm.value_cache.disable()
+
+
+def test_value_is_cached(cache):
+    prop = htm.Diffusivity(1, 0.1)
+    T = np.linspace(300, 1200, num=500) * htm.ureg.K
+
+    first = prop.value(T)
+    second = prop.value(np.linspace(300, 1200, num=500) * htm.ureg.K)
+
+    assert cache.hits == 1 and cache.misses == 1
+    assert second is first
+    assert not second.magnitude.flags.writeable
+
+
+def test_cache_key_depends_on_units(cache):
+    prop = htm.Diffusivity(1, 0.1)
+
+    in_K = prop.value(np.array([300.0, 600.0]) * htm.ureg.K)
+    in_kK = prop.value(np.array([300.0, 600.0]) * htm.ureg.kK)
+
+    assert cache.misses == 2
+    assert not np.allclose(in_K.magnitude, in_kK.magnitude)
+
+
+@pytest.mark.parametrize("attribute", ["pre_exp", "act_energy"])
+def test_cache_invalidated_when_parameters_set(cache, attribute):
+    prop = htm.Diffusivity(1, 0.1)
+    T = np.linspace(300, 1200) * htm.ureg.K
+    before = prop.value(T)
+
+    setattr(prop, attribute, 2 * getattr(prop, attribute))
+
+    assert len(cache) == 0
+    assert not np.allclose(prop.value(T).magnitude, before.magnitude)
+
+
+def test_group_values_cached_until_modified(cache):
+    group = htm.PropertiesGroup([htm.Diffusivity(1, 0.1), htm.Diffusivity(2, 0.2)])
+    T = np.linspace(300, 1200) * htm.ureg.K
+
+    before = group.values(T)
+    assert group.values(T) is before
+
+    group[0].pre_exp = 10 * group[0].pre_exp
+    after = group.values(T)
+    assert after is not before
+    assert np.allclose(after.magnitude[0], 10 * before.magnitude[0])
+
+
+def test_lru_eviction():
+    cache = ValueCache(max_entries=2)
+    cache.enable()
+    props = [htm.Diffusivity(1, 0.1) for _ in range(3)]
+    T = np.linspace(300, 1200) * htm.ureg.K
+
+    for prop in props:
+        cache.get_or_compute(prop, T, lambda: prop.value(T))
+    cache.get_or_compute(props[0], T, lambda: props[0].value(T))
+
+    assert len(cache) == 2
+    assert cache.misses == 4
+
+
+def test_size_bound():
+    cache = ValueCache(max_bytes=1000)
+    prop = htm.Diffusivity(1, 0.1)
+
+    for num in [50, 60, 70]:
+        T = np.linspace(300, 1200, num=num) * htm.ureg.K
+        cache.get_or_compute(prop, T, lambda: prop.value(T))
+
+    assert cache.nbytes <= 1000
+    assert len(cache) == 1
+
+
+def test_disabled_by_default():
+    prop = htm.Diffusivity(1, 0.1)
+    T = np.linspace(300, 1200) * htm.ureg.K
+
+    assert prop.value(T) is not prop.value(T)
+    assert len(htm.value_cache) == 0